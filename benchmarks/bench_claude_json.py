@@ -0,0 +1,99 @@
+"""Benchmark MCP sync against a large ``~/.claude.json``.
+
+Claude stores per-project history in ``~/.claude.json``, so real-world
+files reach tens of MB. This compares hawk's member splice against a full
+``json.loads`` + ``json.dumps(indent=2)`` rewrite of the same file.
+
+Usage:
+    python benchmarks/bench_claude_json.py [--size-mb 50] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from hawk_hooks.adapters.mixins.mcp import HAWK_MCP_MARKER, MCPMixin  # noqa: E402
+
+
+def make_fixture(path: Path, size_mb: int) -> None:
+    """Write a Claude-shaped config with ~size_mb of project history."""
+    entry = {
+        "allowedTools": ["Bash(git status)", "Read"],
+        "history": [
+            {"display": "explain the failing test in tests/test_sync.py " * 4, "pastedContents": {}}
+            for _ in range(20)
+        ],
+        "lastCost": 0.42,
+    }
+    entry_size = len(json.dumps(entry, indent=2))
+    count = max(1, size_mb * 1024 * 1024 // entry_size)
+    data = {
+        "numStartups": 412,
+        "mcpServers": {"manual": {"command": "manual-mcp", "args": []}},
+        "projects": {f"/home/user/src/project-{i}": entry for i in range(count)},
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n")
+
+
+def full_rewrite(path: Path, servers: dict[str, dict]) -> None:
+    """Baseline: the pre-splice implementation."""
+    data = json.loads(path.read_text())
+    existing = data.get("mcpServers", {})
+    cleaned = {k: v for k, v in existing.items() if not v.get(HAWK_MCP_MARKER)}
+    for name, cfg in servers.items():
+        cleaned[name] = {**cfg, HAWK_MCP_MARKER: True}
+    data["mcpServers"] = cleaned
+    path.write_text(json.dumps(data, indent=2) + "\n")
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / ".claude.json"
+        make_fixture(path, args.size_mb)
+        size = path.stat().st_size
+        servers_a = {"github": {"command": "gh-mcp"}}
+        servers_b = {"github": {"command": "gh-mcp", "args": ["--v2"]}}
+
+        flip = {"n": 0}
+
+        def splice_changed() -> None:
+            flip["n"] += 1
+            MCPMixin._merge_mcp_json(path, servers_a if flip["n"] % 2 else servers_b)
+
+        results = {
+            "file_bytes": size,
+            "full_rewrite_s": timed(lambda: full_rewrite(path, servers_a), args.repeat),
+            "splice_changed_s": timed(splice_changed, args.repeat),
+        }
+        MCPMixin._merge_mcp_json(path, servers_a)
+        results["splice_unchanged_s"] = timed(
+            lambda: MCPMixin._merge_mcp_json(path, servers_a), args.repeat
+        )
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+"""Micro-benchmark config loading for a ``hawk status --dir`` call.
+
+Runs ``cmd_status`` for the deepest project of a generated fleet (see
+``fleet.py``) in four modes:
+
+- ``pure_python``: PyYAML's pure-Python SafeLoader, no caches
+- ``libyaml``: CSafeLoader (when available), no caches
+- ``snapshot``: fresh in-process cache, compiled snapshot on disk
+- ``cached``: CSafeLoader with the stat-validated file cache warm
+
+Usage:
+    python benchmarks/bench_config.py [--dirs 200] [--depth 3] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+from argparse import Namespace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import yaml  # noqa: E402
+from bench_sync import timed  # noqa: E402
+from fleet import FleetSpec, build_fleet  # noqa: E402
+
+from hawk_hooks import config  # noqa: E402
+from hawk_hooks.cli import cmd_status  # noqa: E402
+
+
+def age_files(root: Path, seconds: int = 60) -> None:
+    """Backdate YAML files so the cache's racy-write guard admits them."""
+    for path in root.rglob("*.yaml"):
+        st = path.stat()
+        past = st.st_mtime_ns - seconds * 1_000_000_000
+        os.utime(path, ns=(past, past))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dirs", type=int, default=200)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fleet = build_fleet(Path(tmp), FleetSpec(dirs=args.dirs, depth=args.depth))
+        age_files(fleet.root)
+        status_args = Namespace(dir=str(fleet.leaves[-1]))
+
+        def status() -> None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                cmd_status(status_args)
+
+        def cold() -> None:
+            config.clear_cache()
+            config.get_snapshot_path().unlink(missing_ok=True)
+
+        loader = config._yaml_loader()
+        results = {}
+        with fleet.activate():
+            try:
+                config._YamlLoader = yaml.SafeLoader
+                results["pure_python"] = timed(status, args.repeat, setup=cold)
+                config._YamlLoader = loader
+                results["libyaml"] = timed(status, args.repeat, setup=cold)
+                status()
+                results["snapshot"] = timed(status, args.repeat, setup=config.clear_cache)
+                status()
+                results["cached"] = timed(status, args.repeat)
+            finally:
+                config._YamlLoader = loader
+
+    report = {
+        "libyaml_available": bool(getattr(yaml, "__with_libyaml__", False)),
+        "fleet": {"dirs": args.dirs, "depth": args.depth},
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,227 @@
+"""Benchmark sync-path hot spots against a generated fleet.
+
+Builds a synthetic installation (see ``fleet.py``) with N skills, hooks,
+prompts and MCP servers, M registered directories in K-deep config chains
+and fake tool home dirs, then times:
+
+- ``sync_all`` cold (fresh fleet), warm (nothing changed) and forced
+- ``count_unsynced_targets`` for every chain leaf
+- ``resolve`` for every registered directory (chains pre-built)
+- ``scan_directory`` over the registry
+- ``hash_registry_item`` over every registry item
+- ``_generate_runners`` for all hooks
+
+Each benchmark reports the best and mean wall time over ``--repeat`` runs.
+Save results with ``--output`` and pass an earlier file to ``--compare``
+to print per-benchmark ratios against it (e.g. the parent commit).
+
+Usage:
+    python benchmarks/bench_sync.py [--skills 50] [--hooks 20] [--prompts 50]
+        [--mcp 10] [--dirs 20] [--depth 3] [--profiles 4] [--repeat 3]
+        [--only sync_all_warm,resolve] [--output results.json]
+        [--compare baseline.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fleet import Fleet, FleetSpec, build_fleet  # noqa: E402
+
+from hawk_hooks import config  # noqa: E402
+from hawk_hooks.adapters import get_adapter  # noqa: E402
+from hawk_hooks.downloader import scan_directory  # noqa: E402
+from hawk_hooks.resolver import resolve  # noqa: E402
+from hawk_hooks.scope_resolution import build_resolver_dir_chain  # noqa: E402
+from hawk_hooks.sync import count_unsynced_targets, sync_all  # noqa: E402
+from hawk_hooks.types import Tool  # noqa: E402
+
+BENCHMARKS = [
+    "sync_all_cold",
+    "sync_all_warm",
+    "sync_all_force",
+    "count_unsynced_targets",
+    "resolve",
+    "scan_directory",
+    "hash_registry_item",
+    "generate_runners",
+]
+
+
+def timed(fn: Callable[[], object], repeat: int, setup: Callable[[], object] | None = None) -> dict:
+    """Run *fn* ``repeat`` times; *setup* runs untimed before each call."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {"best_s": min(times), "mean_s": statistics.fmean(times), "repeat": repeat}
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def bench_sync_cold(spec: FleetSpec, repeat: int, tmp: Path) -> dict:
+    """Time a first ``sync_all`` on a freshly generated fleet."""
+    fleets: list[Fleet] = []
+
+    def setup() -> None:
+        fleets.append(build_fleet(tmp / f"cold-{len(fleets)}", FleetSpec(**spec.to_dict())))
+
+    def run() -> None:
+        with fleets[-1].activate():
+            sync_all()
+
+    return timed(run, repeat, setup)
+
+
+def run_fleet_benchmarks(
+    fleet: Fleet, selected: set[str], repeat: int, tmp: Path
+) -> dict[str, dict]:
+    """Time everything that runs against one shared fleet."""
+    results: dict[str, dict] = {}
+    with fleet.activate():
+        if selected & {"sync_all_warm", "sync_all_force", "count_unsynced_targets"}:
+            sync_all()
+
+        if "sync_all_warm" in selected:
+            results["sync_all_warm"] = timed(sync_all, repeat)
+        if "sync_all_force" in selected:
+            results["sync_all_force"] = timed(lambda: sync_all(force=True), repeat)
+        if "count_unsynced_targets" in selected:
+            leaves = fleet.leaves
+
+            def count_all() -> None:
+                for leaf in leaves:
+                    count_unsynced_targets(leaf)
+
+            results["count_unsynced_targets"] = timed(count_all, repeat)
+
+        if "resolve" in selected:
+            cfg = config.load_global_config()
+            chains = [build_resolver_dir_chain(d, cfg=cfg) for d in fleet.directories]
+
+            def resolve_all() -> None:
+                for chain in chains:
+                    for tool in Tool.all():
+                        resolve(cfg, dir_chain=chain, tool=tool)
+
+            results["resolve"] = timed(resolve_all, repeat)
+
+        if "scan_directory" in selected:
+            results["scan_directory"] = timed(lambda: scan_directory(fleet.registry_path), repeat)
+
+        if "hash_registry_item" in selected:
+            items = [
+                path
+                for sub in ("skills", "hooks", "prompts", "mcp")
+                for path in sorted((fleet.registry_path / sub).iterdir())
+            ]
+
+            def hash_all() -> None:
+                for path in items:
+                    config.hash_registry_item(path)
+
+            results["hash_registry_item"] = timed(hash_all, repeat)
+
+        if "generate_runners" in selected:
+            adapter = get_adapter(Tool.CLAUDE)
+            runners_dir = tmp / "runners"
+            results["generate_runners"] = timed(
+                lambda: adapter._generate_runners(fleet.hooks, fleet.registry_path, runners_dir),
+                repeat,
+            )
+    return results
+
+
+def compare(current: dict[str, dict], baseline_path: Path) -> dict[str, float]:
+    """Return ``{name: current_best / baseline_best}`` for shared benchmarks."""
+    baseline = json.loads(baseline_path.read_text()).get("results", {})
+    ratios = {}
+    for name, entry in current.items():
+        base = baseline.get(name, {}).get("best_s")
+        if base:
+            ratios[name] = round(entry["best_s"] / base, 3)
+    return ratios
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    defaults = FleetSpec()
+    for name in ("skills", "hooks", "prompts", "mcp", "dirs", "depth", "profiles"):
+        parser.add_argument(f"--{name}", type=int, default=getattr(defaults, name))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", default="", help="Comma-separated benchmark names")
+    parser.add_argument("--output", type=Path, help="Write JSON results to this file")
+    parser.add_argument("--compare", type=Path, help="Earlier --output file to compare against")
+    args = parser.parse_args()
+
+    selected = set(BENCHMARKS)
+    if args.only:
+        selected = {name.strip() for name in args.only.split(",") if name.strip()}
+        unknown = selected - set(BENCHMARKS)
+        if unknown:
+            parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    spec = FleetSpec(
+        skills=args.skills,
+        hooks=args.hooks,
+        prompts=args.prompts,
+        mcp=args.mcp,
+        dirs=args.dirs,
+        depth=args.depth,
+        profiles=args.profiles,
+    )
+
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as tmp_str:
+        tmp = Path(tmp_str)
+        if "sync_all_cold" in selected:
+            results["sync_all_cold"] = bench_sync_cold(spec, args.repeat, tmp)
+        if selected - {"sync_all_cold"}:
+            fleet = build_fleet(tmp / "fleet", spec)
+            results.update(run_fleet_benchmarks(fleet, selected, args.repeat, tmp))
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "fleet": spec.to_dict(),
+        "results": {name: results[name] for name in BENCHMARKS if name in results},
+    }
+    if args.compare:
+        report["ratio_vs_baseline"] = compare(report["results"], args.compare)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
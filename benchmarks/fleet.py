@@ -0,0 +1,225 @@
+"""Synthetic hawk installations ("fleets") for benchmarks.
+
+A fleet is a throwaway tree containing a fake ``$HOME`` with every tool's
+global dir, a hawk config dir with a populated registry and profiles, and
+a set of registered project directories whose ``.hawk/config.yaml`` files
+form nested config chains::
+
+    <root>/home/.config/hawk-hooks/   config.yaml, profiles/, registry/
+    <root>/home/.claude, .gemini, ... fake tool global dirs
+    <root>/projects/p000/d1/d2/...    registered dirs, ``depth`` levels deep
+
+``activate()`` points ``HOME`` and ``XDG_CONFIG_HOME`` at the fleet, so
+hawk code runs against it unmodified.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import yaml  # noqa: E402
+
+from hawk_hooks import config  # noqa: E402
+from hawk_hooks.adapters import get_adapter  # noqa: E402
+from hawk_hooks.types import Tool  # noqa: E402
+
+_HOOK_EVENTS = ["pre_tool_use", "post_tool_use", "stop", "notification", "user_prompt_submit"]
+
+
+@dataclass
+class FleetSpec:
+    """Sizes of a generated fleet."""
+
+    skills: int = 50
+    hooks: int = 20
+    prompts: int = 50
+    mcp: int = 10
+    dirs: int = 20
+    depth: int = 3
+    profiles: int = 4
+
+    def to_dict(self) -> dict[str, int]:
+        return dict(self.__dict__)
+
+
+@dataclass
+class Fleet:
+    """Paths of a generated fleet."""
+
+    root: Path
+    spec: FleetSpec
+    home: Path
+    config_dir: Path
+    registry_path: Path
+    directories: list[Path] = field(default_factory=list)
+    skills: list[str] = field(default_factory=list)
+    hooks: list[str] = field(default_factory=list)
+    prompts: list[str] = field(default_factory=list)
+    mcp: list[str] = field(default_factory=list)
+
+    @property
+    def leaves(self) -> list[Path]:
+        """Innermost registered dir of every chain."""
+        depth = self.spec.depth
+        return [d for i, d in enumerate(self.directories) if i % depth == depth - 1]
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator["Fleet"]:
+        """Run hawk against this fleet inside the block."""
+        saved = {key: os.environ.get(key) for key in ("HOME", "XDG_CONFIG_HOME")}
+        os.environ["HOME"] = str(self.home)
+        os.environ["XDG_CONFIG_HOME"] = str(self.home / ".config")
+        try:
+            yield self
+        finally:
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+
+def _slice(names: list[str], start: int, count: int) -> list[str]:
+    """Take *count* names starting at *start*, wrapping around."""
+    if not names:
+        return []
+    return [names[(start + i) % len(names)] for i in range(min(count, len(names)))]
+
+
+def _write_registry(fleet: Fleet) -> None:
+    spec = fleet.spec
+    reg = fleet.registry_path
+    for sub in ("skills", "hooks", "agents", "mcp", "prompts"):
+        (reg / sub).mkdir(parents=True, exist_ok=True)
+
+    for i in range(spec.skills):
+        name = f"skill-{i:04d}"
+        skill_dir = reg / "skills" / name
+        (skill_dir / "references").mkdir(parents=True)
+        (skill_dir / "SKILL.md").write_text(
+            f"---\nname: {name}\ndescription: Synthetic skill {i}\n---\n\n"
+            + f"Step {i}: do the thing carefully.\n" * 20
+        )
+        (skill_dir / "references" / "notes.md").write_text(f"Reference notes for {name}.\n" * 10)
+        fleet.skills.append(name)
+
+    for i in range(spec.hooks):
+        name = f"hook-{i:04d}.py"
+        event = _HOOK_EVENTS[i % len(_HOOK_EVENTS)]
+        path = reg / "hooks" / name
+        path.write_text(
+            "#!/usr/bin/env python3\n"
+            f"# hawk-hook: events={event}\n"
+            f"# hawk-hook: description=Synthetic hook {i}\n"
+            "import sys\nsys.exit(0)\n"
+        )
+        path.chmod(0o755)
+        fleet.hooks.append(name)
+
+    for i in range(spec.prompts):
+        name = f"prompt-{i:04d}.md"
+        (reg / "prompts" / name).write_text(
+            f"---\nname: prompt-{i:04d}\ndescription: Synthetic prompt {i}\n---\n\n"
+            f"Explain change {i} in detail.\n"
+        )
+        fleet.prompts.append(name)
+
+    for i in range(spec.mcp):
+        name = f"mcp-{i:04d}"
+        data = {"command": f"mcp-server-{i}", "args": ["--port", str(9000 + i)]}
+        (reg / "mcp" / f"{name}.yaml").write_text(yaml.safe_dump(data))
+        fleet.mcp.append(name)
+
+
+def _write_profiles(fleet: Fleet) -> list[str]:
+    spec = fleet.spec
+    profiles_dir = fleet.config_dir / "profiles"
+    profiles_dir.mkdir(parents=True, exist_ok=True)
+    names = []
+    for i in range(spec.profiles):
+        name = f"profile-{i}"
+        data = {
+            "skills": _slice(fleet.skills, i * 5, 5),
+            "hooks": _slice(fleet.hooks, i, 2),
+            "prompts": _slice(fleet.prompts, i * 3, 3),
+            "mcp": _slice(fleet.mcp, i, 1),
+        }
+        (profiles_dir / f"{name}.yaml").write_text(yaml.safe_dump(data, sort_keys=False))
+        names.append(name)
+    return names
+
+
+def _write_directories(fleet: Fleet, profiles: list[str]) -> dict[str, dict]:
+    spec = fleet.spec
+    index: dict[str, dict] = {}
+    for i in range(spec.dirs):
+        current = fleet.root / "projects" / f"p{i:03d}"
+        for level in range(spec.depth):
+            if level:
+                current = current / f"d{level}"
+            current.mkdir(parents=True, exist_ok=True)
+            seed = i * spec.depth + level
+            # A few distinct shapes so grouped sync sees both shared and
+            # unique resolved sets.
+            dir_cfg: dict = {
+                "skills": {
+                    "enabled": _slice(fleet.skills, seed % 7, 3),
+                    "disabled": _slice(fleet.skills, 0, 1) if level else [],
+                },
+                "hooks": {"enabled": _slice(fleet.hooks, seed % 3, 1)},
+                "prompts": {"enabled": _slice(fleet.prompts, seed % 5, 2)},
+            }
+            entry: dict = {}
+            if profiles and level == 0:
+                entry["profile"] = profiles[i % len(profiles)]
+            elif profiles and level == spec.depth - 1 and i % 2:
+                dir_cfg["profile"] = profiles[(i + 1) % len(profiles)]
+            hawk_dir = current / ".hawk"
+            hawk_dir.mkdir(exist_ok=True)
+            (hawk_dir / "config.yaml").write_text(yaml.safe_dump(dir_cfg, sort_keys=False))
+            resolved = current.resolve()
+            index[str(resolved)] = entry
+            fleet.directories.append(resolved)
+    return index
+
+
+def build_fleet(root: Path, spec: FleetSpec | None = None) -> Fleet:
+    """Generate a fleet under *root* (which should be empty)."""
+    spec = spec or FleetSpec()
+    spec.depth = max(1, spec.depth)
+    home = root / "home"
+    config_dir = home / ".config" / "hawk-hooks"
+    fleet = Fleet(
+        root=root,
+        spec=spec,
+        home=home,
+        config_dir=config_dir,
+        registry_path=config_dir / "registry",
+    )
+    config_dir.mkdir(parents=True)
+    (config_dir / "cache").mkdir()
+
+    with fleet.activate():
+        for tool in Tool.all():
+            get_adapter(tool).get_global_dir().mkdir(parents=True, exist_ok=True)
+
+        _write_registry(fleet)
+        profiles = _write_profiles(fleet)
+        directories = _write_directories(fleet, profiles)
+
+        cfg = config.load_global_config()
+        cfg["registry_path"] = str(fleet.registry_path)
+        cfg["global"]["skills"] = _slice(fleet.skills, 0, 10)
+        cfg["global"]["hooks"] = _slice(fleet.hooks, 0, 3)
+        cfg["global"]["prompts"] = _slice(fleet.prompts, 0, 10)
+        cfg["global"]["mcp"] = _slice(fleet.mcp, 0, 2)
+        cfg["directories"] = directories
+        config.save_global_config(cfg)
+    return fleet
@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import os
 import shutil
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Literal
 
-from ..registry import _validate_name
+from .. import fileio
+from ..profiling import span
+from ..registry import Registry, _validate_name
 from ..types import ResolvedSet, SyncResult, Tool
 from .mixins import HookRunnerMixin, MCPMixin
 from .mixins.mcp import HAWK_MCP_MARKER as _HAWK_MCP_MARKER
@@ -173,7 +176,7 @@ class ToolAdapter(HookRunnerMixin, MCPMixin, ABC):
 
         # Ensure target subdirs exist
         for dir_getter in [self.get_skills_dir, self.get_agents_dir, self.get_prompts_dir]:
-            dir_getter(target_dir).mkdir(parents=True, exist_ok=True)
+            fileio.make_dirs(dir_getter(target_dir))
 
         # Sync skills
         self._sync_component(
@@ -211,7 +214,8 @@ class ToolAdapter(HookRunnerMixin, MCPMixin, ABC):
         # Register hooks
         try:
             self._set_hook_diagnostics(skipped=[], errors=[])
-            registered = self.register_hooks(resolved.hooks, target_dir, registry_path=registry_path)
+            with span("register_hooks", tool=self.tool):
+                registered = self.register_hooks(resolved.hooks, target_dir, registry_path=registry_path)
             result.linked.extend(f"hook:{h}" for h in registered)
             for skipped in self._take_hook_skipped():
                 result.skipped.append(f"hooks: {skipped}")
@@ -222,8 +226,9 @@ class ToolAdapter(HookRunnerMixin, MCPMixin, ABC):
 
         # Sync MCP servers (always call to clean up stale entries)
         try:
-            servers = self._load_mcp_servers(resolved.mcp, registry_path / "mcp") if resolved.mcp else {}
-            self.write_mcp_config(servers, target_dir)
+            servers = self._load_planned_mcp_servers(resolved.mcp, registry_path)
+            with span("mcp_write", tool=self.tool):
+                self.write_mcp_config(servers, target_dir)
             result.linked.extend(f"mcp:{name}" for name in servers)
         except Exception as e:
             result.errors.append(f"mcp: {e}")
@@ -232,6 +237,23 @@ class ToolAdapter(HookRunnerMixin, MCPMixin, ABC):
 
     # ── Helpers ──
 
+    def _load_planned_mcp_servers(
+        self,
+        mcp_names: list[str],
+        registry_path: Path,
+    ) -> dict[str, dict]:
+        """Load MCP server configs, shared across targets in a plan cache block.
+
+        Callers must treat the returned configs as read-only.
+        """
+        if not mcp_names:
+            return {}
+        with span("mcp_load", tool=self.tool):
+            return self._planned(
+                ("mcp", tuple(mcp_names), str(registry_path)),
+                lambda: self._load_mcp_servers(mcp_names, registry_path / "mcp"),
+            )
+
     def _sync_component(
         self,
         names: list[str],
@@ -252,15 +274,34 @@ class ToolAdapter(HookRunnerMixin, MCPMixin, ABC):
                 write regular files (e.g. Gemini toml) should provide a custom
                 finder.
         """
-        # Validate all names to prevent path traversal from config
-        validated: list[str] = []
-        for name in names:
-            try:
-                _validate_name(name)
-                validated.append(name)
-            except ValueError as e:
-                result.errors.append(f"invalid name {name!r}: {e}")
-        desired = set(validated)
+        with span("sync_component", tool=self.tool, component=source_dir.name):
+            self._sync_component_items(
+                names,
+                source_dir,
+                target_dir,
+                link_fn,
+                unlink_fn,
+                get_dir_fn,
+                result,
+                find_current_fn,
+            )
+
+    def _sync_component_items(
+        self,
+        names: list[str],
+        source_dir: Path,
+        target_dir: Path,
+        link_fn,
+        unlink_fn,
+        get_dir_fn,
+        result: SyncResult,
+        find_current_fn,
+    ) -> None:
+        desired, available, name_errors = self._planned(
+            ("components", tuple(names), str(source_dir)),
+            lambda: self._plan_component(names, source_dir),
+        )
+        result.errors.extend(name_errors)
         comp_dir = get_dir_fn(target_dir)
 
         # Find currently managed items
@@ -280,20 +321,13 @@ class ToolAdapter(HookRunnerMixin, MCPMixin, ABC):
 
         # Link new
         for name in desired - current:
-            source = source_dir / name
-            if not source.exists():
+            if name not in available:
                 continue
+            source = source_dir / name
             # Check if destination already exists but belongs to something else
             dest = get_dir_fn(target_dir) / name
-            if dest.exists() or dest.is_symlink():
-                is_ours = False
-                if dest.is_symlink():
-                    try:
-                        resolved_target = dest.resolve()
-                        resolved_source = source_dir.resolve()
-                        is_ours = resolved_target == resolved_source or resolved_target.is_relative_to(resolved_source)
-                    except (OSError, ValueError):
-                        pass
+            if fileio.lexists(dest):
+                is_ours = fileio.points_into(dest, fileio.link_roots(source_dir))
                 if not is_ours:
                     result.errors.append(f"skip {name}: already exists (not managed by hawk)")
                     continue
@@ -303,42 +337,55 @@ class ToolAdapter(HookRunnerMixin, MCPMixin, ABC):
             except Exception as e:
                 result.errors.append(f"link {name}: {e}")
 
+    @staticmethod
+    def _plan_component(
+        names: list[str],
+        source_dir: Path,
+    ) -> tuple[frozenset[str], frozenset[str], tuple[str, ...]]:
+        """Target-independent part of ``_sync_component``.
+
+        References (``namespace/name``, bare names) are mapped to registry
+        names through the registry's name index.
+
+        Returns:
+            (desired names, names present in *source_dir*, name errors)
+        """
+        index = Registry(source_dir.parent).names()
+        validated: list[str] = []
+        available: set[str] = set()
+        errors: list[str] = []
+        for name in names:
+            registry_name = index.resolve(source_dir.name, name)
+            if registry_name is not None:
+                validated.append(registry_name)
+                available.add(registry_name)
+                continue
+            # Validate unknown names to prevent path traversal from config
+            try:
+                _validate_name(name)
+                validated.append(name)
+            except ValueError as e:
+                errors.append(f"invalid name {name!r}: {e}")
+        return frozenset(validated), frozenset(available), tuple(errors)
+
     @staticmethod
     def _find_current_symlinks(comp_dir: Path, source_dir: Path) -> set[str]:
         """Find symlinks in *comp_dir* that point into *source_dir*."""
-        current: set[str] = set()
-        if not comp_dir.exists():
-            return current
-        for entry in comp_dir.iterdir():
-            if entry.is_symlink():
-                try:
-                    target = entry.resolve()
-                    resolved_source = source_dir.resolve()
-                    if target == resolved_source or target.is_relative_to(resolved_source):
-                        current.add(entry.name)
-                except (OSError, ValueError):
-                    pass
-        return current
+        return set(fileio.links_into(comp_dir, fileio.link_roots(source_dir)))
 
     @staticmethod
     def _create_symlink(source: Path, dest: Path) -> None:
-        """Create a symlink, replacing existing."""
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        if dest.exists() or dest.is_symlink():
-            if dest.is_dir() and not dest.is_symlink():
-                raise ValueError(f"Destination is a directory: {dest}")
-            dest.unlink()
-        dest.symlink_to(source.resolve())
+        """Create a symlink, replacing existing.
+
+        The target is made absolute but not resolved, so links made through
+        a symlinked registry (see ``generations.py``) follow it when it moves.
+        """
+        fileio.make_symlink(Path(os.path.abspath(source)), dest)
 
     @staticmethod
     def _remove_link(path: Path) -> bool:
         """Remove a symlink or file. Returns True if removed."""
-        if path.exists() or path.is_symlink():
-            if path.is_dir() and not path.is_symlink():
-                return False
-            path.unlink()
-            return True
-        return False
+        return fileio.remove_file(path)
 
     def _set_hook_diagnostics(
         self,
@@ -5,6 +5,8 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+from .. import fileio
+from ..fileio import write_text_if_changed
 from ..types import Tool
 from .base import HAWK_MCP_MARKER, ToolAdapter
 
@@ -50,7 +52,7 @@ class ClaudeAdapter(ToolAdapter):
         the format Claude Code expects since the matcher-based update.
         """
         from ..events import EVENTS
-        from ..hook_meta import parse_hook_meta
+        from ..registry_index import hook_meta
 
         runners_dir = target_dir / "runners"
 
@@ -58,10 +60,9 @@ class ClaudeAdapter(ToolAdapter):
             # No hooks — clean up any existing hawk entries
             self._remove_hawk_hooks(target_dir)
             # Clean up stale runners
-            if runners_dir.exists():
-                for f in runners_dir.iterdir():
-                    if f.suffix == ".sh":
-                        f.unlink()
+            for f in fileio.list_dir(runners_dir):
+                if f.suffix == ".sh":
+                    fileio.remove_file(f)
             return []
 
         hooks_dir = registry_path / "hooks"
@@ -84,7 +85,7 @@ class ClaudeAdapter(ToolAdapter):
             hook_path = hooks_dir / name
             if not hook_path.is_file():
                 continue
-            meta = parse_hook_meta(hook_path)
+            meta = hook_meta(hook_path)
             for event in meta.events:
                 if event in runners and meta.timeout > 0:
                     event_timeouts[event] = max(event_timeouts.get(event, 0), meta.timeout)
@@ -141,7 +142,7 @@ class ClaudeAdapter(ToolAdapter):
                 continue
 
             # Determine events from hawk-hook metadata, or default to pre_tool_use
-            meta = parse_hook_meta(hook_path)
+            meta = hook_meta(hook_path)
             events = meta.events if meta.events else ["pre_tool_use"]
             try:
                 timeout = int(data.get("timeout", meta.timeout))
@@ -175,7 +176,7 @@ class ClaudeAdapter(ToolAdapter):
         for name in script_hooks:
             hook_path = hooks_dir / name
             if hook_path.is_file():
-                meta = parse_hook_meta(hook_path)
+                meta = hook_meta(hook_path)
                 if any(event in runners for event in meta.events):
                     registered.append(name)
         registered.extend(sorted(registered_prompt_hooks))
@@ -299,9 +300,9 @@ class ClaudeAdapter(ToolAdapter):
     @staticmethod
     def _load_json(path: Path) -> dict:
         """Load a JSON file, returning empty dict if missing/invalid."""
-        if path.exists():
+        if fileio.exists(path):
             try:
-                return json.loads(path.read_text())
+                return json.loads(fileio.read_text(path))
             except (json.JSONDecodeError, OSError):
                 pass
         return {}
@@ -309,5 +310,4 @@ class ClaudeAdapter(ToolAdapter):
     @staticmethod
     def _save_json(path: Path, data: dict) -> None:
         """Save a dict as JSON."""
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(data, indent=2) + "\n")
+        write_text_if_changed(path, json.dumps(data, indent=2) + "\n")
@@ -6,11 +6,13 @@ from dataclasses import dataclass
 import json
 from pathlib import Path
 import re
-import shutil
 import tomllib
 from typing import Any
 
+from .. import fileio
+from ..fileio import write_text_if_changed
 from ..managed_config import ManagedConfigOp, TomlBlockDriver
+from ..profiling import span
 from ..registry import _validate_name
 from ..types import ResolvedSet, SyncResult, Tool
 from .base import ToolAdapter
@@ -75,7 +77,7 @@ class CodexAdapter(ToolAdapter):
         result = SyncResult(tool=str(self.tool))
 
         for dir_getter in [self.get_skills_dir, self.get_agents_dir, self.get_prompts_dir]:
-            dir_getter(target_dir).mkdir(parents=True, exist_ok=True)
+            fileio.make_dirs(dir_getter(target_dir))
 
         self._sync_component(
             resolved.skills,
@@ -98,13 +100,15 @@ class CodexAdapter(ToolAdapter):
         )
 
         try:
-            self._sync_codex_agents(resolved.agents, target_dir, registry_path, result)
+            with span("codex_agents", tool=self.tool):
+                self._sync_codex_agents(resolved.agents, target_dir, registry_path, result)
         except Exception as exc:
             result.errors.append(f"agents: {exc}")
 
         try:
             self._set_hook_diagnostics(skipped=[], errors=[])
-            registered = self.register_hooks(resolved.hooks, target_dir, registry_path=registry_path)
+            with span("register_hooks", tool=self.tool):
+                registered = self.register_hooks(resolved.hooks, target_dir, registry_path=registry_path)
             result.linked.extend(f"hook:{h}" for h in registered)
             for skipped in self._take_hook_skipped():
                 result.skipped.append(f"hooks: {skipped}")
@@ -114,8 +118,9 @@ class CodexAdapter(ToolAdapter):
             result.errors.append(f"hooks: {exc}")
 
         try:
-            servers = self._load_mcp_servers(resolved.mcp, registry_path / "mcp") if resolved.mcp else {}
-            self.write_mcp_config(servers, target_dir)
+            servers = self._load_planned_mcp_servers(resolved.mcp, registry_path)
+            with span("mcp_write", tool=self.tool):
+                self.write_mcp_config(servers, target_dir)
             result.linked.extend(f"mcp:{name}" for name in servers)
         except Exception as exc:
             result.errors.append(f"mcp: {exc}")
@@ -127,7 +132,7 @@ class CodexAdapter(ToolAdapter):
     ) -> list[str]:
         """Register limited hook bridge using Codex notify callbacks."""
         from ..event_mapping import get_event_support
-        from ..hook_meta import parse_hook_meta
+        from ..registry_index import hook_meta
 
         skipped: list[str] = []
         errors: list[str] = []
@@ -136,10 +141,9 @@ class CodexAdapter(ToolAdapter):
 
         if not hook_names or registry_path is None:
             self._update_notify_block(config_path, [])
-            if runners_dir.exists():
-                for f in runners_dir.iterdir():
-                    if f.suffix == ".sh":
-                        f.unlink()
+            for f in fileio.list_dir(runners_dir):
+                if f.suffix == ".sh":
+                    fileio.remove_file(f)
             self._set_hook_diagnostics(skipped=[], errors=[])
             return []
 
@@ -168,7 +172,7 @@ class CodexAdapter(ToolAdapter):
                 bridged_events.add(event_name)
             else:
                 skipped.append(f"{event_name} is unsupported by codex and was skipped")
-                runner_path.unlink(missing_ok=True)
+                fileio.remove_file(runner_path)
 
         if self._has_manual_notify_key_outside_block(config_path):
             errors.append("codex config.toml has a manual notify key; hawk notify bridge was not modified")
@@ -182,7 +186,7 @@ class CodexAdapter(ToolAdapter):
             hook_path = hooks_dir / name
             if not hook_path.is_file():
                 continue
-            events = parse_hook_meta(hook_path).events
+            events = hook_meta(hook_path).events
             if any(event in bridged_events for event in events):
                 registered.append(name)
 
@@ -204,7 +208,7 @@ class CodexAdapter(ToolAdapter):
         exists for a server name hawk wants to manage, this raises an error.
         """
         config_path = target_dir / "config.toml"
-        text = config_path.read_text() if config_path.exists() else ""
+        text = fileio.read_text(config_path) if fileio.exists(config_path) else ""
         manual_text = TomlBlockDriver.strip_all(text)
 
         existing_units = self._extract_managed_mcp_units(text)
@@ -340,6 +344,7 @@ class CodexAdapter(ToolAdapter):
 
         managed_roles: set[str] = set()
         managed_launchers: set[str] = set()
+        role_ops: list[tuple[_CodexAgentSpec, ManagedConfigOp]] = []
 
         for spec in specs.values():
             if self._has_manual_agent_table(manual_text, spec.role_key):
@@ -349,13 +354,17 @@ class CodexAdapter(ToolAdapter):
                 continue
 
             role_file = roles_dir / f"{spec.role_key}.toml"
-            if role_file.exists() and spec.role_key not in old_roles and not self._is_hawk_role_file(role_file):
+            if (
+                fileio.exists(role_file)
+                and spec.role_key not in old_roles
+                and not self._is_hawk_role_file(role_file)
+            ):
                 result.skipped.append(
                     f"agents: role file already exists and is not hawk-managed: {role_file}"
                 )
                 continue
 
-            role_file.write_text(self._role_file_content(spec.instructions))
+            write_text_if_changed(role_file, self._role_file_content(spec.instructions))
             managed_roles.add(spec.role_key)
             if spec.role_key not in old_roles:
                 result.linked.append(f"agent:{spec.source_name}")
@@ -365,35 +374,40 @@ class CodexAdapter(ToolAdapter):
                 f'description = "{self._escape_toml_string(spec.description)}"\n'
                 f'config_file = "agents/{spec.role_key}.toml"'
             )
-            op_result = TomlBlockDriver.apply(
-                [
+            role_ops.append(
+                (
+                    spec,
                     ManagedConfigOp(
                         file=config_path,
                         unit_id=f"{_AGENT_UNIT_PREFIX}{spec.role_key}",
                         action="upsert",
                         payload=agent_payload,
-                    )
-                ]
+                    ),
+                )
             )
-            result.errors.extend(f"agents: {e}" for e in op_result.errors)
-            if op_result.errors:
-                continue
 
-            if trigger_mode == "skills":
-                launcher_dir = skills_dir / spec.launcher_skill
-                if (
-                    launcher_dir.exists()
-                    and spec.launcher_skill not in old_launchers
-                    and not self._is_hawk_launcher_skill(launcher_dir)
-                ):
-                    result.skipped.append(
-                        f"agents: launcher skill already exists and is not hawk-managed: {launcher_dir}"
-                    )
-                    continue
-                self._write_launcher_skill(launcher_dir, spec)
-                managed_launchers.add(spec.launcher_skill)
-                if spec.launcher_skill not in old_launchers:
-                    result.linked.append(f"skill:{spec.launcher_skill}")
+        # One config.toml read/validate/write for all role tables.
+        op_result = TomlBlockDriver.apply([op for _spec, op in role_ops])
+        result.errors.extend(f"agents: {e}" for e in op_result.errors)
+        failed_units = {r.unit_id for r in op_result.ops if r.status == "error"}
+
+        for spec, op in role_ops:
+            if op.unit_id in failed_units or trigger_mode != "skills":
+                continue
+            launcher_dir = skills_dir / spec.launcher_skill
+            if (
+                fileio.exists(launcher_dir)
+                and spec.launcher_skill not in old_launchers
+                and not self._is_hawk_launcher_skill(launcher_dir)
+            ):
+                result.skipped.append(
+                    f"agents: launcher skill already exists and is not hawk-managed: {launcher_dir}"
+                )
+                continue
+            self._write_launcher_skill(launcher_dir, spec)
+            managed_launchers.add(spec.launcher_skill)
+            if spec.launcher_skill not in old_launchers:
+                result.linked.append(f"skill:{spec.launcher_skill}")
 
         stale_roles = old_roles - managed_roles
         stale_launchers = old_launchers - managed_launchers
@@ -435,7 +449,7 @@ class CodexAdapter(ToolAdapter):
             )
             role_file = roles_dir / f"{role}.toml"
             if self._is_hawk_role_file(role_file):
-                role_file.unlink(missing_ok=True)
+                fileio.remove_file(role_file)
             result.unlinked.append(f"agent:{role}")
 
         op_result = TomlBlockDriver.apply(remove_ops)
@@ -444,7 +458,7 @@ class CodexAdapter(ToolAdapter):
         for launcher in sorted(stale_launchers):
             launcher_dir = skills_dir / launcher
             if self._is_hawk_launcher_skill(launcher_dir):
-                shutil.rmtree(launcher_dir, ignore_errors=True)
+                fileio.remove_tree(launcher_dir)
             result.unlinked.append(f"skill:{launcher}")
 
     def _build_agent_spec(self, source: Path, source_name: str) -> _CodexAgentSpec:
@@ -570,7 +584,7 @@ class CodexAdapter(ToolAdapter):
         )
 
     def _write_launcher_skill(self, launcher_dir: Path, spec: _CodexAgentSpec) -> None:
-        launcher_dir.mkdir(parents=True, exist_ok=True)
+        fileio.make_dirs(launcher_dir)
         skill_path = launcher_dir / "SKILL.md"
         content = (
             "---\n"
@@ -580,15 +594,15 @@ class CodexAdapter(ToolAdapter):
             f"<!-- {_LAUNCHER_MARKER} -->\n\n"
             f"Use the Codex multi-agent role `{spec.role_key}` for this task.\n"
         )
-        skill_path.write_text(content)
+        write_text_if_changed(skill_path, content)
 
     @staticmethod
     def _load_agent_sidecar(target_dir: Path) -> tuple[set[str], set[str]]:
         sidecar = target_dir / _AGENT_SIDECAR
-        if not sidecar.exists():
+        if not fileio.exists(sidecar):
             return set(), set()
         try:
-            data = json.loads(sidecar.read_text())
+            data = json.loads(fileio.read_text(sidecar))
         except (json.JSONDecodeError, OSError):
             return set(), set()
         roles = set(data.get("roles", [])) if isinstance(data, dict) else set()
@@ -599,22 +613,22 @@ class CodexAdapter(ToolAdapter):
     def _save_agent_sidecar(target_dir: Path, roles: set[str], launchers: set[str]) -> None:
         sidecar = target_dir / _AGENT_SIDECAR
         if not roles and not launchers:
-            sidecar.unlink(missing_ok=True)
+            fileio.remove_file(sidecar)
             return
         payload = {"roles": sorted(roles), "launchers": sorted(launchers)}
-        sidecar.write_text(json.dumps(payload, indent=2) + "\n")
+        write_text_if_changed(sidecar, json.dumps(payload, indent=2) + "\n")
 
     @staticmethod
     def _manual_codex_toml(config_path: Path) -> str:
-        text = config_path.read_text() if config_path.exists() else ""
+        text = fileio.read_text(config_path) if fileio.exists(config_path) else ""
         return TomlBlockDriver.strip_all(text)
 
     @staticmethod
     def _read_multi_agent_flag(config_path: Path) -> bool | None:
-        if not config_path.exists():
+        if not fileio.exists(config_path):
             return None
         try:
-            data = tomllib.loads(config_path.read_text())
+            data = tomllib.loads(fileio.read_text(config_path))
         except (tomllib.TOMLDecodeError, OSError):
             return None
         features = data.get("features", {})
@@ -631,27 +645,27 @@ class CodexAdapter(ToolAdapter):
 
     @staticmethod
     def _is_hawk_role_file(path: Path) -> bool:
-        if not path.is_file():
+        if not fileio.exists(path) or fileio.is_dir(path):
             return False
         try:
-            return _ROLE_FILE_MARKER in path.read_text(errors="replace")
+            return _ROLE_FILE_MARKER in fileio.read_text(path, errors="replace")
         except OSError:
             return False
 
     @staticmethod
     def _is_hawk_launcher_skill(path: Path) -> bool:
         skill_file = path / "SKILL.md"
-        if not skill_file.is_file():
+        if not fileio.exists(skill_file) or fileio.is_dir(skill_file):
             return False
         try:
-            return _LAUNCHER_MARKER in skill_file.read_text(errors="replace")
+            return _LAUNCHER_MARKER in fileio.read_text(skill_file, errors="replace")
         except OSError:
             return False
 
     @staticmethod
     def _update_notify_block(config_path: Path, commands: list[str]) -> None:
         """Insert/replace/remove hawk-managed notify block in config.toml."""
-        text = config_path.read_text() if config_path.exists() else ""
+        text = fileio.read_text(config_path) if fileio.exists(config_path) else ""
         block_re = re.compile(
             rf"{re.escape(_BEGIN_NOTIFY_BLOCK)}\n.*?{re.escape(_END_NOTIFY_BLOCK)}\n?",
             re.DOTALL,
@@ -672,15 +686,14 @@ class CodexAdapter(ToolAdapter):
         elif text:
             text = text + "\n"
 
-        config_path.parent.mkdir(parents=True, exist_ok=True)
-        config_path.write_text(text)
+        write_text_if_changed(config_path, text)
 
     @staticmethod
     def _has_manual_notify_key_outside_block(config_path: Path) -> bool:
         """Detect user-managed notify keys to avoid TOML key collisions."""
-        if not config_path.exists():
+        if not fileio.exists(config_path):
             return False
-        text = config_path.read_text()
+        text = fileio.read_text(config_path)
         block_re = re.compile(
             rf"{re.escape(_BEGIN_NOTIFY_BLOCK)}\n.*?{re.escape(_END_NOTIFY_BLOCK)}\n?",
             re.DOTALL,
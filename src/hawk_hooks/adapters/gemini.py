@@ -6,6 +6,9 @@ import json
 from pathlib import Path
 import re
 
+from .. import fileio
+from ..fileio import write_text_if_changed
+from ..profiling import span
 from ..types import Tool
 from .base import ToolAdapter
 
@@ -83,13 +86,13 @@ class GeminiAdapter(ToolAdapter):
     def link_command(self, source: Path, target_dir: Path) -> Path:
         """Convert markdown command to TOML and write to commands dir."""
         commands_dir = self.get_commands_dir(target_dir)
-        commands_dir.mkdir(parents=True, exist_ok=True)
+        fileio.make_dirs(commands_dir)
 
         # Generate TOML filename
         dest = commands_dir / f"{source.stem}.toml"
 
         toml_content = md_to_toml(source)
-        dest.write_text(toml_content)
+        write_text_if_changed(dest, toml_content)
         return dest
 
     def unlink_command(self, name: str, target_dir: Path) -> bool:
@@ -99,8 +102,8 @@ class GeminiAdapter(ToolAdapter):
         for ext in [".toml", ".md", ""]:
             stem = name.rsplit(".", 1)[0] if "." in name else name
             path = commands_dir / f"{stem}{ext}" if ext else commands_dir / name
-            if path.exists():
-                path.unlink()
+            if fileio.exists(path):
+                fileio.remove_file(path)
                 return True
         return False
 
@@ -139,7 +142,7 @@ class GeminiAdapter(ToolAdapter):
         result = SyncResult(tool=str(self.tool))
 
         for dir_getter in [self.get_skills_dir, self.get_agents_dir, self.get_prompts_dir]:
-            dir_getter(target_dir).mkdir(parents=True, exist_ok=True)
+            fileio.make_dirs(dir_getter(target_dir))
 
         self._sync_component(resolved.skills, registry_path / "skills", target_dir,
                              self.link_skill, self.unlink_skill, self.get_skills_dir, result)
@@ -159,7 +162,8 @@ class GeminiAdapter(ToolAdapter):
 
         try:
             self._set_hook_diagnostics(skipped=[], errors=[])
-            registered = self.register_hooks(resolved.hooks, target_dir, registry_path=registry_path)
+            with span("register_hooks", tool=self.tool):
+                registered = self.register_hooks(resolved.hooks, target_dir, registry_path=registry_path)
             result.linked.extend(f"hook:{h}" for h in registered)
             for skipped in self._take_hook_skipped():
                 result.skipped.append(f"hooks: {skipped}")
@@ -169,8 +173,9 @@ class GeminiAdapter(ToolAdapter):
             result.errors.append(f"hooks: {e}")
 
         try:
-            servers = self._load_mcp_servers(resolved.mcp, registry_path / "mcp") if resolved.mcp else {}
-            self.write_mcp_config(servers, target_dir)
+            servers = self._load_planned_mcp_servers(resolved.mcp, registry_path)
+            with span("mcp_write", tool=self.tool):
+                self.write_mcp_config(servers, target_dir)
             result.linked.extend(f"mcp:{name}" for name in servers)
         except Exception as e:
             result.errors.append(f"mcp: {e}")
@@ -185,17 +190,16 @@ class GeminiAdapter(ToolAdapter):
         generating command runners that inject `additionalContext`.
         """
         from ..event_mapping import get_event_support, get_tool_event_or_none
-        from ..hook_meta import parse_hook_meta
+        from ..registry_index import hook_meta
 
         skipped: list[str] = []
         runners_dir = target_dir / "runners"
 
         if not hook_names or registry_path is None:
             self._remove_hawk_hooks(target_dir)
-            if runners_dir.exists():
-                for f in runners_dir.iterdir():
-                    if f.suffix == ".sh":
-                        f.unlink()
+            for f in fileio.list_dir(runners_dir):
+                if f.suffix == ".sh":
+                    fileio.remove_file(f)
             self._set_hook_diagnostics(skipped=[], errors=[])
             return []
 
@@ -210,15 +214,16 @@ class GeminiAdapter(ToolAdapter):
                 script_hooks.append(name)
 
         runners = self._generate_runners(script_hooks, registry_path, runners_dir) if script_hooks else {}
-        for stale in runners_dir.glob("prompt-*.sh"):
-            stale.unlink(missing_ok=True)
+        for stale in fileio.list_dir(runners_dir):
+            if stale.name.startswith("prompt-") and stale.suffix == ".sh":
+                fileio.remove_file(stale)
 
         event_timeouts: dict[str, int] = {}
         for name in script_hooks:
             hook_path = hooks_dir / name
             if not hook_path.is_file():
                 continue
-            meta = parse_hook_meta(hook_path)
+            meta = hook_meta(hook_path)
             for event in meta.events:
                 if event in runners and meta.timeout > 0:
                     event_timeouts[event] = max(event_timeouts.get(event, 0), meta.timeout)
@@ -246,7 +251,7 @@ class GeminiAdapter(ToolAdapter):
             matcher = get_tool_event_or_none(event_name, "gemini")
             if support == "unsupported" or not matcher:
                 skipped.append(f"{event_name} is unsupported by gemini and was skipped")
-                runner_path.unlink(missing_ok=True)
+                fileio.remove_file(runner_path)
                 continue
 
             hook_def: dict = {
@@ -281,7 +286,7 @@ class GeminiAdapter(ToolAdapter):
                 skipped.append(f"{name} has no prompt text and was skipped")
                 continue
 
-            meta = parse_hook_meta(hook_path)
+            meta = hook_meta(hook_path)
             events = meta.events if meta.events else ["pre_tool_use"]
             try:
                 timeout = int(data.get("timeout", meta.timeout))
@@ -326,7 +331,7 @@ class GeminiAdapter(ToolAdapter):
             hook_path = hooks_dir / name
             if not hook_path.is_file():
                 continue
-            events = parse_hook_meta(hook_path).events
+            events = hook_meta(hook_path).events
             if any(event in registered_events for event in events):
                 registered.append(name)
 
@@ -379,17 +384,16 @@ class GeminiAdapter(ToolAdapter):
 
     @staticmethod
     def _load_json(path: Path) -> dict:
-        if path.exists():
+        if fileio.exists(path):
             try:
-                return json.loads(path.read_text())
+                return json.loads(fileio.read_text(path))
             except (json.JSONDecodeError, OSError):
                 pass
         return {}
 
     @staticmethod
     def _save_json(path: Path, data: dict) -> None:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(data, indent=2) + "\n")
+        write_text_if_changed(path, json.dumps(data, indent=2) + "\n")
 
     @staticmethod
     def _write_prompt_bridge_runner(
@@ -1,6 +1,7 @@
 """Composable mixins for tool adapter behavior."""
 
 from .mcp import MCPMixin
+from .plan_cache import PlanCacheMixin
 from .runner import HookRunnerMixin
 
-__all__ = ["HookRunnerMixin", "MCPMixin"]
+__all__ = ["HookRunnerMixin", "MCPMixin", "PlanCacheMixin"]
@@ -4,15 +4,102 @@ from __future__ import annotations
 
 import json
 import logging
+import re
 from pathlib import Path
 from typing import Any
 
-from ...registry import _validate_name
+from ... import fileio, registry_index
+from ...fileio import write_text_if_changed
+from ...registry import Registry
 
 # Shared marker for hawk-managed MCP entries
 HAWK_MCP_MARKER = "__hawk_managed"
 logger = logging.getLogger(__name__)
 
+_WS_RE = re.compile(r"[ \t\n\r]*")
+
+
+def _locate_top_level_member(
+    text: str, key: str
+) -> tuple[tuple[int, int] | None, Any, int, int]:
+    """Find the value span of *key* in a top-level JSON object.
+
+    Walks only the top-level members; nested values are skipped with the C
+    decoder and never re-serialized.
+
+    Returns:
+        ``(value_span, value, last_value_end, close_brace_index)`` where
+        *value_span* is ``(start, end)`` of the last occurrence of *key*
+        (matching ``json.loads`` semantics) or None if absent, *value* is
+        its decoded value, and *last_value_end* is the end of the final
+        member (or the index just after ``{`` for an empty object).
+
+    Raises:
+        ValueError: If *text* is not a single top-level JSON object.
+    """
+    decoder = json.JSONDecoder()
+    idx = _WS_RE.match(text, 0).end()
+    if idx >= len(text) or text[idx] != "{":
+        raise ValueError("not a JSON object")
+    last_end = idx + 1
+    idx = _WS_RE.match(text, idx + 1).end()
+    span: tuple[int, int] | None = None
+    found: Any = None
+
+    if idx < len(text) and text[idx] == "}":
+        close = idx
+    else:
+        while True:
+            if idx >= len(text) or text[idx] != '"':
+                raise ValueError(f"expected member name at {idx}")
+            name, idx = json.decoder.scanstring(text, idx + 1)
+            idx = _WS_RE.match(text, idx).end()
+            if idx >= len(text) or text[idx] != ":":
+                raise ValueError(f"expected ':' at {idx}")
+            idx = _WS_RE.match(text, idx + 1).end()
+            value, end = decoder.raw_decode(text, idx)
+            if name == key:
+                span = (idx, end)
+                found = value
+            last_end = end
+            idx = _WS_RE.match(text, end).end()
+            if idx < len(text) and text[idx] == ",":
+                idx = _WS_RE.match(text, idx + 1).end()
+                continue
+            if idx < len(text) and text[idx] == "}":
+                close = idx
+                break
+            raise ValueError(f"expected ',' or '}}' at {idx}")
+
+    if _WS_RE.match(text, close + 1).end() != len(text):
+        raise ValueError("trailing data after JSON object")
+    return span, found, last_end, close
+
+
+def _splice_top_level_member(
+    text: str,
+    key: str,
+    value: object,
+    location: tuple[tuple[int, int] | None, Any, int, int],
+) -> str:
+    """Replace or insert one top-level member, leaving other bytes untouched.
+
+    *location* is the result of :func:`_locate_top_level_member` for *text*.
+    The new value is rendered with 2-space indentation nested one level,
+    matching how Claude and hawk format these files.
+    """
+    span, _old, last_end, close = location
+    rendered = json.dumps(value, indent=2).replace("\n", "\n  ")
+    if span is not None:
+        start, end = span
+        return text[:start] + rendered + text[end:]
+
+    member = f"{json.dumps(key)}: {rendered}"
+    if text[last_end - 1] == "{" and last_end - 1 == _WS_RE.match(text, 0).end():
+        # Empty object: place the member on its own line.
+        return f"{text[:last_end]}\n  {member}\n{text[close:]}"
+    return f"{text[:last_end]},\n  {member}{text[last_end:]}"
+
 
 class MCPMixin:
     """Provide shared MCP loading and merge helpers."""
@@ -24,37 +111,27 @@ class MCPMixin:
     ) -> dict[str, dict[str, Any]]:
         """Load MCP server configs from registry yaml files.
 
-        Each .yaml file in registry/mcp/ defines a server config.
+        Each .yaml file in registry/mcp/ defines a server config. Names are
+        resolved through the registry's name index, so they may omit the
+        extension or be ``namespace/name`` references.
         Returns dict of {server_name: config_dict}.
         """
         import yaml
 
+        index = Registry(mcp_dir.parent).names()
         servers: dict[str, dict[str, Any]] = {}
         for name in mcp_names:
-            try:
-                _validate_name(name)
-            except ValueError:
+            path = index.path(mcp_dir.name, name)
+            if path is None:
                 continue
-
-            # Try with and without extension
-            candidates = [mcp_dir / name]
-            if not name.endswith((".yaml", ".yml", ".json")):
-                candidates.extend([
-                    mcp_dir / f"{name}.yaml",
-                    mcp_dir / f"{name}.yml",
-                    mcp_dir / f"{name}.json",
-                ])
-
-            for path in candidates:
-                if path.exists() and path.is_file():
-                    try:
-                        data = yaml.safe_load(path.read_text())
-                        if isinstance(data, dict):
-                            server_name = path.stem
-                            servers[server_name] = data
-                    except Exception:
-                        pass
-                    break
+            try:
+                data = registry_index.lookup(
+                    path, "mcp", lambda: yaml.safe_load(path.read_text())
+                )
+                if isinstance(data, dict):
+                    servers[path.stem] = data
+            except Exception:
+                pass
 
         return servers
 
@@ -67,15 +144,26 @@ class MCPMixin:
         """Merge hawk-managed MCP servers into a JSON config file.
 
         Preserves manually-added entries, replaces hawk-managed ones.
+
+        Only the ``server_key`` member is rewritten; everything else in the
+        file is kept byte-for-byte. This matters for ``~/.claude.json``,
+        which can grow to tens of MB of Claude-owned project history. When
+        the merged section is unchanged, the file is not touched at all.
         """
-        data: dict = {}
-        if config_path.exists():
+        text = ""
+        location = None
+        existing: Any = {}
+        if fileio.exists(config_path):
             try:
-                data = json.loads(config_path.read_text())
-            except (json.JSONDecodeError, OSError):
-                data = {}
+                # Decode bytes directly so line endings are preserved as-is.
+                text = fileio.read_bytes(config_path).decode("utf-8")
+                location = _locate_top_level_member(text, server_key)
+                if location[0] is not None:
+                    existing = location[1]
+            except (ValueError, IndexError, OSError):
+                # Unreadable or invalid JSON: rewrite from scratch below.
+                location = None
 
-        existing = data.get(server_key, {})
         if not isinstance(existing, dict):
             logger.warning(
                 "Expected %s to be a dict in %s, got %s; ignoring malformed section",
@@ -94,9 +182,13 @@ class MCPMixin:
         for name, cfg in servers.items():
             cleaned[name] = {**cfg, HAWK_MCP_MARKER: True}
 
-        data[server_key] = cleaned
-        config_path.parent.mkdir(parents=True, exist_ok=True)
-        config_path.write_text(json.dumps(data, indent=2) + "\n")
+        if location is not None:
+            if location[0] is not None and location[1] == cleaned:
+                return
+            new_text = _splice_top_level_member(text, server_key, cleaned, location)
+        else:
+            new_text = json.dumps({server_key: cleaned}, indent=2) + "\n"
+        write_text_if_changed(config_path, new_text)
 
     @staticmethod
     def _read_mcp_json(
@@ -104,10 +196,10 @@ class MCPMixin:
         server_key: str = "mcpServers",
     ) -> dict[str, dict]:
         """Read only hawk-managed MCP entries from a JSON config file."""
-        if not config_path.exists():
+        if not fileio.exists(config_path):
             return {}
         try:
-            data = json.loads(config_path.read_text())
+            data = json.loads(fileio.read_text(config_path))
         except (json.JSONDecodeError, OSError):
             return {}
         servers = data.get(server_key, {})
@@ -138,17 +230,17 @@ class MCPMixin:
 
         # Read existing managed names from sidecar
         old_managed: set[str] = set()
-        if sidecar_path.exists():
+        if fileio.exists(sidecar_path):
             try:
-                old_managed = set(json.loads(sidecar_path.read_text()))
+                old_managed = set(json.loads(fileio.read_text(sidecar_path)))
             except (json.JSONDecodeError, OSError):
                 pass
 
         # Also detect legacy inline markers and migrate them
         data: dict = {}
-        if config_path.exists():
+        if fileio.exists(config_path):
             try:
-                data = json.loads(config_path.read_text())
+                data = json.loads(fileio.read_text(config_path))
             except (json.JSONDecodeError, OSError):
                 data = {}
 
@@ -182,12 +274,11 @@ class MCPMixin:
             cleaned[name] = cfg
 
         data[server_key] = cleaned
-        config_path.parent.mkdir(parents=True, exist_ok=True)
-        config_path.write_text(json.dumps(data, indent=2) + "\n")
+        write_text_if_changed(config_path, json.dumps(data, indent=2) + "\n")
 
         # Write sidecar with current managed names
         new_managed = sorted(servers.keys())
         if new_managed:
-            sidecar_path.write_text(json.dumps(new_managed, indent=2) + "\n")
-        elif sidecar_path.exists():
-            sidecar_path.unlink()
+            write_text_if_changed(sidecar_path, json.dumps(new_managed, indent=2) + "\n")
+        else:
+            fileio.remove_file(sidecar_path)
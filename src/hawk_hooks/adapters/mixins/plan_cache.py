@@ -0,0 +1,42 @@
+"""Plan memoization mixin for adapters syncing many identical targets."""
+
+from __future__ import annotations
+
+import contextlib
+from typing import Any, Callable, Hashable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+class PlanCacheMixin:
+    """Memoize target-independent sync planning across several targets.
+
+    Inside a ``plan_cache()`` block, values computed via ``_planned`` are
+    reused for every target synced by this adapter instance. Callers must
+    only open a block for targets that share the same resolved set and
+    registry, so that registry-derived plans (validated names, runner
+    contents, MCP payloads) are identical for all of them.
+    """
+
+    _plan_memo: dict[Hashable, Any] | None = None
+
+    @contextlib.contextmanager
+    def plan_cache(self) -> Iterator[None]:
+        """Share planning results across syncs made inside this block."""
+        if self._plan_memo is not None:
+            yield
+            return
+        self._plan_memo = {}
+        try:
+            yield
+        finally:
+            self._plan_memo = None
+
+    def _planned(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """Return the cached value for *key*, computing it on first use."""
+        memo = self._plan_memo
+        if memo is None:
+            return compute()
+        if key not in memo:
+            memo[key] = compute()
+        return memo[key]
@@ -6,11 +6,15 @@ import logging
 import re
 from pathlib import Path
 
+from ... import fileio
+from ...profiling import span
+from .plan_cache import PlanCacheMixin
+
 _ENV_VAR_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 logger = logging.getLogger(__name__)
 
 
-class HookRunnerMixin:
+class HookRunnerMixin(PlanCacheMixin):
     """Provide hook runner generation shared by multiple adapters."""
 
     def _generate_runners(
@@ -27,13 +31,46 @@ class HookRunnerMixin:
 
         Returns dict of {event_name: runner_path}.
         """
+        from ...runner_utils import _atomic_write_executable
+
+        with span("generate_runners", hooks=len(hook_names)):
+            # Runner contents only depend on the hooks and registry, so targets
+            # sharing a resolved set reuse one rendering.
+            contents = self._planned(
+                ("runners", tuple(hook_names), str(registry_path)),
+                lambda: self._render_runners(hook_names, registry_path),
+            )
+
+            runners: dict[str, Path] = {}
+            fileio.make_dirs(runners_dir)
+            for event, content in contents.items():
+                runner_path = runners_dir / f"{event}.sh"
+                _atomic_write_executable(runner_path, content)
+                runners[event] = runner_path
+
+            # Clean up stale runners for events that no longer have hooks
+            for existing in fileio.list_dir(runners_dir):
+                if existing.suffix == ".sh" and existing.stem not in contents:
+                    fileio.remove_file(existing)
+
+            return runners
+
+    def _render_runners(
+        self,
+        hook_names: list[str],
+        registry_path: Path,
+    ) -> dict[str, str]:
+        """Render runner script contents for *hook_names*.
+
+        Returns dict of {event_name: runner_content}.
+        """
         from collections import defaultdict
         import shlex
 
         from ...events import EVENTS
         from ...hook_meta import HookMeta
-        from ...hook_meta import parse_hook_meta
-        from ...runner_utils import _atomic_write_executable, _get_interpreter_path
+        from ...registry_index import hook_meta
+        from ...runner_utils import _get_interpreter_path
 
         # Resolve hooks and group by event, keeping metadata
         hooks_by_event: dict[str, list[tuple[Path, HookMeta]]] = defaultdict(list)
@@ -42,7 +79,7 @@ class HookRunnerMixin:
             hook_path = hooks_dir / name
             if not hook_path.is_file():
                 continue
-            meta = parse_hook_meta(hook_path)
+            meta = hook_meta(hook_path)
             for event in meta.events:
                 # Validate event name against canonical events to prevent
                 # path traversal (e.g. events=../../foo) and unknown events
@@ -50,8 +87,7 @@ class HookRunnerMixin:
                     continue
                 hooks_by_event[event].append((hook_path, meta))
 
-        runners: dict[str, Path] = {}
-        runners_dir.mkdir(parents=True, exist_ok=True)
+        contents: dict[str, str] = {}
 
         # Check for venv python
         from ... import config
@@ -135,13 +171,6 @@ INPUT=$(cat)
 
 exit 0
 """
-            runner_path = runners_dir / f"{event}.sh"
-            _atomic_write_executable(runner_path, content)
-            runners[event] = runner_path
-
-        # Clean up stale runners for events that no longer have hooks
-        for existing in runners_dir.iterdir():
-            if existing.suffix == ".sh" and existing.stem not in hooks_by_event:
-                existing.unlink()
+            contents[event] = content
 
-        return runners
+        return contents
@@ -5,6 +5,8 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+from .. import fileio
+from ..fileio import write_text_if_changed
 from ..types import Tool
 from .base import HAWK_MCP_MARKER, ToolAdapter
 
@@ -33,18 +35,17 @@ class OpenCodeAdapter(ToolAdapter):
     def register_hooks(self, hook_names: list[str], target_dir: Path, registry_path: Path | None = None) -> list[str]:
         """Bridge hook runners into OpenCode via a generated plugin."""
         from ..event_mapping import get_event_support, get_tool_event_or_none
-        from ..hook_meta import parse_hook_meta
+        from ..registry_index import hook_meta
 
         skipped: list[str] = []
         runners_dir = target_dir / "runners"
         plugin_path = target_dir / "plugins" / "hawk-hooks.ts"
 
         if not hook_names or registry_path is None:
-            if runners_dir.exists():
-                for f in runners_dir.iterdir():
-                    if f.suffix == ".sh":
-                        f.unlink()
-            plugin_path.unlink(missing_ok=True)
+            for f in fileio.list_dir(runners_dir):
+                if f.suffix == ".sh":
+                    fileio.remove_file(f)
+            fileio.remove_file(plugin_path)
             self._set_hook_diagnostics(skipped=[], errors=[])
             return []
 
@@ -71,7 +72,7 @@ class OpenCodeAdapter(ToolAdapter):
             tool_event = get_tool_event_or_none(event_name, "opencode")
             if support == "unsupported" or not tool_event:
                 skipped.append(f"{event_name} is unsupported by opencode and was skipped")
-                runner_path.unlink(missing_ok=True)
+                fileio.remove_file(runner_path)
                 continue
             mapped_events.setdefault(tool_event, []).append(str(runner_path))
             bridged_events.add(event_name)
@@ -79,14 +80,14 @@ class OpenCodeAdapter(ToolAdapter):
         if mapped_events:
             self._write_hook_plugin(plugin_path, mapped_events)
         else:
-            plugin_path.unlink(missing_ok=True)
+            fileio.remove_file(plugin_path)
 
         registered: list[str] = []
         for name in script_hooks:
             hook_path = hooks_dir / name
             if not hook_path.is_file():
                 continue
-            events = parse_hook_meta(hook_path).events
+            events = hook_meta(hook_path).events
             if any(event in bridged_events for event in events):
                 registered.append(name)
 
@@ -108,9 +109,9 @@ class OpenCodeAdapter(ToolAdapter):
         sidecar_path = target_dir / ".hawk-mcp.json"
 
         data: dict = {}
-        if config_path.exists():
+        if fileio.exists(config_path):
             try:
-                data = json.loads(config_path.read_text())
+                data = json.loads(fileio.read_text(config_path))
             except (json.JSONDecodeError, OSError):
                 data = {}
 
@@ -122,9 +123,9 @@ class OpenCodeAdapter(ToolAdapter):
             legacy = {}
 
         old_managed: set[str] = set()
-        if sidecar_path.exists():
+        if fileio.exists(sidecar_path):
             try:
-                old_managed = set(json.loads(sidecar_path.read_text()))
+                old_managed = set(json.loads(fileio.read_text(sidecar_path)))
             except (json.JSONDecodeError, OSError):
                 old_managed = set()
 
@@ -155,19 +156,18 @@ class OpenCodeAdapter(ToolAdapter):
         data["mcp"] = merged
         data.pop("mcpServers", None)
 
-        config_path.parent.mkdir(parents=True, exist_ok=True)
-        config_path.write_text(json.dumps(data, indent=2) + "\n")
+        write_text_if_changed(config_path, json.dumps(data, indent=2) + "\n")
 
         managed_names = sorted(servers.keys())
         if managed_names:
-            sidecar_path.write_text(json.dumps(managed_names, indent=2) + "\n")
-        elif sidecar_path.exists():
-            sidecar_path.unlink()
+            write_text_if_changed(sidecar_path, json.dumps(managed_names, indent=2) + "\n")
+        else:
+            fileio.remove_file(sidecar_path)
 
     @staticmethod
     def _write_hook_plugin(plugin_path: Path, mapped_events: dict[str, list[str]]) -> None:
         """Write an OpenCode plugin that executes hawk event runners."""
-        plugin_path.parent.mkdir(parents=True, exist_ok=True)
+        fileio.make_dirs(plugin_path.parent)
 
         event_lines: list[str] = []
         for event_name in sorted(mapped_events.keys()):
@@ -203,4 +203,4 @@ class OpenCodeAdapter(ToolAdapter):
             "  },\n"
             "});\n"
         )
-        plugin_path.write_text(content)
+        write_text_if_changed(plugin_path, content)
@@ -100,6 +100,24 @@ def cmd_init(args):
 
 def cmd_sync(args):
     """Sync components to tools."""
+    if args.profile is None:
+        _run_sync_command(args)
+        return
+
+    from . import config
+    from .profiling import profile
+
+    with profile() as profiler:
+        _run_sync_command(args)
+
+    trace_path = Path(args.profile or config.get_config_dir() / "cache" / "sync-trace.json")
+    profiler.write_chrome_trace(trace_path)
+    print("\nProfile:")
+    print(profiler.format_summary())
+    print(f"\nChrome trace written to {trace_path}")
+
+
+def _run_sync_command(args):
     from . import config
     from .sync import format_sync_results, sync_all, sync_directory, sync_global
 
@@ -111,6 +129,25 @@ def cmd_sync(args):
 
     force = args.force
 
+    if args.plan:
+        import json
+
+        from .sync import plan_all, plan_directory, plan_global
+
+        if args.dir:
+            project_dir = Path(args.dir).resolve()
+            plans = {str(project_dir): plan_directory(project_dir, tools=tools, force=force)}
+        elif args.globals_only:
+            plans = {"global": plan_global(tools=tools, force=force)}
+        else:
+            plans = plan_all(tools=tools, force=force)
+        payload = {
+            scope: [plan.to_dict() for plan in scope_plans]
+            for scope, scope_plans in plans.items()
+        }
+        print(json.dumps(payload, indent=2))
+        return
+
     if args.dir:
         project_dir = Path(args.dir).resolve()
         results = sync_directory(project_dir, tools=tools, dry_run=args.dry_run, force=force)
@@ -150,7 +187,7 @@ def cmd_status(args):
         project_dir = Path(args.dir).resolve()
 
         # Show config chain
-        config_chain = config.get_config_chain(project_dir)
+        config_chain = config.get_config_chain(project_dir, cfg=cfg)
         if config_chain:
             chain_labels = ["global"] + [str(d) for d, _ in config_chain]
             print(f"\nChain: {' -> '.join(chain_labels)}")
@@ -221,7 +258,7 @@ def cmd_status(args):
         print(f"  {tool}: {', '.join(status_parts)}")
 
     # Show registered directories
-    dirs = config.get_registered_directories()
+    dirs = cfg.get("directories", {})
     if dirs:
         print(f"\nDirectories ({len(dirs)}):")
         for dir_path, entry in dirs.items():
@@ -524,6 +561,29 @@ def cmd_list(args):
                 print(f"  {name}")
 
 
+def cmd_search(args):
+    """Full-text search of registry contents."""
+    from . import config, search_index
+
+    component_type = None
+    if args.type:
+        component_type = (
+            ComponentType.PROMPT if args.type == "command" else ComponentType(args.type)
+        )
+
+    hits = search_index.search(
+        " ".join(args.query),
+        registry_path=config.get_registry_path(),
+        component_type=component_type,
+        limit=args.limit,
+    )
+    if not hits:
+        print("No matches.")
+        return
+    for hit in hits:
+        print(f"  {hit.component_type.registry_dir}/{hit.name}  ({hit.score:.2f})")
+
+
 def cmd_profile_list(args):
     """List available profiles."""
     from . import config
@@ -686,21 +746,14 @@ def cmd_scan(args):
     else:
         selected_items = content.items
 
-    # Check clashes — auto-rename with package prefix, then skip remaining
+    # Check clashes — move into the package namespace, then skip remaining
     clashes = check_clashes(selected_items, registry)
     replace = args.replace
     if clashes and not replace:
-        from .download_service import _prefixed_name
+        from .download_service import namespace_clashes
+        # Prefer per-item package, fall back to top-level package meta
         top_pkg = content.package_meta.name if content.package_meta else ""
-        for item in clashes:
-            # Prefer per-item package, fall back to top-level package meta
-            item_pkg = item.package or top_pkg
-            pkg_prefix = item_pkg.split("/")[-1] if "/" in item_pkg else item_pkg if item_pkg else ""
-            if pkg_prefix:
-                new_name = _prefixed_name(pkg_prefix, item.name)
-                if not registry.detect_clash(item.component_type, new_name):
-                    print(f"  Renamed {item.name} -> {new_name} (clash with existing)")
-                    item.name = new_name
+        namespace_clashes(clashes, registry, top_pkg, print)
 
         # Re-check remaining clashes after renames
         still_clashing = [
@@ -935,6 +988,47 @@ def cmd_prune(args):
         print("\nPruned hawk-managed and stale hawk-linked artifacts from tool configs.")
 
 
+def cmd_dedupe(args):
+    """Store registry files once by content, as hardlinks into an object store."""
+    from .registry import Registry
+
+    linked, saved = Registry().dedupe()
+    print(f"Linked {linked} file(s) into the registry object store; {saved} bytes saved.")
+    print("Future adds and package updates only store new content.")
+
+
+def cmd_rollback(args):
+    """Switch the registry back to an earlier generation."""
+    from . import generations
+    from .registry import Registry
+
+    path = Registry().path
+    if getattr(args, "enable", False):
+        number = generations.enable(path)
+        print(f"Registry generations enabled (active: {number}).")
+        print("`hawk update` now keeps the previous registry for `hawk rollback`.")
+        return
+
+    active = generations.active_generation(path)
+    if active is None:
+        print("Registry generations are not enabled. Run: hawk rollback --enable")
+        sys.exit(1)
+
+    if getattr(args, "list", False):
+        for number in generations.list_generations(path):
+            marker = "*" if number == active else " "
+            print(f"{marker} {number}")
+        return
+
+    try:
+        number = generations.rollback(path, to=getattr(args, "to", None))
+    except generations.GenerationError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Registry rolled back to generation {number} (was {active}).")
+    print("Run `hawk sync` to apply it to your tools.")
+
+
 def cmd_config(args):
     """Show or update configuration."""
     if getattr(args, "ui", False):
@@ -1047,9 +1141,10 @@ def cmd_new(args):
         get_template,
     )
 
-    from .registry import _validate_name
+    from .registry import Registry, _validate_name
 
     registry_path = config.get_registry_path()
+    registry = Registry(registry_path)
     comp_type = args.type
     name = args.name
     event = getattr(args, "event", "pre_tool_use")
@@ -1109,6 +1204,7 @@ def cmd_new(args):
         if dest.exists() and not args.force:
             print(f"Error: {dest} already exists. Use --force to overwrite.")
             sys.exit(1)
+        registry.detach(dest)
         dest.write_text(content)
         dest.chmod(0o755)
 
@@ -1129,6 +1225,7 @@ def cmd_new(args):
         if dest.exists() and not args.force:
             print(f"Error: {dest} already exists. Use --force to overwrite.")
             sys.exit(1)
+        registry.detach(dest)
         dest.write_text(content)
 
         _print(f"[green]+[/green] Created prompt: {dest}")
@@ -1147,6 +1244,7 @@ def cmd_new(args):
         if dest.exists() and not args.force:
             print(f"Error: {dest} already exists. Use --force to overwrite.")
             sys.exit(1)
+        registry.detach(dest)
         dest.write_text(content)
 
         _print(f"[green]+[/green] Created agent: {dest}")
@@ -1169,6 +1267,7 @@ def cmd_new(args):
         if dest.exists() and not args.force:
             print(f"Error: {dest} already exists. Use --force to overwrite.")
             sys.exit(1)
+        registry.detach(dest)
         dest.write_text(content)
 
         _print(f"[green]+[/green] Created prompt hook: {dest}")
@@ -1263,7 +1362,7 @@ def cmd_deps(args):
     """Install dependencies for all hooks in the registry."""
     import subprocess
     from . import config
-    from .hook_meta import parse_hook_meta
+    from .registry_index import hook_meta
 
     registry_path = config.get_registry_path()
     hooks_dir = registry_path / "hooks"
@@ -1276,7 +1375,7 @@ def cmd_deps(args):
     all_deps: set[str] = set()
     for hook_file in sorted(hooks_dir.iterdir()):
         if hook_file.is_file():
-            meta = parse_hook_meta(hook_file)
+            meta = hook_meta(hook_file)
             if meta.deps:
                 for dep in meta.deps.split(","):
                     dep = dep.strip()
@@ -1324,9 +1423,12 @@ def _resolve_enable_targets(target: str) -> list[tuple[ComponentType, str]]:
 
     Resolution order:
     1. "type/name" where type is a valid registry_dir → single item
+       (name may be namespaced: "agents/superpowers/code-reviewer.md")
     2. Package name in packages.yaml → all items in package
     3. "package/type" → filter package items by type
-    4. Bare name → search registry for matching name across all types
+    4. "namespace/name" or bare name → registry name index, across all types
+
+    Items are returned under their registry names.
     """
     from . import config
     from .registry import Registry
@@ -1342,10 +1444,11 @@ def _resolve_enable_targets(target: str) -> list[tuple[ComponentType, str]]:
         if type_part in dir_to_ct and name_part:
             ct = dir_to_ct[type_part]
             registry = Registry(config.get_registry_path())
-            if not registry.has(ct, name_part):
+            registry_name = registry.resolve(ct, name_part)
+            if registry_name is None:
                 print(f"Error: {target} not found in registry.")
                 sys.exit(1)
-            return [(ct, name_part)]
+            return [(ct, registry_name)]
 
         # 3. Check "package/type" format
         packages = config.load_packages()
@@ -1371,6 +1474,10 @@ def _resolve_enable_targets(target: str) -> list[tuple[ComponentType, str]]:
                         sys.exit(1)
                     return filtered
 
+        matches = _resolve_registry_ref(target)
+        if len(matches) == 1:
+            return matches
+
         print(f"Error: Cannot resolve '{target}'. Use type/name, package name, or package/type.")
         sys.exit(1)
 
@@ -1384,9 +1491,7 @@ def _resolve_enable_targets(target: str) -> list[tuple[ComponentType, str]]:
         return [(ComponentType(t), n) for t, n in pkg_items]
 
     # 4. Bare name — search registry
-    registry = Registry(config.get_registry_path())
-    all_items = registry.list_flat()
-    matches = [(ct, n) for ct, n in all_items if n == target]
+    matches = _resolve_registry_ref(target)
 
     if len(matches) == 1:
         return matches
@@ -1400,6 +1505,20 @@ def _resolve_enable_targets(target: str) -> list[tuple[ComponentType, str]]:
         sys.exit(1)
 
 
+def _resolve_registry_ref(ref: str) -> list[tuple[ComponentType, str]]:
+    """Registry items *ref* names, one lookup per component type."""
+    from . import config
+    from .registry import Registry
+
+    names = Registry(config.get_registry_path()).names()
+    matches = []
+    for ct in ComponentType:
+        registry_name = names.resolve(ct.registry_dir, ref)
+        if registry_name is not None:
+            matches.append((ct, registry_name))
+    return matches
+
+
 def _enable_items(
     items: list[tuple[ComponentType, str]],
     cfg: dict,
@@ -1461,9 +1580,8 @@ def cmd_enable(args):
         config.save_dir_config(project_dir, cfg)
         scope = str(project_dir)
     else:
-        cfg = config.load_global_config()
-        newly_enabled = _enable_items(items, cfg, section_key="global")
-        config.save_global_config(cfg)
+        with config.transaction() as tx:
+            newly_enabled = _enable_items(items, tx.cfg, section_key="global")
         scope = "global config"
 
     if newly_enabled:
@@ -1503,9 +1621,8 @@ def cmd_disable(args):
         config.save_dir_config(project_dir, cfg)
         scope = str(project_dir)
     else:
-        cfg = config.load_global_config()
-        newly_disabled = _disable_items(items, cfg, section_key="global")
-        config.save_global_config(cfg)
+        with config.transaction() as tx:
+            newly_disabled = _disable_items(items, tx.cfg, section_key="global")
         scope = "global config"
 
     if newly_disabled:
@@ -1543,7 +1660,22 @@ def build_parser() -> argparse.ArgumentParser:
     sync_p.add_argument("--dir", help="Sync specific directory")
     sync_p.add_argument("--tool", choices=[t.value for t in Tool], help="Sync specific tool")
     sync_p.add_argument("--dry-run", action="store_true", help="Show what would change")
+    sync_p.add_argument(
+        "--plan",
+        action="store_true",
+        help="Print the exact file operations a sync would run (JSON)",
+    )
     sync_p.add_argument("--force", action="store_true", help="Bypass cache, sync unconditionally")
+    sync_p.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        metavar="TRACE",
+        help=(
+            "Time sync phases; print a summary and write a Chrome trace"
+            " (default: cache/sync-trace.json)"
+        ),
+    )
     sync_p.add_argument("-v", "--verbose", action="store_true", help="Show per-item sync details")
     sync_p.add_argument("--global", dest="globals_only", action="store_true", help="Sync global only")
     sync_p.set_defaults(func=cmd_sync)
@@ -1579,6 +1711,15 @@ def build_parser() -> argparse.ArgumentParser:
     list_p.add_argument("type", nargs="?", choices=[ct.value for ct in ComponentType], help="Filter by type")
     list_p.set_defaults(func=cmd_list)
 
+    # search
+    search_p = subparsers.add_parser("search", help="Full-text search of registry contents")
+    search_p.add_argument("query", nargs="+", help="Search terms")
+    search_p.add_argument(
+        "--type", choices=[ct.value for ct in ComponentType], help="Only this component type"
+    )
+    search_p.add_argument("--limit", type=int, default=20, help="Maximum results (default: 20)")
+    search_p.set_defaults(func=cmd_search)
+
     # profile
     profile_p = subparsers.add_parser("profile", help="Profile management")
     profile_sub = profile_p.add_subparsers(dest="profile_cmd")
@@ -1655,6 +1796,24 @@ def build_parser() -> argparse.ArgumentParser:
     )
     prune_p.set_defaults(func=cmd_prune)
 
+    # dedupe
+    dedupe_p = subparsers.add_parser(
+        "dedupe",
+        help="Share identical registry files through a content-addressed object store",
+    )
+    dedupe_p.set_defaults(func=cmd_dedupe)
+
+    # rollback
+    rollback_p = subparsers.add_parser(
+        "rollback", help="Switch the registry back to an earlier generation"
+    )
+    rollback_p.add_argument(
+        "--enable", action="store_true", help="Keep registry generations across updates"
+    )
+    rollback_p.add_argument("--list", action="store_true", help="List generations")
+    rollback_p.add_argument("--to", type=int, metavar="N", help="Generation to switch to")
+    rollback_p.set_defaults(func=cmd_rollback)
+
     # config
     config_p = subparsers.add_parser("config", help="Show or update configuration")
     config_p.add_argument("--ui", action="store_true", help="Launch interactive settings editor")
@@ -11,14 +11,20 @@ downloaded packages and their items.
 
 from __future__ import annotations
 
+import atexit
+import contextlib
+import contextvars
 import copy
 import hashlib
+import json
 import os
+import shutil
+import stat
+import time
+from dataclasses import dataclass, field
 from datetime import date
 from pathlib import Path
-from typing import Any
-
-import yaml
+from typing import Any, Iterator
 
 from .types import ComponentType, Tool
 
@@ -100,31 +106,349 @@ def ensure_v2_dirs(cfg: dict[str, Any] | None = None) -> None:
     for subdir in ["skills", "hooks", "agents", "mcp", "prompts"]:
         (registry / subdir).mkdir(parents=True, exist_ok=True)
 
-    # Cache dir for resolved sets
-    (get_config_dir() / "cache" / "resolved").mkdir(parents=True, exist_ok=True)
+    # Cache dir for sync state
+    (get_config_dir() / "cache").mkdir(parents=True, exist_ok=True)
+
+
+# ---------------------------------------------------------------------------
+# YAML file cache
+# ---------------------------------------------------------------------------
+
+# libyaml-backed loader/dumper, created on first use so that loads served
+# from the compiled snapshot never import PyYAML.
+_YamlLoader: Any = None
+_YamlDumper: Any = None
+
+
+class _ParseError(ValueError):
+    """A config file exists but is not valid YAML."""
+
+
+def _yaml_loader() -> Any:
+    global _YamlLoader
+    if _YamlLoader is None:
+        import yaml
+
+        _YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return _YamlLoader
+
+
+def _yaml_dumper() -> Any:
+    global _YamlDumper
+    if _YamlDumper is None:
+        import yaml
+
+        class Dumper(getattr(yaml, "CSafeDumper", yaml.SafeDumper)):  # type: ignore[misc]
+            """Safe dumper that writes str subclasses (e.g. ``Tool``) as plain strings."""
+
+        Dumper.add_multi_representer(
+            str, lambda dumper, data: dumper.represent_str(str.__str__(data))
+        )
+        _YamlDumper = Dumper
+    return _YamlDumper
+
+
+# Parsed config files keyed by path, validated against the file's stat.
+_file_cache: dict[str, tuple[tuple[int, int, int], Any]] = {}
+
+# Files modified this recently are not cached: a rewrite within the same
+# mtime tick could otherwise keep an identical stat key.
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def _stat_key(st: os.stat_result) -> tuple[int, int, int]:
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _clone(value: Any) -> Any:
+    """Copy parsed YAML data (much cheaper than ``copy.deepcopy``)."""
+    if isinstance(value, dict):
+        return {k: _clone(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_clone(v) for v in value]
+    if isinstance(value, (str, int, float, bool, type(None), date)):
+        return value
+    return copy.deepcopy(value)
+
+
+def _load_yaml(path: Path) -> Any:
+    """Parse the YAML file at *path*, reusing the last parse while its stat is unchanged.
+
+    Misses consult the compiled snapshot before parsing. Returns a private
+    copy the caller may mutate. Raises ``OSError`` (including
+    ``FileNotFoundError``) or ``_ParseError``.
+    """
+    key = str(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        _file_cache.pop(key, None)
+        raise
+    stamp = _stat_key(st)
+    cached = _file_cache.get(key)
+    if cached is not None and cached[0] == stamp:
+        return _clone(cached[1])
+
+    found, data = _snapshot_lookup(path, stamp)
+    if not found:
+        import yaml
+
+        try:
+            with open(path, "rb") as f:
+                data = yaml.load(f, Loader=_yaml_loader())
+        except yaml.YAMLError as e:
+            raise _ParseError(f"{path}: {e}") from e
+    if time.time_ns() - st.st_mtime_ns > _RACY_WINDOW_NS:
+        _file_cache[key] = (stamp, data)
+        if not found:
+            _snapshot_store(path, stamp, data)
+        return _clone(data)
+    _file_cache.pop(key, None)
+    return _clone(data) if found else data
+
+
+def _dump_yaml(data: Any, path: Path, *, backup: bool = False) -> None:
+    """Atomically write *data* as YAML to *path* and drop its cache entries.
+
+    The file is written to a temp sibling and renamed over *path*, so readers
+    never see a partial file. With *backup*, the previous contents are kept
+    as ``<name>.bak``.
+    """
+    import yaml
+
+    _file_cache.pop(str(path), None)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "w") as f:
+            yaml.dump(data, f, Dumper=_yaml_dumper(), default_flow_style=False, sort_keys=False)
+        try:
+            os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode))
+            if backup:
+                shutil.copy2(path, path.with_name(f"{path.name}.bak"))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    _snapshot_store(path, None, None)
+    flush_snapshot()
+
+
+def clear_cache() -> None:
+    """Forget all cached config file parses (the on-disk snapshot is kept)."""
+    global _snapshot_state, _package_index_state
+    flush_snapshot()
+    _file_cache.clear()
+    _snapshot_state = None
+    _package_index_state = None
+
+
+# ---------------------------------------------------------------------------
+# Compiled snapshot
+# ---------------------------------------------------------------------------
+#
+# cache/config-snapshot.json persists the parsed global config, profiles
+# and package index with the stat stamp each was parsed at. A fresh
+# process validates stamps with one stat per file and skips YAML (and the
+# PyYAML import) entirely. Entries are dropped when hawk saves the file
+# and re-added by the first load after the racy window, so a just-written
+# file is never trusted on stamp alone. Additions are written once, at
+# exit (or on the next save).
+
+_SNAPSHOT_VERSION = 1
+
+# (snapshot path, {source path: (stamp, data)}) for the current config dir.
+_snapshot_state: tuple[str, dict[str, tuple[tuple[int, int, int], Any]]] | None = None
+_snapshot_dirty = False
+
+
+def get_snapshot_path() -> Path:
+    """Get the compiled config snapshot path."""
+    return get_config_dir() / "cache" / "config-snapshot.json"
+
+
+def _is_snapshot_source(path: Path) -> bool:
+    return (
+        path == get_global_config_path()
+        or path == get_packages_path()
+        or path.parent == get_profiles_dir()
+    )
+
+
+def _snapshot_entries() -> dict[str, tuple[tuple[int, int, int], Any]]:
+    global _snapshot_state
+    snapshot_path = get_snapshot_path()
+    if _snapshot_state is not None and _snapshot_state[0] == str(snapshot_path):
+        return _snapshot_state[1]
+    # Config dir changed (tests); persist pending entries for the old one.
+    flush_snapshot()
+
+    entries: dict[str, tuple[tuple[int, int, int], Any]] = {}
+    try:
+        raw = json.loads(snapshot_path.read_bytes())
+        if raw.get("version") == _SNAPSHOT_VERSION:
+            for key, entry in raw.get("entries", {}).items():
+                entries[key] = (tuple(entry["stamp"]), entry["data"])
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        entries = {}
+    _snapshot_state = (str(snapshot_path), entries)
+    return entries
+
+
+def _snapshot_lookup(path: Path, stamp: tuple[int, int, int]) -> tuple[bool, Any]:
+    if not _is_snapshot_source(path):
+        return False, None
+    entry = _snapshot_entries().get(str(path))
+    if entry is not None and entry[0] == stamp:
+        return True, entry[1]
+    return False, None
+
+
+def _snapshot_store(path: Path, stamp: tuple[int, int, int] | None, data: Any) -> None:
+    """Record (or with ``stamp=None`` drop) *path* in the snapshot."""
+    global _snapshot_dirty
+    if not _is_snapshot_source(path):
+        return
+    entries = _snapshot_entries()
+    key = str(path)
+    if stamp is None:
+        if entries.pop(key, None) is not None:
+            _snapshot_dirty = True
+        return
+    try:
+        # Only snapshot data that survives JSON unchanged (no dates, int keys...).
+        if json.loads(json.dumps(data)) != data:
+            return
+    except (TypeError, ValueError):
+        return
+    entries[key] = (stamp, data)
+    _snapshot_dirty = True
+
+
+def flush_snapshot() -> None:
+    """Write pending snapshot changes to disk."""
+    global _snapshot_dirty
+    if not _snapshot_dirty or _snapshot_state is None:
+        return
+    _snapshot_dirty = False
+    payload = {
+        "version": _SNAPSHOT_VERSION,
+        "entries": {
+            k: {"stamp": list(stamp), "data": data}
+            for k, (stamp, data) in _snapshot_state[1].items()
+        },
+    }
+    write_cache_json(Path(_snapshot_state[0]), payload)
+
+
+def write_cache_json(path: Path, payload: Any) -> None:
+    """Atomically write a cache file under the config dir, ignoring errors."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        # No parents=True: never recreate a config dir that has gone away.
+        path.parent.mkdir(exist_ok=True)
+        tmp.write_text(json.dumps(payload, separators=(",", ":")))
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+atexit.register(flush_snapshot)
 
 
 def load_global_config() -> dict[str, Any]:
     """Load the global v2 config (config.yaml)."""
+    tx = _active_transaction.get()
+    if tx is not None:
+        return _clone(tx.cfg)
     config_path = get_global_config_path()
     try:
-        with open(config_path) as f:
-            data = yaml.safe_load(f)
+        data = _load_yaml(config_path)
         if not isinstance(data, dict):
             return copy.deepcopy(DEFAULT_GLOBAL_CONFIG)
         return _deep_merge(copy.deepcopy(DEFAULT_GLOBAL_CONFIG), data)
     except FileNotFoundError:
         return copy.deepcopy(DEFAULT_GLOBAL_CONFIG)
-    except (yaml.YAMLError, OSError):
+    except (_ParseError, OSError):
         return copy.deepcopy(DEFAULT_GLOBAL_CONFIG)
 
 
 def save_global_config(cfg: dict[str, Any]) -> None:
-    """Save the global v2 config."""
+    """Save the global v2 config.
+
+    Inside :func:`transaction` this only records *cfg* as the pending state.
+    """
+    tx = _active_transaction.get()
+    if tx is not None:
+        tx.cfg = cfg
+        return
+    _write_global_config(cfg)
+
+
+def _write_global_config(cfg: dict[str, Any], *, backup: bool = False) -> None:
+    from .locks import config_lock
+
     config_path = get_global_config_path()
     config_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(config_path, "w") as f:
-        yaml.dump(cfg, f, default_flow_style=False, sort_keys=False)
+    with config_lock():
+        _dump_yaml(cfg, config_path, backup=backup)
+
+
+@dataclass
+class ConfigTransaction:
+    """Pending global config state inside :func:`transaction`.
+
+    Mutate ``cfg`` in place (or call ``save_global_config``); it is written
+    when the transaction ends.
+    """
+
+    cfg: dict[str, Any]
+    backup: bool = False
+    _original: dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def changed(self) -> bool:
+        return self.cfg != self._original
+
+
+_active_transaction: contextvars.ContextVar[ConfigTransaction | None] = contextvars.ContextVar(
+    "hawk_config_transaction", default=None
+)
+
+
+@contextlib.contextmanager
+def transaction(*, backup: bool = False) -> Iterator[ConfigTransaction]:
+    """Batch global config changes into one locked, atomic write.
+
+    Holds the config lock for the whole block. Inside it,
+    ``load_global_config`` returns the pending state and
+    ``save_global_config`` only records it, so any number of
+    load/mutate/save steps write the file once, on a clean exit, and not
+    at all if nothing changed. An exception discards the pending changes.
+    Nested transactions join the outermost one.
+
+    Args:
+        backup: Keep the previous config as ``config.yaml.bak``.
+    """
+    outer = _active_transaction.get()
+    if outer is not None:
+        outer.backup = outer.backup or backup
+        yield outer
+        return
+
+    from .locks import config_lock
+
+    with config_lock():
+        cfg = load_global_config()
+        tx = ConfigTransaction(cfg, backup=backup, _original=_clone(cfg))
+        token = _active_transaction.set(tx)
+        try:
+            yield tx
+        finally:
+            _active_transaction.reset(token)
+        if tx.changed:
+            _write_global_config(tx.cfg, backup=tx.backup)
 
 
 def _validate_profile_name(name: str) -> None:
@@ -147,12 +471,11 @@ def load_profile(name: str) -> dict[str, Any] | None:
     _validate_profile_name(name)
     profile_path = get_profiles_dir() / f"{name}.yaml"
     try:
-        with open(profile_path) as f:
-            data = yaml.safe_load(f)
+        data = _load_yaml(profile_path)
         if isinstance(data, dict):
             return data
         return None
-    except (FileNotFoundError, yaml.YAMLError, OSError):
+    except (_ParseError, OSError):
         return None
 
 
@@ -161,8 +484,7 @@ def save_profile(name: str, data: dict[str, Any]) -> None:
     _validate_profile_name(name)
     profile_path = get_profiles_dir() / f"{name}.yaml"
     profile_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(profile_path, "w") as f:
-        yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+    _dump_yaml(data, profile_path)
 
 
 def list_profiles() -> list[str]:
@@ -182,12 +504,11 @@ def load_dir_config(project_dir: Path) -> dict[str, Any] | None:
     """
     config_path = get_dir_config_path(project_dir)
     try:
-        with open(config_path) as f:
-            data = yaml.safe_load(f)
+        data = _load_yaml(config_path)
         if isinstance(data, dict):
             return data
         return None
-    except (FileNotFoundError, yaml.YAMLError, OSError):
+    except (_ParseError, OSError):
         return None
 
 
@@ -195,27 +516,24 @@ def save_dir_config(project_dir: Path, data: dict[str, Any]) -> None:
     """Save per-directory config."""
     config_path = get_dir_config_path(project_dir)
     config_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(config_path, "w") as f:
-        yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+    _dump_yaml(data, config_path)
 
 
 def register_directory(project_dir: Path, profile: str | None = None) -> None:
     """Register a directory in the global index."""
-    cfg = load_global_config()
     dir_str = str(project_dir.resolve())
     entry: dict[str, Any] = {}
     if profile:
         entry["profile"] = profile
-    cfg.setdefault("directories", {})[dir_str] = entry
-    save_global_config(cfg)
+    with transaction() as tx:
+        tx.cfg.setdefault("directories", {})[dir_str] = entry
 
 
 def unregister_directory(project_dir: Path) -> None:
     """Remove a directory from the global index."""
-    cfg = load_global_config()
     dir_str = str(project_dir.resolve())
-    cfg.get("directories", {}).pop(dir_str, None)
-    save_global_config(cfg)
+    with transaction() as tx:
+        tx.cfg.get("directories", {}).pop(dir_str, None)
 
 
 def get_registered_directories() -> dict[str, dict[str, Any]]:
@@ -296,28 +614,53 @@ def get_enabled_tools(cfg: dict[str, Any] | None = None) -> list[Tool]:
     return enabled
 
 
-def get_config_chain(from_dir: Path) -> list[tuple[Path, dict[str, Any]]]:
+# (index keys, {normalized path: key}) for the last directory index seen.
+_dir_key_memo: tuple[list[str], dict[str, str]] | None = None
+
+
+def _dir_key_index(dirs: dict[str, Any]) -> dict[str, str]:
+    """Map each directory index key, normalized like ``Path``, to the key itself.
+
+    Hand-edited keys may carry trailing or doubled slashes; the map is
+    rebuilt only when the set of keys changes.
+    """
+    global _dir_key_memo
+    keys = list(dirs)
+    if _dir_key_memo is not None and _dir_key_memo[0] == keys:
+        return _dir_key_memo[1]
+    index = {str(Path(key)): key for key in keys}
+    _dir_key_memo = (keys, index)
+    return index
+
+
+def get_config_chain(
+    from_dir: Path,
+    cfg: dict[str, Any] | None = None,
+) -> list[tuple[Path, dict[str, Any]]]:
     """Find registered dirs that are parents of from_dir, plus from_dir itself.
 
-    Uses directory index (no filesystem walk-up). Returns outermost-first.
+    Uses directory index (no filesystem walk-up): each ancestor of
+    *from_dir* is looked up in the index, so the cost is O(depth) rather
+    than O(registered dirs). Returns outermost-first.
     Each entry is (dir_path, dir_config).
+
+    Args:
+        from_dir: Directory to build the chain for.
+        cfg: Optional already-loaded global config.
     """
-    dirs = get_registered_directories()
+    dirs = cfg.get("directories", {}) if cfg is not None else get_registered_directories()
+    if not dirs:
+        return []
+
     chain: list[tuple[Path, dict[str, Any]]] = []
     from_resolved = from_dir.resolve()
-
-    for dir_path_str in dirs:
-        dir_path = Path(dir_path_str)
-        try:
-            if from_resolved.is_relative_to(dir_path):
-                config = load_dir_config(dir_path)
-                if config is not None:
-                    chain.append((dir_path, config))
-        except (ValueError, TypeError):
+    index = _dir_key_index(dirs)
+    for dir_path in (*reversed(from_resolved.parents), from_resolved):
+        if str(dir_path) not in index:
             continue
-
-    # Sort outermost first (fewest path parts)
-    chain.sort(key=lambda x: len(x[0].parts))
+        dir_config = load_dir_config(dir_path)
+        if dir_config is not None:
+            chain.append((dir_path, dir_config))
     return chain
 
 
@@ -356,10 +699,9 @@ def prune_stale_directories() -> list[str]:
             stale.append(dir_path_str)
 
     if stale:
-        cfg = load_global_config()
-        for path in stale:
-            cfg.get("directories", {}).pop(path, None)
-        save_global_config(cfg)
+        with transaction() as tx:
+            for path in stale:
+                tx.cfg.get("directories", {}).pop(path, None)
 
     return stale
 
@@ -399,15 +741,14 @@ def load_packages() -> dict[str, Any]:
     """
     path = get_packages_path()
     try:
-        with open(path) as f:
-            data = yaml.safe_load(f)
+        data = _load_yaml(path)
         if isinstance(data, dict):
             packages = data.get("packages", {})
             if isinstance(packages, dict):
                 return packages
             return {}
         return {}
-    except (FileNotFoundError, yaml.YAMLError, OSError):
+    except (_ParseError, OSError):
         return {}
 
 
@@ -417,10 +758,12 @@ def save_packages(packages: dict[str, Any]) -> None:
     Args:
         packages: The packages dict (name -> metadata).
     """
+    from .locks import config_lock
+
     path = get_packages_path()
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w") as f:
-        yaml.dump({"packages": packages}, f, default_flow_style=False, sort_keys=False)
+    with config_lock():
+        _dump_yaml({"packages": packages}, path)
 
 
 def get_package_for_item(component_type: str, name: str) -> str | None:
@@ -433,12 +776,7 @@ def get_package_for_item(component_type: str, name: str) -> str | None:
     Returns:
         Package name, or None if not in any package.
     """
-    packages = load_packages()
-    for pkg_name, pkg_data in packages.items():
-        for item in pkg_data.get("items", []):
-            if item.get("type") == component_type and item.get("name") == name:
-                return pkg_name
-    return None
+    return get_package_index().owner(component_type, name)
 
 
 def list_package_items(package_name: str) -> list[tuple[str, str]]:
@@ -446,9 +784,7 @@ def list_package_items(package_name: str) -> list[tuple[str, str]]:
 
     Returns list of (type, name) tuples.
     """
-    packages = load_packages()
-    pkg = packages.get(package_name, {})
-    return [(item["type"], item["name"]) for item in pkg.get("items", [])]
+    return [(t, n) for t, n, _h in get_package_index().items.get(package_name, [])]
 
 
 def remove_package(package_name: str) -> bool:
@@ -456,11 +792,17 @@ def remove_package(package_name: str) -> bool:
 
     Returns True if removed, False if not found.
     """
-    packages = load_packages()
-    if package_name not in packages:
-        return False
-    del packages[package_name]
-    save_packages(packages)
+    from .locks import config_lock
+
+    with config_lock():
+        index = get_package_index()
+        packages = load_packages()
+        if package_name not in packages:
+            return False
+        del packages[package_name]
+        save_packages(packages)
+        index.drop(package_name)
+        _store_package_index(index)
     return True
 
 
@@ -505,7 +847,8 @@ def record_package(
         items: List of dicts with "type", "name", "hash" keys.
         path: Local filesystem path (for scanned packages).
     """
-    packages = load_packages()
+    from .locks import config_lock
+
     entry: dict[str, Any] = {
         "url": url,
         "installed": date.today().isoformat(),
@@ -514,8 +857,169 @@ def record_package(
     }
     if path:
         entry["path"] = path
-    packages[name] = entry
-    save_packages(packages)
+    with config_lock():
+        index = get_package_index()
+        packages = load_packages()
+        packages[name] = entry
+        save_packages(packages)
+        index.put(name, items)
+        _store_package_index(index)
+
+
+# ---------------------------------------------------------------------------
+# Package ownership index
+# ---------------------------------------------------------------------------
+#
+# cache/package-index.json holds an inverted view of packages.yaml, tagged
+# with the stat stamp of the packages.yaml it describes. record_package and
+# remove_package update it in place; any other change to packages.yaml
+# (hand edits, save_packages) shows up as a stamp mismatch and triggers
+# one rebuild.
+
+_PACKAGE_INDEX_VERSION = 1
+
+
+@dataclass
+class PackageIndex:
+    """Inverted view of packages.yaml.
+
+    ``items`` maps package -> [(type, name, hash)] in packages.yaml order;
+    ``owners`` maps (type, name) -> owning packages in that same order.
+    When several packages list the same item, :meth:`owner` returns the
+    first (``get_package_for_item``'s rule) and :meth:`last_owner` the
+    last (the rule of owner maps built by scanning the file). Treat as
+    read-only.
+    """
+
+    items: dict[str, list[tuple[str, str, str]]] = field(default_factory=dict)
+    owners: dict[tuple[str, str], list[str]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, packages: dict[str, Any]) -> "PackageIndex":
+        index = cls()
+        for pkg_name, pkg_data in packages.items():
+            raw = pkg_data.get("items", []) if isinstance(pkg_data, dict) else []
+            index.put(pkg_name, raw if isinstance(raw, list) else [])
+        return index
+
+    def owner(self, component_type: str, name: str) -> str | None:
+        """Return the package owning (type, name), or None."""
+        pkgs = self.owners.get((component_type, name))
+        return pkgs[0] if pkgs else None
+
+    def last_owner(self, component_type: str, name: str) -> str | None:
+        """Return the last package in packages.yaml listing (type, name), or None."""
+        pkgs = self.owners.get((component_type, name))
+        return pkgs[-1] if pkgs else None
+
+    def owned_by(self, component_type: str, name: str, package: str) -> bool:
+        """Whether *package* lists (type, name), whatever other owners it has."""
+        return package in self.owners.get((component_type, name), ())
+
+    def put(self, package: str, items: list[dict[str, str]]) -> None:
+        """Record (or replace) *package* with *items*."""
+        self.drop(package, keep_slot=True)
+        entries = []
+        for it in items:
+            if not isinstance(it, dict):
+                continue
+            t, n = it.get("type"), it.get("name")
+            if isinstance(t, str) and isinstance(n, str):
+                entries.append((t, n, str(it.get("hash", ""))))
+        self.items[package] = entries
+        rank = {pkg: i for i, pkg in enumerate(self.items)}
+        for t, n, _h in entries:
+            pkgs = self.owners.setdefault((t, n), [])
+            if package in pkgs:
+                continue
+            pos = len(pkgs)
+            while pos and rank.get(pkgs[pos - 1], 0) > rank[package]:
+                pos -= 1
+            pkgs.insert(pos, package)
+
+    def drop(self, package: str, *, keep_slot: bool = False) -> None:
+        """Forget *package* (keeping its position for a following ``put``)."""
+        for t, n, _h in self.items.get(package, []):
+            pkgs = self.owners.get((t, n))
+            if pkgs and package in pkgs:
+                pkgs.remove(package)
+                if not pkgs:
+                    del self.owners[(t, n)]
+        if keep_slot:
+            if package in self.items:
+                self.items[package] = []
+        else:
+            self.items.pop(package, None)
+
+
+# (packages.yaml path, stamp or None when missing, index) for the last use.
+_package_index_state: tuple[str, tuple[int, int, int] | None, PackageIndex] | None = None
+
+
+def get_package_index_path() -> Path:
+    """Get the persisted package ownership index path."""
+    return get_config_dir() / "cache" / "package-index.json"
+
+
+def _packages_stamp() -> tuple[int, int, int] | None:
+    try:
+        return _stat_key(os.stat(get_packages_path()))
+    except OSError:
+        return None
+
+
+def get_package_index() -> PackageIndex:
+    """Return the ownership index for the current packages.yaml."""
+    global _package_index_state
+    key = str(get_packages_path())
+    stamp = _packages_stamp()
+    state = _package_index_state
+    if state is not None and state[0] == key and state[1] == stamp:
+        return state[2]
+
+    index = _read_package_index(stamp)
+    if index is None:
+        index = PackageIndex.build(load_packages())
+        if stamp is not None:
+            _write_package_index(stamp, index)
+    _package_index_state = (key, stamp, index)
+    return index
+
+
+def _read_package_index(stamp: tuple[int, int, int] | None) -> PackageIndex | None:
+    if stamp is None:
+        return None
+    try:
+        raw = json.loads(get_package_index_path().read_bytes())
+        if raw.get("version") != _PACKAGE_INDEX_VERSION or tuple(raw["stamp"]) != stamp:
+            return None
+        index = PackageIndex()
+        for pkg_name, entries in raw["items"].items():
+            index.items[pkg_name] = [(t, n, h) for t, n, h in entries]
+        for t, n, pkgs in raw["owners"]:
+            index.owners[(t, n)] = list(pkgs)
+        return index
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return None
+
+
+def _write_package_index(stamp: tuple[int, int, int], index: PackageIndex) -> None:
+    payload = {
+        "version": _PACKAGE_INDEX_VERSION,
+        "stamp": list(stamp),
+        "items": {pkg: [list(e) for e in entries] for pkg, entries in index.items.items()},
+        "owners": [[t, n, pkgs] for (t, n), pkgs in index.owners.items()],
+    }
+    write_cache_json(get_package_index_path(), payload)
+
+
+def _store_package_index(index: PackageIndex) -> None:
+    """Tag an incrementally updated *index* with the new packages.yaml stamp."""
+    global _package_index_state
+    stamp = _packages_stamp()
+    _package_index_state = (str(get_packages_path()), stamp, index)
+    if stamp is not None:
+        _write_package_index(stamp, index)
 
 
 # ---------------------------------------------------------------------------
@@ -528,17 +1032,29 @@ def hash_registry_item(path: Path) -> str:
     For files: SHA-256 of file contents, truncated to 8 hex chars.
     For directories: SHA-256 of sorted (relative_path, file_hash) pairs.
 
+    Files of registry items kept in an object store (see ``object_store.py``)
+    take their hash from the blob name instead of being read.
+
     Returns 8-char hex string.
     """
+    from .object_store import ObjectStore, objects_dir_for
+
+    store = ObjectStore(objects_dir_for(path.parent.parent))
+    if not store.exists():
+        store = None
     if path.is_file():
-        return _hash_file(path)
+        return _hash_file(path, store)
     elif path.is_dir():
-        return _hash_dir(path)
+        return _hash_dir(path, store)
     return "00000000"
 
 
-def _hash_file(path: Path) -> str:
+def _hash_file(path: Path, store: Any = None) -> str:
     """SHA-256 of file contents, truncated to 8 hex chars."""
+    if store is not None:
+        digest = store.digest_of(path)
+        if digest:
+            return digest[:8]
     h = hashlib.sha256()
     try:
         h.update(path.read_bytes())
@@ -547,14 +1063,14 @@ def _hash_file(path: Path) -> str:
     return h.hexdigest()[:8]
 
 
-def _hash_dir(path: Path) -> str:
+def _hash_dir(path: Path, store: Any = None) -> str:
     """SHA-256 of sorted (relative_path, file_hash) pairs."""
     h = hashlib.sha256()
     entries: list[tuple[str, str]] = []
     for child in sorted(path.rglob("*")):
         if child.is_file() and not child.name.startswith("."):
             rel = str(child.relative_to(path))
-            file_hash = _hash_file(child)
+            file_hash = _hash_file(child, store)
             entries.append((rel, file_hash))
     for rel, fh in entries:
         h.update(f"{rel}:{fh}\n".encode())
@@ -6,9 +6,9 @@ import shutil
 from dataclasses import dataclass, field
 from typing import Callable
 
-from . import config
+from . import config, registry_index
 from .downloader import ClassifiedContent, add_items_to_registry, check_clashes, classify, get_head_commit, scan_directory, shallow_clone
-from .registry import Registry
+from .registry import Registry, package_namespace, qualified_name, split_name
 
 
 LogFn = Callable[[str], None]
@@ -124,21 +124,45 @@ def _noop(_msg: str) -> None:
 
 
 def _clash_prefix(name: str | None, content, url: str) -> str:
-    """Derive a short prefix for renaming clashing items."""
+    """Derive the namespace for clashing items from the package name."""
     pkg_name = (
         name
         or (content.package_meta.name if content.package_meta else None)
         or config.package_name_from_url(url)
     )
-    if not pkg_name:
-        return ""
-    # Use last segment: "obra/superpowers" -> "superpowers"
-    return pkg_name.split("/")[-1] if "/" in pkg_name else pkg_name
+    return package_namespace(pkg_name or "")
 
 
-def _prefixed_name(prefix: str, original: str) -> str:
-    """Add a package prefix to a filename: 'code-reviewer.md' -> 'superpowers-code-reviewer.md'."""
-    return f"{prefix}-{original}"
+def namespace_clashes(
+    clashes,
+    registry: Registry,
+    package_name: str = "",
+    log: Callable[[str], None] = _noop,
+    *,
+    per_item: bool = True,
+) -> int:
+    """Move clashing items into their package's namespace ("pkg--name").
+
+    The namespace comes from ``item.package`` (when *per_item*) or
+    *package_name*. Items without a package, already in it, or still
+    clashing once namespaced keep their name.
+
+    Returns:
+        Number of items renamed.
+    """
+    renamed = 0
+    for item in clashes:
+        namespace = package_namespace((per_item and item.package) or package_name)
+        if not namespace or split_name(item.name, {namespace})[0] is not None:
+            continue
+        new_name = qualified_name(namespace, item.name)
+        if registry.detect_clash(item.component_type, new_name):
+            log(f"  Skipping {item.name} (clash even after namespacing)")
+            continue
+        log(f"  Renamed {item.name} -> {new_name} (clash with existing)")
+        item.name = new_name
+        renamed += 1
+    return renamed
 
 
 def _build_pkg_items(items, registry, package_name: str = "", added_keys: set[str] | None = None):
@@ -149,19 +173,7 @@ def _build_pkg_items(items, registry, package_name: str = "", added_keys: set[st
     """
     added_keys = added_keys or set()
 
-    owner_map: dict[tuple[str, str], str] = {}
-    packages = config.load_packages()
-    for pkg_name, pkg_data in packages.items():
-        pkg_items = pkg_data.get("items", []) if isinstance(pkg_data, dict) else []
-        if not isinstance(pkg_items, list):
-            continue
-        for it in pkg_items:
-            if not isinstance(it, dict):
-                continue
-            t = it.get("type")
-            n = it.get("name")
-            if isinstance(t, str) and isinstance(n, str):
-                owner_map[(t, n)] = pkg_name
+    package_index = config.get_package_index()
 
     pkg_items = []
     for item in items:
@@ -171,9 +183,11 @@ def _build_pkg_items(items, registry, package_name: str = "", added_keys: set[st
 
         item_key_str = f"{item.component_type}/{item.name}"
         if item_key_str not in added_keys:
-            key = (item.component_type.value, item.name)
-            owner = owner_map.get((item.component_type.value, item.name))
-            if owner and owner != package_name:
+            item_type = item.component_type.value
+            owner = package_index.owner(item_type, item.name)
+            # Keep items this package already lists, even if another
+            # package lists them too.
+            if owner and not package_index.owned_by(item_type, item.name, package_name):
                 continue
 
             # For unowned clashes not added this run, only claim when scanned
@@ -183,11 +197,11 @@ def _build_pkg_items(items, registry, package_name: str = "", added_keys: set[st
                 if source_path is None or not source_path.exists():
                     continue
                 source_hash = config.hash_registry_item(source_path)
-                registry_hash = config.hash_registry_item(item_path)
+                registry_hash = registry_index.content_hash(item_path)
                 if source_hash != registry_hash:
                     continue
 
-        item_hash = config.hash_registry_item(item_path)
+        item_hash = registry_index.content_hash(item_path)
         pkg_items.append(
             {
                 "type": item.component_type.value,
@@ -424,20 +438,13 @@ def download_and_install(
                 logf("\nNo components selected.")
                 return DownloadResult(success=True)
 
-        # Resolve clashes: rename clashing items with package prefix
+        # Resolve clashes: move clashing items into the package namespace
         clashes = check_clashes(selected_items, registry)
         clash_names = [f"{item.component_type.value}/{item.name}" for item in clashes]
         if clashes and not replace:
             pkg_prefix = _clash_prefix(name, content, url)
             if pkg_prefix:
-                for item in clashes:
-                    old_name = item.name
-                    new_name = _prefixed_name(pkg_prefix, old_name)
-                    if not registry.detect_clash(item.component_type, new_name):
-                        item.name = new_name
-                        logf(f"  Renamed {old_name} -> {new_name} (clash with existing)")
-                    else:
-                        logf(f"  Skipping {old_name} (clash even after rename)")
+                namespace_clashes(clashes, registry, pkg_prefix, logf, per_item=False)
             else:
                 # No package context for renaming — skip clashing items
                 logf("\nClashes with existing registry entries:")
@@ -0,0 +1,651 @@
+"""Atomic, write-if-changed file helpers shared by adapters and config writers.
+
+Every sync rewrites tool config files (settings.json, .mcp.json,
+config.toml, sidecars, runners). Writing identical bytes still bumps the
+file mtime, which wakes up the tools' own file watchers, and a plain
+``write_text`` can leave a truncated file behind if interrupted. The
+helpers here skip identical writes and otherwise replace the file via a
+temp file + rename in the same directory.
+
+Inside a ``journal()`` block every mutation made through this module
+(writes, symlinks, removals, directory creation) is recorded as a
+serializable :class:`FileOp` and the previous state is kept so the block
+can be rolled back. With ``journal(simulate=True)`` nothing touches disk:
+mutations land in an in-memory overlay that the read helpers here
+(``read_text``, ``exists``, ``list_dir`` ...) honor, which makes a
+simulated sync produce the exact ops a real one would.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import os
+import shutil
+import stat
+import tempfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Literal
+
+# Directories written into inside an active ``batched_fsync()`` block (None = inactive).
+_pending_fsync: contextvars.ContextVar[list[Path] | None] = contextvars.ContextVar(
+    "hawk_pending_fsync", default=None
+)
+
+
+# Journal collecting ops for the current sync (None = no journaling).
+_active_journal: contextvars.ContextVar["FileJournal | None"] = contextvars.ContextVar(
+    "hawk_active_journal", default=None
+)
+
+
+@dataclass
+class FileOp:
+    """One filesystem mutation made (or planned) through this module."""
+
+    action: Literal["write", "symlink", "remove", "mkdir", "rmtree"]
+    path: str
+    target: str | None = None
+    size: int | None = None
+    mode: int | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize, omitting unset fields."""
+        return {k: v for k, v in asdict(self).items() if v is not None}
+
+
+@dataclass
+class _Entry:
+    """Simulated state of one path in a journal overlay."""
+
+    kind: Literal["file", "link", "dir", "missing"]
+    data: bytes | None = None
+    target: str | None = None
+    mode: int | None = None
+
+
+@dataclass
+class FileJournal:
+    """Ops recorded inside a ``journal()`` block, plus how to undo them."""
+
+    simulate: bool = False
+    ops: list[FileOp] = field(default_factory=list)
+    _overlay: dict[Path, _Entry] = field(default_factory=dict)
+    _undo: list[tuple] = field(default_factory=list)
+    _trash: list[Path] = field(default_factory=list)
+    _holders: dict[Path, Path] = field(default_factory=dict)
+    # File listing the rollback holders created, so ones left behind by a
+    # killed process can be removed later (see remove_stale_holders).
+    holders_log: Path | None = None
+
+    def to_list(self) -> list[dict[str, Any]]:
+        """Serialize recorded ops in order."""
+        return [op.to_dict() for op in self.ops]
+
+    def _lookup(self, path: Path) -> _Entry | None:
+        return self._overlay.get(_key(path))
+
+    def _remember(self, path: Path) -> None:
+        """Save the pre-op state of *path* so ``rollback`` can restore it."""
+        if self.simulate:
+            return
+        if path.is_symlink():
+            self._undo.append(("link", path, os.readlink(path)))
+        elif path.is_file():
+            self._undo.append(("file", path, self._park(path)))
+        elif not path.exists():
+            self._undo.append(("absent", path))
+
+    def _park(self, path: Path) -> Path:
+        """Keep the current file at *path* aside without reading it.
+
+        The file is hardlinked (copied if that fails) into a holder
+        directory next to it; writes replace *path* by rename, so the
+        parked inode keeps the old content and mode.
+        """
+        holder = self._holders.get(path.parent)
+        if holder is None:
+            holder = self._new_holder(path.parent, ".hawk-journal.")
+            self._holders[path.parent] = holder
+        parked = holder / f"{len(self._undo)}-{path.name}"
+        try:
+            os.link(path, parked)
+        except OSError:
+            shutil.copy2(path, parked)
+        return parked
+
+    def _new_holder(self, directory: Path, prefix: str) -> Path:
+        """Create a hidden ``*.rollback`` directory in *directory* for parked paths."""
+        holder = Path(tempfile.mkdtemp(dir=directory, prefix=prefix, suffix=".rollback"))
+        self._trash.append(holder)
+        if self.holders_log is not None:
+            self.holders_log.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.holders_log, "a", encoding="utf-8") as f:
+                f.write(f"{holder}\n")
+        return holder
+
+    def rollback(self) -> None:
+        """Restore every path touched in this journal to its prior state."""
+        while self._undo:
+            entry = self._undo.pop()
+            kind, path = entry[0], entry[1]
+            with contextlib.suppress(OSError):
+                if kind == "dir":
+                    path.rmdir()
+                    continue
+                if kind == "tree":
+                    if path.exists() or path.is_symlink():
+                        shutil.rmtree(path)
+                    os.replace(entry[2], path)
+                    continue
+                if kind == "file":
+                    os.replace(entry[2], path)
+                    continue
+                if path.is_symlink() or path.is_file():
+                    path.unlink()
+                if kind == "link":
+                    path.symlink_to(entry[2])
+        self._discard_trash()
+        self.ops.clear()
+        self._overlay.clear()
+
+    def commit(self) -> None:
+        """Drop undo state once the journaled work has succeeded."""
+        self._undo.clear()
+        self._discard_trash()
+
+    def _discard_trash(self) -> None:
+        for holder in self._trash:
+            shutil.rmtree(holder, ignore_errors=True)
+        if self._trash and self.holders_log is not None:
+            self.holders_log.unlink(missing_ok=True)
+        self._trash.clear()
+        self._holders.clear()
+
+
+def remove_stale_holders(holders_log: Path) -> int:
+    """Remove the rollback holders listed in *holders_log* and the log itself.
+
+    A journal deletes its holders when it commits or rolls back; a process
+    killed in between leaves them (and its log) behind. Only call this
+    while no journal writing to the same log can be running.
+
+    Returns:
+        Number of holders removed.
+    """
+    try:
+        lines = holders_log.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return 0
+    removed = 0
+    for line in lines:
+        holder = Path(line)
+        if not (holder.name.startswith(".") and holder.name.endswith(".rollback")):
+            continue
+        if holder.is_dir() and not holder.is_symlink():
+            shutil.rmtree(holder, ignore_errors=True)
+            removed += 1
+    holders_log.unlink(missing_ok=True)
+    return removed
+
+
+@contextlib.contextmanager
+def journal(*, simulate: bool = False, holders_log: Path | None = None) -> Iterator[FileJournal]:
+    """Record filesystem ops made through this module in this block.
+
+    Args:
+        simulate: If True, don't touch disk; apply ops to an in-memory
+            overlay instead so the recorded ops form an exact plan.
+        holders_log: File to list rollback holders in while the block
+            runs, for :func:`remove_stale_holders`.
+
+    The block rolls back automatically if it raises. Callers can also
+    call ``rollback()`` on the yielded journal before leaving the block.
+    """
+    recorder = FileJournal(simulate=simulate, holders_log=None if simulate else holders_log)
+    token = _active_journal.set(recorder)
+    try:
+        yield recorder
+    except BaseException:
+        _active_journal.reset(token)
+        recorder.rollback()
+        raise
+    _active_journal.reset(token)
+    recorder.commit()
+
+
+def _key(path: Path) -> Path:
+    return Path(os.path.abspath(path))
+
+
+def _read_umask() -> int:
+    """Return the process umask.
+
+    Reads ``/proc/self/status`` where available; elsewhere the umask is
+    set and restored, which is only safe before any threads start, so
+    this runs once at import.
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+_UMASK = _read_umask()
+
+
+def _write_target(path: Path) -> Path:
+    """Return the real file to replace, following a symlinked config file.
+
+    Users commonly symlink tool configs from a dotfiles repo; replacing the
+    link itself with a regular file would silently detach it.
+    """
+    if path.is_symlink():
+        return path.resolve()
+    return path
+
+
+def write_bytes_if_changed(path: Path, data: bytes, *, mode: int | None = None) -> bool:
+    """Atomically write *data* to *path* unless it already has those bytes.
+
+    Args:
+        path: Destination file.
+        data: Desired file contents.
+        mode: Optional permission bits to enforce (e.g. ``0o700`` for runners).
+            When omitted, an existing file keeps its permissions and a new
+            file gets the default ``0o666 & ~umask``.
+
+    Returns:
+        True if the file was written, False if it was already up to date.
+    """
+    target = _write_target(path)
+    recorder = _active_journal.get()
+    entry = recorder._lookup(target) if recorder is not None else None
+    if entry is not None and entry.kind == "file":
+        if entry.data == data and (mode is None or entry.mode == mode):
+            return False
+        st = None
+        if mode is None:
+            mode = entry.mode
+    else:
+        try:
+            st = None if entry is not None else target.stat()
+        except OSError:
+            st = None
+
+        if st is not None and stat.S_ISREG(st.st_mode) and st.st_size == len(data):
+            mode_ok = mode is None or stat.S_IMODE(st.st_mode) == mode
+            if mode_ok:
+                try:
+                    if target.read_bytes() == data:
+                        return False
+                except OSError:
+                    pass
+
+    if mode is None:
+        if st is not None and stat.S_ISREG(st.st_mode):
+            mode = stat.S_IMODE(st.st_mode)
+        else:
+            mode = 0o666 & ~_UMASK
+
+    if recorder is not None:
+        make_dirs(target.parent)
+        recorder.ops.append(FileOp("write", str(target), size=len(data), mode=mode))
+        if recorder.simulate:
+            recorder._overlay[_key(target)] = _Entry("file", data=data, mode=mode)
+            return True
+        recorder._remember(target)
+
+    _raw_write(target, data, mode)
+
+    pending = _pending_fsync.get()
+    if pending is not None:
+        pending.append(target.parent)
+    return True
+
+
+def _raw_write(target: Path, data: bytes, mode: int) -> None:
+    """Replace *target* with *data* via a temp file + rename.
+
+    The temp file is fsynced before the rename so a crash can never leave
+    a renamed but empty file; the directory entry is flushed by
+    :func:`batched_fsync`.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            os.fchmod(f.fileno(), mode)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, target)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+
+
+def write_text_if_changed(path: Path, content: str, *, mode: int | None = None) -> bool:
+    """Text variant of :func:`write_bytes_if_changed` (UTF-8)."""
+    return write_bytes_if_changed(path, content.encode("utf-8"), mode=mode)
+
+
+# ── Journal-aware mutations ──
+
+
+def remove_file(path: Path) -> bool:
+    """Remove a file or symlink (never a real directory).
+
+    Returns:
+        True if something was removed.
+    """
+    if not lexists(path) or (is_dir(path) and not is_symlink(path)):
+        return False
+    recorder = _active_journal.get()
+    if recorder is not None:
+        recorder.ops.append(FileOp("remove", str(path)))
+        if recorder.simulate:
+            recorder._overlay[_key(path)] = _Entry("missing")
+            return True
+        recorder._remember(path)
+    path.unlink()
+    return True
+
+
+def make_symlink(source: Path, dest: Path) -> None:
+    """Point *dest* at *source*, replacing an existing file or link.
+
+    Raises:
+        ValueError: If *dest* is a real directory.
+    """
+    if lexists(dest):
+        if is_dir(dest) and not is_symlink(dest):
+            raise ValueError(f"Destination is a directory: {dest}")
+    make_dirs(dest.parent)
+    recorder = _active_journal.get()
+    if recorder is not None:
+        recorder.ops.append(FileOp("symlink", str(dest), target=str(source)))
+        if recorder.simulate:
+            recorder._overlay[_key(dest)] = _Entry("link", target=str(source))
+            return
+        recorder._remember(dest)
+    if dest.is_symlink() or dest.exists():
+        dest.unlink()
+    dest.symlink_to(source)
+
+
+def make_dirs(path: Path) -> None:
+    """Create *path* and missing parents (no-op if it exists)."""
+    recorder = _active_journal.get()
+    if recorder is None:
+        path.mkdir(parents=True, exist_ok=True)
+        return
+    if is_dir(path):
+        return
+    missing: list[Path] = []
+    current = path
+    while not is_dir(current) and current != current.parent:
+        missing.append(current)
+        current = current.parent
+    for directory in reversed(missing):
+        recorder.ops.append(FileOp("mkdir", str(directory)))
+        if recorder.simulate:
+            recorder._overlay[_key(directory)] = _Entry("dir")
+        else:
+            directory.mkdir()
+            recorder._undo.append(("dir", directory))
+
+
+def remove_tree(path: Path) -> bool:
+    """Remove a directory tree. Returns True if it existed."""
+    if not is_dir(path) or is_symlink(path):
+        return False
+    recorder = _active_journal.get()
+    if recorder is None:
+        shutil.rmtree(path, ignore_errors=True)
+        return True
+    recorder.ops.append(FileOp("rmtree", str(path)))
+    if recorder.simulate:
+        for key in [k for k in recorder._overlay if k.is_relative_to(_key(path))]:
+            del recorder._overlay[key]
+        recorder._overlay[_key(path)] = _Entry("missing")
+        return True
+    # Park the tree next to its original location so rollback is a rename.
+    holder = recorder._new_holder(path.parent, f".{path.name}.")
+    parked = holder / path.name
+    os.replace(path, parked)
+    recorder._undo.append(("tree", path, parked))
+    return True
+
+
+# ── Journal-aware reads ──
+
+
+def _overlay_entry(path: Path) -> _Entry | None:
+    recorder = _active_journal.get()
+    if recorder is None or not recorder.simulate:
+        return None
+    entry = recorder._lookup(path)
+    if entry is not None:
+        return entry
+    # A simulated rmtree hides everything below it.
+    for parent in _key(path).parents:
+        parent_entry = recorder._overlay.get(parent)
+        if parent_entry is not None and parent_entry.kind == "missing":
+            return parent_entry
+    return None
+
+
+def lexists(path: Path) -> bool:
+    """Like ``os.path.lexists`` (true for dangling symlinks)."""
+    entry = _overlay_entry(path)
+    if entry is not None:
+        return entry.kind != "missing"
+    return path.exists() or path.is_symlink()
+
+
+def exists(path: Path) -> bool:
+    """Like ``Path.exists``, including simulated ops."""
+    entry = _overlay_entry(path)
+    if entry is not None:
+        if entry.kind == "link":
+            return exists(Path(entry.target or ""))
+        return entry.kind != "missing"
+    return path.exists()
+
+
+def is_dir(path: Path) -> bool:
+    """Like ``Path.is_dir``, including simulated ops."""
+    entry = _overlay_entry(path)
+    if entry is not None:
+        if entry.kind == "link":
+            return is_dir(Path(entry.target or ""))
+        return entry.kind == "dir"
+    return path.is_dir()
+
+
+def is_symlink(path: Path) -> bool:
+    """Like ``Path.is_symlink``, including simulated ops."""
+    entry = _overlay_entry(path)
+    if entry is not None:
+        return entry.kind == "link"
+    return path.is_symlink()
+
+
+def read_bytes(path: Path) -> bytes:
+    """Like ``Path.read_bytes``, including simulated ops."""
+    entry = _overlay_entry(path)
+    if entry is None and path.is_symlink():
+        # Writes through a symlinked config are recorded against its target.
+        entry = _overlay_entry(path.resolve())
+    if entry is not None:
+        if entry.kind == "file" and entry.data is not None:
+            return entry.data
+        if entry.kind == "link":
+            return read_bytes(Path(entry.target or ""))
+        raise FileNotFoundError(str(path))
+    return path.read_bytes()
+
+
+def read_text(path: Path, errors: str = "strict") -> str:
+    """Like ``Path.read_text`` (UTF-8, universal newlines), including simulated ops."""
+    text = read_bytes(path).decode("utf-8", errors=errors)
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def list_dir(path: Path) -> list[Path]:
+    """Like ``list(Path.iterdir())`` but empty for a missing directory.
+
+    Includes simulated creations and hides simulated removals.
+    """
+    entries: dict[str, Path] = {}
+    entry = _overlay_entry(path)
+    if entry is None or entry.kind == "dir":
+        if path.is_dir():
+            entries = {child.name: child for child in path.iterdir()}
+    recorder = _active_journal.get()
+    if recorder is not None and recorder.simulate:
+        base = _key(path)
+        for key, child_entry in recorder._overlay.items():
+            if key.parent != base:
+                continue
+            if child_entry.kind == "missing":
+                entries.pop(key.name, None)
+            else:
+                entries.setdefault(key.name, path / key.name)
+    return list(entries.values())
+
+
+def link_roots(*paths: Path) -> tuple[str, ...]:
+    """Normalized prefixes for matching symlink targets under *paths*.
+
+    Each path contributes its literal and fully resolved forms, so
+    :func:`links_into` can classify links without resolving them.
+    """
+    roots: list[str] = []
+    for path in paths:
+        for form in (os.path.abspath(path), os.path.realpath(path)):
+            if form not in roots:
+                roots.append(form)
+    return tuple(roots)
+
+
+def _is_under(target: str, roots: tuple[str, ...]) -> bool:
+    for root in roots:
+        if target == root or target.startswith(root.rstrip(os.sep) + os.sep):
+            return True
+    return False
+
+
+def links_into(directory: Path, roots: tuple[str, ...]) -> list[str]:
+    """Names of symlinks in *directory* whose target lies under *roots*.
+
+    One ``os.scandir`` pass plus a ``readlink`` prefix check per link;
+    targets are never resolved, which keeps large or network-mounted
+    tool dirs cheap. Dangling links count. Includes simulated ops.
+
+    Args:
+        directory: Directory to scan (missing is treated as empty).
+        roots: Prefixes from :func:`link_roots`.
+    """
+    targets: dict[str, str] = {}
+    entry = _overlay_entry(directory)
+    if entry is None or entry.kind == "dir":
+        try:
+            with os.scandir(directory) as it:
+                for dirent in it:
+                    if not dirent.is_symlink():
+                        continue
+                    try:
+                        targets[dirent.name] = os.readlink(dirent.path)
+                    except OSError:
+                        continue
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+    recorder = _active_journal.get()
+    if recorder is not None and recorder.simulate:
+        base_key = _key(directory)
+        for key, child in recorder._overlay.items():
+            if key.parent != base_key:
+                continue
+            if child.kind == "link":
+                targets[key.name] = child.target or ""
+            else:
+                targets.pop(key.name, None)
+    if not targets:
+        return []
+
+    # Relative targets are relative to the real directory holding the link.
+    base = os.path.realpath(directory)
+    return [
+        name
+        for name, raw in targets.items()
+        if _is_under(os.path.normpath(os.path.join(base, raw)), roots)
+    ]
+
+
+def points_into(path: Path, roots: tuple[str, ...]) -> bool:
+    """Whether symlink *path* targets something under *roots*.
+
+    Follows link chains on disk; includes simulated ops. False for
+    anything that is not a symlink.
+    """
+    entry = _overlay_entry(path)
+    if entry is not None:
+        if entry.kind != "link":
+            return False
+        raw = entry.target or ""
+    else:
+        try:
+            raw = os.readlink(path)
+        except OSError:
+            return False
+    target = os.path.normpath(os.path.join(os.path.realpath(path.parent), raw))
+    return _is_under(target, roots) or _is_under(os.path.realpath(target), roots)
+
+
+def _fsync_path(path: Path, *, directory: bool = False) -> None:
+    flags = os.O_RDONLY
+    if directory:
+        flags |= getattr(os, "O_DIRECTORY", 0)
+    try:
+        fd = os.open(path, flags)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def batched_fsync() -> Iterator[None]:
+    """Defer directory flushes for writes in this block to a single pass.
+
+    File data is always fsynced before its rename; the directories that
+    files were written into inside the block are fsynced once on exit, so
+    the renames are durable without paying a directory fsync per write.
+    Nested blocks join the outermost one.
+    """
+    if _pending_fsync.get() is not None:
+        yield
+        return
+
+    pending: list[Path] = []
+    token = _pending_fsync.set(pending)
+    try:
+        yield
+    finally:
+        _pending_fsync.reset(token)
+        for directory in dict.fromkeys(pending):
+            _fsync_path(directory, directory=True)
@@ -0,0 +1,250 @@
+"""Generational registry snapshots.
+
+Once enabled (``hawk rollback --enable``) the registry path is a symlink
+to one of several numbered generations kept beside it::
+
+    <config_dir>/registry -> .registry.generations/3
+    <config_dir>/.registry.generations/1/   skills/ hooks/ ...
+    <config_dir>/.registry.generations/2/
+    <config_dir>/.registry.generations/3/   (active)
+
+Before ``hawk update`` changes anything, :func:`snapshot` clones the
+active generation into a new one and switches the symlink to it. Files
+are copied (as reflinks where the filesystem supports them), so an
+in-place edit of the active registry (``hawk new --force``, an editor)
+cannot reach older generations. Read-only files, i.e. object store blobs
+and the item links to them, are shared by hardlink. :func:`rollback`
+just swaps the symlink back, atomically. Tool symlinks point through the
+stable registry path and need no re-linking.
+
+Each generation also keeps the package index (``packages.yaml``) that
+matches its content, so a rollback restores package commits and hashes
+as well.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import stat
+import sys
+from pathlib import Path
+
+from . import config
+from .object_store import ObjectStore, objects_dir_for
+
+KEEP_GENERATIONS = 5
+
+_PACKAGES_FILE = ".hawk-packages.yaml"
+
+# ioctl request cloning one file's extents into another (Linux reflink).
+_FICLONE = 0x40049409
+
+
+class GenerationError(RuntimeError):
+    """Raised for invalid generation operations."""
+
+
+def generations_dir(registry_path: Path) -> Path:
+    """Get the directory holding a registry's generations."""
+    return registry_path.with_name(f".{registry_path.name}.generations")
+
+
+def active_generation(registry_path: Path) -> int | None:
+    """Number of the generation the registry points at, or None if not enabled."""
+    if not registry_path.is_symlink():
+        return None
+    target = Path(os.readlink(registry_path))
+    if target.parent.name != generations_dir(registry_path).name or not target.name.isdigit():
+        return None
+    return int(target.name)
+
+
+def is_enabled(registry_path: Path) -> bool:
+    return active_generation(registry_path) is not None
+
+
+def list_generations(registry_path: Path) -> list[int]:
+    """Existing generation numbers, oldest first."""
+    root = generations_dir(registry_path)
+    if not root.is_dir():
+        return []
+    return sorted(int(p.name) for p in root.iterdir() if p.name.isdigit() and p.is_dir())
+
+
+def _point_at(registry_path: Path, number: int) -> None:
+    """Atomically point the registry symlink at generation *number*."""
+    target = Path(generations_dir(registry_path).name) / str(number)
+    tmp = registry_path.with_name(f".{registry_path.name}.{os.getpid()}.link")
+    tmp.unlink(missing_ok=True)
+    os.symlink(target, tmp)
+    os.replace(tmp, registry_path)
+
+
+def enable(registry_path: Path) -> int:
+    """Move the registry into generation 1 and point the registry path at it."""
+    current = active_generation(registry_path)
+    if current is not None:
+        return current
+    if registry_path.is_symlink():
+        raise GenerationError(f"{registry_path} is a symlink not managed by hawk")
+    first = generations_dir(registry_path) / "1"
+    first.parent.mkdir(parents=True, exist_ok=True)
+    if registry_path.exists():
+        os.rename(registry_path, first)
+    else:
+        first.mkdir()
+    _point_at(registry_path, 1)
+    return 1
+
+
+def _copy_file(src: Path, dest: Path) -> None:
+    """Copy *src* to *dest*, as a reflink where the filesystem supports it."""
+    if sys.platform.startswith("linux"):
+        import fcntl
+
+        try:
+            with open(src, "rb") as s, open(dest, "wb") as d:
+                fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+            shutil.copystat(src, dest)
+            return
+        except OSError:
+            dest.unlink(missing_ok=True)
+    shutil.copy2(src, dest)
+
+
+def _clone_tree(src: Path, dest: Path) -> None:
+    """Recreate *src* at *dest*: read-only files hardlinked, the rest copied."""
+    dest.mkdir()
+    for dirpath, dirnames, filenames in os.walk(src):
+        rel = Path(dirpath).relative_to(src)
+        for d in list(dirnames):
+            s = Path(dirpath) / d
+            if s.is_symlink():
+                os.symlink(os.readlink(s), dest / rel / d)
+                dirnames.remove(d)
+            else:
+                (dest / rel / d).mkdir()
+        for f in filenames:
+            s = Path(dirpath) / f
+            if rel == Path(".") and f == _PACKAGES_FILE:
+                continue
+            if s.is_symlink():
+                os.symlink(os.readlink(s), dest / rel / f)
+                continue
+            if not os.stat(s).st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH):
+                try:
+                    os.link(s, dest / rel / f)
+                    continue
+                except OSError:
+                    pass
+            _copy_file(s, dest / rel / f)
+
+
+def _save_packages_into(gen_dir: Path) -> None:
+    src = config.get_packages_path()
+    dest = gen_dir / _PACKAGES_FILE
+    if src.exists():
+        shutil.copyfile(src, dest)
+    else:
+        dest.unlink(missing_ok=True)
+
+
+def _restore_packages_from(gen_dir: Path) -> None:
+    src = gen_dir / _PACKAGES_FILE
+    if not src.exists():
+        return
+    dest = config.get_packages_path()
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dest)
+
+
+def snapshot(registry_path: Path, *, keep: int = KEEP_GENERATIONS) -> int:
+    """Start a new generation cloned from the active one and switch to it.
+
+    Generations beyond the newest *keep* are deleted.
+
+    Returns:
+        The new generation number.
+    """
+    current = active_generation(registry_path)
+    if current is None:
+        raise GenerationError("registry generations are not enabled")
+    root = generations_dir(registry_path)
+    number = max(list_generations(registry_path), default=current) + 1
+    _save_packages_into(root / str(current))
+    _clone_tree(root / str(current), root / str(number))
+    _point_at(registry_path, number)
+    prune(registry_path, keep=keep)
+    return number
+
+
+def activate(registry_path: Path, number: int) -> None:
+    """Switch the registry to generation *number*, restoring its package index."""
+    current = active_generation(registry_path)
+    if current is None:
+        raise GenerationError("registry generations are not enabled")
+    root = generations_dir(registry_path)
+    if not (root / str(number)).is_dir():
+        raise GenerationError(f"no such generation: {number}")
+    if number == current:
+        return
+    _save_packages_into(root / str(current))
+    _point_at(registry_path, number)
+    _restore_packages_from(root / str(number))
+
+
+def rollback(registry_path: Path, to: int | None = None) -> int:
+    """Switch to generation *to*, or the newest one older than the active one.
+
+    Returns:
+        The generation now active.
+    """
+    current = active_generation(registry_path)
+    if current is None:
+        raise GenerationError("registry generations are not enabled")
+    if to is None:
+        older = [n for n in list_generations(registry_path) if n < current]
+        if not older:
+            raise GenerationError("no older generation to roll back to")
+        to = older[-1]
+    activate(registry_path, to)
+    return to
+
+
+def discard(
+    registry_path: Path,
+    number: int,
+    previous: int,
+    *,
+    restore_packages: bool = False,
+) -> None:
+    """Drop generation *number* (e.g. an update that changed nothing), re-activating *previous*.
+
+    With *restore_packages* (e.g. after a failed update), the package index
+    saved with *previous* is restored too.
+    """
+    if active_generation(registry_path) == number:
+        _point_at(registry_path, previous)
+    if restore_packages:
+        _restore_packages_from(generations_dir(registry_path) / str(previous))
+    shutil.rmtree(generations_dir(registry_path) / str(number), ignore_errors=True)
+
+
+def prune(registry_path: Path, *, keep: int = KEEP_GENERATIONS) -> list[int]:
+    """Delete all but the newest *keep* generations (never the active one).
+
+    Object store blobs that only a deleted generation still used are
+    collected from the remaining ones.
+    """
+    active = active_generation(registry_path)
+    numbers = list_generations(registry_path)
+    doomed = [n for n in numbers[: max(0, len(numbers) - keep)] if n != active]
+    gens = generations_dir(registry_path)
+    for n in doomed:
+        shutil.rmtree(gens / str(n), ignore_errors=True)
+    if doomed:
+        for n in list_generations(registry_path):
+            ObjectStore(objects_dir_for(gens / str(n))).collect_garbage()
+    return doomed
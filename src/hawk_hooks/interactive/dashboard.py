@@ -30,6 +30,7 @@ from .theme import (
     warning_style,
 )
 from .toggle import (
+    _detach_for_edit,
     _open_in_editor,
     build_picker_tree,
     run_picker,
@@ -200,6 +201,7 @@ def _run_editor_command(path: Path) -> bool:
         if not cmd:
             _open_in_editor(path)
             return True
+        _detach_for_edit(path)
         subprocess.run(cmd + [str(path)], check=False)
         return True
     except (OSError, ValueError):
@@ -903,18 +905,12 @@ def _handle_scan(state: dict) -> bool:
     clashes = check_clashes(selected_items, registry)
     replace = False
     if clashes:
-        # Auto-rename clashing items with per-item package prefix
-        from ..download_service import _prefixed_name
-        renamed = 0
-        for item in clashes:
-            item_pkg = item.package or pkg
-            item_prefix = item_pkg.split("/")[-1] if "/" in item_pkg else item_pkg if item_pkg else ""
-            if item_prefix:
-                new_name = _prefixed_name(item_prefix, item.name)
-                if not registry.detect_clash(item.component_type, new_name):
-                    console.print(f"  [dim]Renamed {item.name} -> {new_name} (clash)[/dim]")
-                    item.name = new_name
-                    renamed += 1
+        # Move clashing items into their (per-item) package namespace
+        from ..download_service import namespace_clashes
+        namespace_clashes(
+            clashes, registry, pkg,
+            lambda msg: console.print(f"[dim]{msg.strip()}[/dim]"),
+        )
 
         # Re-check remaining clashes after renames
         still_clashing = [i for i in selected_items if registry.detect_clash(i.component_type, i.name)]
@@ -68,7 +68,6 @@ def handle_packages(state: dict) -> bool:
     ordered_types: list[tuple[str, str, ComponentType]] = list(_ORDERED_COMPONENT_FIELDS)
     fields = [f for f, _, _ in ordered_types]
     field_to_ct = {f: ct for f, _, ct in ordered_types}
-    ct_to_field = {ct.value: f for f, _, ct in ordered_types}
 
     collapsed_packages: dict[str, bool] = {}
     collapsed_types: dict[tuple[str, str], bool] = {}
@@ -186,21 +185,12 @@ def handle_packages(state: dict) -> bool:
             for pkg_name in sorted(packages.keys())
         }
 
-        ownership: dict[tuple[str, str], str] = {}
-        for pkg_name, pkg_data in packages.items():
-            for item in pkg_data.get("items", []):
-                comp_type = item.get("type")
-                item_name = item.get("name")
-                if not isinstance(comp_type, str) or not isinstance(item_name, str):
-                    continue
-                field = ct_to_field.get(comp_type)
-                if field:
-                    ownership[(field, item_name)] = pkg_name
+        package_index = config.get_package_index()
 
         ungrouped_has_items = False
         for field, _, ct in ordered_types:
             for name in sorted(state["contents"].get(ct, [])):
-                pkg_name = ownership.get((field, name), UNGROUPED)
+                pkg_name = package_index.last_owner(ct.value, name) or UNGROUPED
                 if pkg_name not in package_tree:
                     package_tree[pkg_name] = {f: [] for f in fields}
                 package_tree[pkg_name][field].append(name)
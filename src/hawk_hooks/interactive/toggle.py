@@ -24,6 +24,7 @@ from rich.console import Console
 from rich.live import Live
 from rich.text import Text
 
+from .. import config, registry_index, search_index
 from ..hook_meta import parse_hook_meta
 from ..types import TieredMenuItem, ToggleScope  # noqa: F401 — re-exported
 from .pause import wait_for_continue
@@ -484,12 +485,24 @@ def _open_in_finder(path: Path) -> None:
         subprocess.run(["xdg-open", str(path.parent if path.is_file() else path)], check=False)
 
 
+def _detach_for_edit(path: Path) -> None:
+    """Give registry files at *path* private copies before an editor opens them.
+
+    Editors may save in place; a file hardlinked to a shared blob would
+    otherwise change every item using it.
+    """
+    from ..registry import Registry
+
+    Registry(config.get_registry_path()).detach(path)
+
+
 def _open_in_editor(path: Path) -> None:
     """Open a path in $EDITOR. Shows file picker for directories."""
     editor = os.environ.get("EDITOR", "vim")
     target = _pick_file(path)
     if target is None:
         return
+    _detach_for_edit(target)
     subprocess.run([editor, str(target)], check=False)
 
 
@@ -583,6 +596,28 @@ def _detect_tiers(
 # ---------------------------------------------------------------------------
 
 
+def _filter_matches(
+    query: str,
+    pairs: list[tuple[str, str]],
+    registry_path: Path | None = None,
+) -> set[tuple[str, str]]:
+    """Items matching a picker filter.
+
+    An item matches if its name contains the query, or if the registry's
+    full-text index finds every query term (the last one as a prefix) in it.
+    """
+    needle = query.strip().lower()
+    matches = {(fld, name) for fld, name in pairs if needle in name.lower()}
+    try:
+        hits = search_index.search(
+            query, registry_path=registry_path, limit=None, match_all=True, prefix=True
+        )
+    except OSError:
+        hits = []
+    matches.update((hit.component_type.registry_dir, hit.name) for hit in hits)
+    return matches
+
+
 def run_picker(
     title: str,
     package_tree: dict[str, dict[str, list[str]]],
@@ -670,6 +705,10 @@ def run_picker(
     changed = False
     chosen_action = ACTION_DONE
     description_cache: dict[tuple[str, str], str] = {}
+    # "/" filter: the query, whether it is being typed, and the matching items.
+    filter_query = ""
+    filtering = False
+    filter_set: set[tuple[str, str]] | None = None
 
     # Track initial state for change indicators
     initial_sets: list[set[tuple[str, str]]] = [set(s["enabled"]) for s in scopes]
@@ -679,7 +718,11 @@ def run_picker(
         def get_description(field: str, name: str) -> str:
             item_path = _resolve_item_path(registry_path, registry_dir, name)
             if item_path is not None:
-                return _get_item_description(item_path, registry_dir)
+                return registry_index.lookup(
+                    item_path,
+                    "description",
+                    lambda: _get_item_description(item_path, registry_dir),
+                )
             return ""
 
     # --- Auto default parent hint function ---
@@ -690,15 +733,23 @@ def run_picker(
                     return scopes[i]["label"]
             return None
 
+    def _shown(fld: str, names: list[str]) -> list[str]:
+        if filter_set is None:
+            return names
+        return [name for name in names if (fld, name) in filter_set]
+
     def _build_rows() -> list[dict]:
         rows: list[dict] = []
+        # While filtering, groups without matches are hidden and the rest
+        # are shown expanded.
+        filtered = filter_set is not None
 
         if tiers == 1:
             # Flat: just items from any package/field
             for pkg_name in package_order:
                 field_map = package_tree.get(pkg_name, {})
                 for fld in ordered_fields:
-                    for name in field_map.get(fld, []):
+                    for name in _shown(fld, field_map.get(fld, [])):
                         rows.append({
                             "kind": ROW_ITEM,
                             "package": pkg_name,
@@ -713,6 +764,9 @@ def run_picker(
                 collapsed_packages.setdefault(pkg_name, True)
                 field_map = package_tree.get(pkg_name, {})
                 item_count = sum(len(names) for names in field_map.values())
+                shown = _shown(the_field, field_map.get(the_field, []))
+                if filtered and not shown:
+                    continue
 
                 rows.append({
                     "kind": ROW_PACKAGE,
@@ -720,10 +774,10 @@ def run_picker(
                     "count": item_count,
                     "is_ungrouped": pkg_name == UNGROUPED,
                 })
-                if collapsed_packages.get(pkg_name, False):
+                if collapsed_packages.get(pkg_name, False) and not filtered:
                     continue
 
-                for name in field_map.get(the_field, []):
+                for name in shown:
                     rows.append({
                         "kind": ROW_ITEM,
                         "package": pkg_name,
@@ -737,6 +791,8 @@ def run_picker(
                 collapsed_packages.setdefault(pkg_name, True)
                 field_map = package_tree.get(pkg_name, {})
                 item_count = sum(len(names) for f, names in field_map.items())
+                if filtered and not any(_shown(f, n) for f, n in field_map.items()):
+                    continue
                 rows.append({
                     "kind": ROW_PACKAGE,
                     "package": pkg_name,
@@ -744,11 +800,11 @@ def run_picker(
                     "is_ungrouped": pkg_name == UNGROUPED,
                 })
 
-                if collapsed_packages.get(pkg_name, False):
+                if collapsed_packages.get(pkg_name, False) and not filtered:
                     continue
 
                 for fld in ordered_fields:
-                    names = field_map.get(fld, [])
+                    names = _shown(fld, field_map.get(fld, []))
                     if not names:
                         continue
                     label = field_labels.get(fld, fld.title())
@@ -760,7 +816,7 @@ def run_picker(
                         "count": len(names),
                     })
 
-                    if collapsed_types.get((pkg_name, fld), True):
+                    if collapsed_types.get((pkg_name, fld), True) and not filtered:
                         continue
 
                     for name in names:
@@ -874,6 +930,15 @@ def run_picker(
             else:
                 lines.append(f"[dim]Packages: {package_count}[/dim]")
 
+        if filtering or filter_query:
+            cursor_mark = "\u258c" if filtering else ""
+            n_matches = sum(1 for r in rows if r["kind"] == ROW_ITEM)
+            shown_query = filter_query.replace("[", "\\[")
+            lines.append(
+                f"[dim]Filter:[/dim] {shown_query}{cursor_mark}"
+                f"  [dim]({n_matches} match{'es' if n_matches != 1 else ''})[/dim]"
+            )
+
         lines.append(dim_separator())
 
         # Description panel
@@ -901,6 +966,8 @@ def run_picker(
         reserved = 4  # header + separator + footer spacer + hints
         if tiers == 3:
             reserved += 1  # sub-header
+        if filtering or filter_query:
+            reserved += 1  # filter line
         if status_msg:
             reserved += 2
         if desc_lines:
@@ -924,6 +991,9 @@ def run_picker(
         if not has_any_items:
             lines.append("  [dim](none in registry)[/dim]")
             lines.append("")
+        elif filter_set is not None and not any(r["kind"] == ROW_ITEM for r in rows):
+            lines.append("  [dim](no matches)[/dim]")
+            lines.append("")
 
         cols = _term_cols()
 
@@ -1032,7 +1102,7 @@ def run_picker(
                 if registry_items is not None and name not in registry_items:
                     hint = "  [dim italic](not in registry)[/dim italic]"
                 elif existing_items is not None and (fld, name) in existing_items:
-                    hint = "  [dim italic](exists, will rename)[/dim italic]"
+                    hint = "  [dim italic](exists, will be namespaced)[/dim italic]"
                 elif parent_hint_fn and scope_index > 0 and not enabled:
                     parent_label = parent_hint_fn(scope_index, fld, name)
                     if parent_label:
@@ -1079,7 +1149,10 @@ def run_picker(
             hints += " · v view · e edit · o open"
         if on_delete:
             hints += " · d del"
-        hints += " · jk nav · q back"
+        if filtering:
+            hints = "type to filter · \u21b5 keep · esc clear"
+        else:
+            hints += " · / filter · jk nav · q back"
 
         # Wrap long hint lines to terminal width
         cols = _term_cols()
@@ -1116,8 +1189,10 @@ def run_picker(
         if not pairs:
             return ""
         all_enabled = all((f, n) in scope["enabled"] for f, n in pairs)
-        for f, n in pairs:
-            _do_toggle(scope, f, n, not all_enabled)
+        # Coalesce the per-item config saves into one write.
+        with config.transaction():
+            for f, n in pairs:
+                _do_toggle(scope, f, n, not all_enabled)
         return "Disabled" if all_enabled else "Enabled"
 
     def _handle_select_all(scope: dict) -> None:
@@ -1174,6 +1249,36 @@ def run_picker(
             kind = row["kind"]
             scope = scopes[scope_index]
 
+            # Filter input
+            if filtering:
+                if key in (readchar.key.ENTER, "\r", "\n"):
+                    filtering = False
+                    continue
+                if key == "\x1b":
+                    filtering = False
+                    filter_query = ""
+                elif key in (readchar.key.BACKSPACE, "\x7f", "\x08"):
+                    filter_query = filter_query[:-1]
+                elif len(key) == 1 and key.isprintable():
+                    filter_query += key
+                else:
+                    continue
+                filter_set = (
+                    _filter_matches(filter_query, _get_all_item_pairs(), registry_path)
+                    if filter_query.strip()
+                    else None
+                )
+                cursor = 0
+                scroll_offset = 0
+                continue
+            if key == "/":
+                filtering = True
+                continue
+            if key == "\x1b" and filter_query:
+                filter_query = ""
+                filter_set = None
+                continue
+
             # Navigation
             if key in (readchar.key.UP, "k"):
                 cursor = _move_cursor(rows, cursor, -1)
@@ -0,0 +1,141 @@
+"""Cross-process advisory locks for hawk config and sync targets.
+
+The CLI, the TUI auto-sync and the MCP server can all run at once. Two
+kinds of ``fcntl.flock`` locks under ``<config_dir>/locks/`` keep them
+from racing:
+
+- ``config_lock()``: short exclusive lock around read-modify-write of
+  ``config.yaml`` / ``packages.yaml``.
+- ``target_lock(scope, tool)``: held while one ``(scope, tool)`` target is
+  synced. Independent targets sync in parallel; a writer that waited on a
+  busy target re-checks the sync cache afterwards, so concurrent syncs of
+  the same desired state coalesce into one apply.
+
+Locks are re-entrant within a thread. On platforms without ``fcntl`` they
+degrade to no-ops.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None  # type: ignore[assignment]
+
+from . import config
+
+CONFIG_LOCK_TIMEOUT = 10.0
+_POLL_INTERVAL = 0.05
+
+_held = threading.local()
+
+
+class LockTimeoutError(TimeoutError):
+    """Raised when a lock could not be acquired in time."""
+
+
+def get_locks_dir() -> Path:
+    """Get the directory holding lock files."""
+    return config.get_config_dir() / "locks"
+
+
+def _held_counts() -> dict[str, int]:
+    counts = getattr(_held, "counts", None)
+    if counts is None:
+        counts = {}
+        _held.counts = counts
+    return counts
+
+
+@contextlib.contextmanager
+def file_lock(path: Path, *, timeout: float | None = None) -> Iterator[None]:
+    """Hold an exclusive advisory lock on *path*.
+
+    Args:
+        path: Lock file (created if missing).
+        timeout: Seconds to wait before raising :class:`LockTimeoutError`;
+            None waits indefinitely.
+    """
+    key = str(path)
+    counts = _held_counts()
+    if fcntl is None or counts.get(key):
+        counts[key] = counts.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            counts[key] -= 1
+        return
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if deadline is None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                    break
+                if time.monotonic() >= deadline:
+                    raise LockTimeoutError(f"timed out waiting for lock {path}") from None
+                time.sleep(_POLL_INTERVAL)
+
+        counts[key] = 1
+        try:
+            yield
+        finally:
+            counts[key] = 0
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def is_locked(path: Path) -> bool:
+    """Return True if another holder currently has *path* locked."""
+    if fcntl is None or _held_counts().get(str(path)):
+        return False
+    try:
+        fd = os.open(path, os.O_RDWR)
+    except OSError:
+        return False
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        return False
+    finally:
+        os.close(fd)
+
+
+def config_lock(
+    timeout: float | None = CONFIG_LOCK_TIMEOUT,
+) -> contextlib.AbstractContextManager[None]:
+    """Lock guarding global config and package index writes."""
+    return file_lock(get_locks_dir() / "config.lock", timeout=timeout)
+
+
+def target_lock_path(scope: str, tool: str) -> Path:
+    """Lock file for one ``(scope, tool)`` sync target."""
+    digest = hashlib.sha256(scope.encode()).hexdigest()[:16]
+    return get_locks_dir() / f"target-{digest}-{tool}.lock"
+
+
+def target_lock(
+    scope: str,
+    tool: str,
+    timeout: float | None = None,
+) -> contextlib.AbstractContextManager[None]:
+    """Lock held while syncing one ``(scope, tool)`` target."""
+    return file_lock(target_lock_path(scope, str(tool)), timeout=timeout)
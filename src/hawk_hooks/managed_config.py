@@ -9,8 +9,12 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from pathlib import Path
 import re
+import tomllib
 from typing import Literal
 
+from . import fileio
+from .fileio import write_text_if_changed
+
 
 @dataclass
 class ManagedConfigOp:
@@ -25,12 +29,32 @@ class ManagedConfigOp:
     conflict_policy: Literal["skip", "error"] = "error"
 
 
+@dataclass
+class ManagedConfigOpResult:
+    """Outcome of a single managed-config operation."""
+
+    unit_id: str
+    action: str
+    status: Literal["applied", "unchanged", "error"]
+    message: str = ""
+
+
 @dataclass
 class ManagedConfigResult:
     """Result from applying managed-config operations."""
 
     applied: list[str] = field(default_factory=list)
     errors: list[str] = field(default_factory=list)
+    ops: list[ManagedConfigOpResult] = field(default_factory=list)
+
+    def _record(self, op: ManagedConfigOp, status: str, message: str = "") -> None:
+        self.ops.append(
+            ManagedConfigOpResult(op.unit_id, op.action, status, message)  # type: ignore[arg-type]
+        )
+        if status == "applied":
+            self.applied.append(op.unit_id)
+        elif status == "error":
+            self.errors.append(f"{op.unit_id}: {message}")
 
 
 class TomlBlockDriver:
@@ -71,54 +95,125 @@ class TomlBlockDriver:
         ).rstrip()
 
     @classmethod
-    def upsert(cls, path: Path, unit_id: str, payload: str) -> None:
-        """Insert or replace a managed TOML block."""
-        text = path.read_text() if path.exists() else ""
-        text = cls.strip_unit(text, unit_id)
-        begin = cls._begin(unit_id)
-        end = cls._end(unit_id)
+    def upsert_text(cls, text: str, unit_id: str, payload: str) -> str:
+        """Return *text* with the managed block for *unit_id* set to *payload*.
+
+        An existing block is replaced in place so unchanged payloads leave
+        the text byte-identical; new blocks are appended at the end.
+        """
+        text = cls._normalize_newlines(text)
         body = payload.strip("\n")
-        block = f"{begin}\n{body}\n{end}"
+        block = f"{cls._begin(unit_id)}\n{body}\n{cls._end(unit_id)}\n"
+        unit_re = cls._unit_re(unit_id)
+        match = unit_re.search(text)
+        if match is None:
+            text = text.rstrip()
+            return f"{text}\n\n{block}" if text else block
+        # Drop any duplicate blocks after the first one.
+        rest = unit_re.sub("", text[match.end():])
+        return text[: match.start()] + block + rest
 
-        if text:
-            new_text = f"{text}\n\n{block}\n"
-        else:
-            new_text = f"{block}\n"
+    @classmethod
+    def remove_text(cls, text: str, unit_id: str) -> str:
+        """Return *text* without the managed block for *unit_id*."""
+        text = cls._normalize_newlines(text)
+        if not cls._unit_re(unit_id).search(text):
+            return text
+        new = cls.strip_unit(text, unit_id)
+        return new + "\n" if new else ""
 
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(new_text)
+    @classmethod
+    def upsert(cls, path: Path, unit_id: str, payload: str) -> None:
+        """Insert or replace a managed TOML block."""
+        text = fileio.read_text(path) if fileio.exists(path) else ""
+        write_text_if_changed(path, cls.upsert_text(text, unit_id, payload))
 
     @classmethod
     def remove(cls, path: Path, unit_id: str) -> bool:
         """Remove a managed block. Returns True when content changed."""
-        if not path.exists():
+        if not fileio.exists(path):
             return False
-        old = cls._normalize_newlines(path.read_text())
-        new = cls.strip_unit(old, unit_id)
-        if new == old.rstrip():
+        old = cls._normalize_newlines(fileio.read_text(path))
+        new = cls.remove_text(old, unit_id)
+        if new == old:
             return False
-        path.write_text(new + "\n" if new else "")
+        write_text_if_changed(path, new)
         return True
 
     @classmethod
     def apply(cls, ops: list[ManagedConfigOp]) -> ManagedConfigResult:
-        """Apply managed config operations sequentially."""
+        """Apply managed config operations as one transaction per file.
+
+        Each file is read once, all of its ops are applied in memory, and the
+        result is validated with ``tomllib`` before a single atomic write. If
+        the ops would turn a valid file into invalid TOML, nothing is written
+        for that file and each of its ops is reported as an error.
+        """
         result = ManagedConfigResult()
+        by_file: dict[Path, list[ManagedConfigOp]] = {}
         for op in ops:
             if op.format != "toml" or op.ownership != "block":
-                result.errors.append(
-                    f"{op.unit_id}: unsupported driver ({op.format}/{op.ownership})"
-                )
+                result._record(op, "error", f"unsupported driver ({op.format}/{op.ownership})")
+                continue
+            if op.action not in ("upsert", "remove"):
+                result._record(op, "error", f"unknown action {op.action}")
                 continue
+            by_file.setdefault(op.file, []).append(op)
+
+        for path, file_ops in by_file.items():
+            cls._apply_file(path, file_ops, result)
+        return result
+
+    @classmethod
+    def _apply_file(
+        cls,
+        path: Path,
+        ops: list[ManagedConfigOp],
+        result: ManagedConfigResult,
+    ) -> None:
+        """Apply all ops targeting one file and write it at most once."""
+        try:
+            original = (
+                cls._normalize_newlines(fileio.read_text(path)) if fileio.exists(path) else ""
+            )
+        except OSError as exc:
+            for op in ops:
+                result._record(op, "error", str(exc))
+            return
+
+        text = original
+        statuses: list[tuple[ManagedConfigOp, str]] = []
+        for op in ops:
+            if op.action == "upsert":
+                new = cls.upsert_text(text, op.unit_id, op.payload)
+                # Upserts always count as applied, matching per-call upsert().
+                statuses.append((op, "applied"))
+            else:
+                new = cls.remove_text(text, op.unit_id)
+                statuses.append((op, "applied" if new != text else "unchanged"))
+            text = new
+
+        if text != original:
+            invalid = cls._validation_error(text)
+            if invalid and not cls._validation_error(original):
+                for op, _status in statuses:
+                    result._record(op, "error", f"would produce invalid TOML: {invalid}")
+                return
             try:
-                if op.action == "upsert":
-                    cls.upsert(op.file, op.unit_id, op.payload)
-                    result.applied.append(op.unit_id)
-                elif op.action == "remove":
-                    if cls.remove(op.file, op.unit_id):
-                        result.applied.append(op.unit_id)
-                else:
-                    result.errors.append(f"{op.unit_id}: unknown action {op.action}")
+                write_text_if_changed(path, text)
             except OSError as exc:
-                result.errors.append(f"{op.unit_id}: {exc}")
-        return result
+                for op, _status in statuses:
+                    result._record(op, "error", str(exc))
+                return
+
+        for op, status in statuses:
+            result._record(op, status)
+
+    @staticmethod
+    def _validation_error(text: str) -> str | None:
+        """Return a TOML parse error message, or None if *text* is valid."""
+        try:
+            tomllib.loads(text)
+        except tomllib.TOMLDecodeError as exc:
+            return str(exc)
+        return None
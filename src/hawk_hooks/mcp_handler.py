@@ -36,6 +36,8 @@ ACTION_SCHEMAS: dict[str, dict[str, Any]] = {
             "type": {"type": "string", "required": False,
                      "enum": sorted(VALID_TYPES),
                      "description": "Filter by component type"},
+            "query": {"type": "string", "required": False,
+                      "description": "Full-text search; returns matches, best first"},
         },
     },
     "status": {
@@ -376,20 +378,25 @@ def _action_list(data: dict) -> dict:
     global_section = cfg.get("global", {})
 
     type_filter = data.get("type")
-    if type_filter:
-        ct = _validate_component_type(type_filter)
-        contents = registry.list(ct)
-    else:
-        contents = registry.list()
+    ct = _validate_component_type(type_filter) if type_filter else None
+    contents = registry.list(ct)
+
+    # With a query, keep only matching items, ordered by relevance.
+    query = data.get("query")
+    scores: dict[tuple[ComponentType, str], float] = {}
+    if query:
+        from . import search_index
+
+        hits = search_index.search(
+            query, registry_path=registry.path, component_type=ct, limit=None
+        )
+        scores = {(hit.component_type, hit.name): hit.score for hit in hits}
+        contents = {
+            t: [hit.name for hit in hits if hit.component_type == t] for t in contents
+        }
 
     # Build enriched list with enabled state + package info
-    packages = config.load_packages()
-    pkg_owner: dict[tuple[str, str], str] = {}
-    for pkg_name, pkg_data in packages.items():
-        for item in pkg_data.get("items", []):
-            t, n = item.get("type"), item.get("name")
-            if t and n:
-                pkg_owner[(t, n)] = pkg_name
+    package_index = config.get_package_index()
 
     # Check dir-scoped enabled state
     dir_param = data.get("dir")
@@ -413,9 +420,11 @@ def _action_list(data: dict) -> dict:
             }
             if dir_param:
                 entry["enabled_local"] = name in dir_enabled.get(field, [])
-            pkg = pkg_owner.get((ct.value, name))
+            pkg = package_index.last_owner(ct.value, name)
             if pkg:
                 entry["package"] = pkg
+            if query:
+                entry["score"] = scores[(ct, name)]
             items.append(entry)
         if items:
             components[field] = items
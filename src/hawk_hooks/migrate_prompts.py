@@ -198,14 +198,20 @@ def _migrate_packages(changes: list[str], backup: bool) -> bool:
 
 
 def _clear_resolved_cache(changes: list[str]) -> bool:
-    cache_dir = config.get_config_dir() / "cache" / "resolved"
-    if not cache_dir.exists():
-        return False
+    from .sync_state import SyncStateStore, get_state_path
 
     changed = False
-    for entry in cache_dir.iterdir():
-        if entry.is_file():
-            entry.unlink()
+    cache_dir = config.get_config_dir() / "cache" / "resolved"
+    if cache_dir.exists():
+        for entry in cache_dir.iterdir():
+            if entry.is_file():
+                entry.unlink()
+                changed = True
+
+    if get_state_path().exists():
+        store = SyncStateStore()
+        if store.entries():
+            store.clear()
             changed = True
 
     if changed:
@@ -0,0 +1,283 @@
+"""Content-addressed object store for registry files.
+
+When ``<registry>/.objects/`` exists, registry items are materialized as
+hardlinks to shared, read-only blobs instead of private copies, so an
+identical file vendored by several packages is stored once and a package
+update only writes the files that actually changed::
+
+    <registry>/.objects/ab/cdef0123...     blob (sha256 of content)
+    <registry>/.objects/ab/cdef0123...x    same, for executable files
+
+Blobs are read-only so an in-place edit of one registry item cannot
+silently change every other item sharing the blob; editors that save by
+rename simply give the item a private copy. Code that writes registry
+files in place must call :func:`detach` first (root ignores the
+read-only bits). Where hardlinks are not possible (e.g. a filesystem
+that does not support them) files are copied.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import stat
+from pathlib import Path
+
+OBJECTS_DIR = ".objects"
+
+_CHUNK = 1 << 20
+
+# Process-wide {objects dir: {(dev, ino): (sha256 hex, size)}}, filled on
+# first use and extended as blobs are written.
+_inode_maps: dict[str, dict[tuple[int, int], tuple[str, int]]] = {}
+
+
+def objects_dir_for(registry_path: Path) -> Path:
+    """Get the object store directory of a registry."""
+    return registry_path / OBJECTS_DIR
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _is_blob_inode(st: os.stat_result) -> bool:
+    return st.st_nlink > 1 and not st.st_mode & 0o222
+
+
+def _files_under(path: Path) -> list[Path]:
+    if not path.is_dir():
+        return [path]
+    return [Path(d) / f for d, _, fs in os.walk(path) for f in fs]
+
+
+def detach(path: Path) -> set[tuple[int, int]]:
+    """Replace hardlinked files under *path* with private, writable copies.
+
+    Returns:
+        The (dev, ino) of the inodes the files were detached from.
+    """
+    detached = set()
+    for f in _files_under(path):
+        try:
+            st = os.stat(f, follow_symlinks=False)
+        except OSError:
+            continue
+        if not stat.S_ISREG(st.st_mode) or st.st_nlink < 2:
+            continue
+        tmp = f.with_name(f".{f.name}.{os.getpid()}.tmp")
+        try:
+            shutil.copyfile(f, tmp)
+            os.chmod(tmp, stat.S_IMODE(st.st_mode) | stat.S_IWUSR)
+            os.replace(tmp, f)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        detached.add((st.st_dev, st.st_ino))
+    return detached
+
+
+class ObjectStore:
+    """Blobs keyed by content hash under one ``.objects`` directory."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def exists(self) -> bool:
+        return self.root.is_dir()
+
+    def create(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _blob_path(self, digest: str, executable: bool) -> Path:
+        return self.root / digest[:2] / (digest[2:] + ("x" if executable else ""))
+
+    def _inodes(self) -> dict[tuple[int, int], tuple[str, int]]:
+        key = str(self.root)
+        inodes = _inode_maps.get(key)
+        if inodes is not None:
+            return inodes
+        inodes = {}
+        try:
+            fans = list(os.scandir(self.root))
+        except OSError:
+            fans = []
+        for fan in fans:
+            if not fan.is_dir(follow_symlinks=False) or len(fan.name) != 2:
+                continue
+            try:
+                for entry in os.scandir(fan.path):
+                    if entry.name.startswith("."):
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                    digest = fan.name + entry.name.rstrip("x")
+                    inodes[(st.st_dev, st.st_ino)] = (digest, st.st_size)
+            except OSError:
+                continue
+        _inode_maps[key] = inodes
+        return inodes
+
+    def digest_of(self, path: Path, st: os.stat_result | None = None) -> str | None:
+        """Return the sha256 of *path* if it is a link to one of our blobs."""
+        if st is None:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return None
+        if not _is_blob_inode(st):
+            return None
+        entry = self._inodes().get((st.st_dev, st.st_ino))
+        if entry is None or entry[1] != st.st_size:
+            return None
+        return entry[0]
+
+    def put(self, path: Path) -> tuple[Path, bool]:
+        """Store the contents of *path*; return (blob path, newly written)."""
+        st = os.stat(path)
+        executable = bool(st.st_mode & 0o111)
+        digest = self.digest_of(path, st) or _sha256_file(path)
+        blob = self._blob_path(digest, executable)
+        if blob.exists():
+            return blob, False
+
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp = blob.with_name(f".{blob.name}.{os.getpid()}.tmp")
+        try:
+            shutil.copyfile(path, tmp)
+            os.chmod(tmp, 0o555 if executable else 0o444)
+            os.replace(tmp, blob)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        bst = os.stat(blob)
+        self._inodes()[(bst.st_dev, bst.st_ino)] = (digest, bst.st_size)
+        return blob, True
+
+    def link(self, source: Path, dest: Path) -> bool:
+        """Materialize *source* at *dest* through the store.
+
+        Returns True if a new blob had to be written.
+        """
+        blob, written = self.put(source)
+        try:
+            os.link(blob, dest)
+        except OSError:
+            shutil.copyfile(blob, dest)
+            os.chmod(dest, stat.S_IMODE(os.stat(source).st_mode))
+        return written
+
+    def materialize(self, source: Path, dest: Path) -> int:
+        """Recreate the file or tree *source* at *dest*; return new blob count."""
+        if not source.is_dir():
+            return int(self.link(source, dest))
+        written = 0
+        dest.mkdir()
+        for dirpath, dirnames, filenames in os.walk(source, followlinks=True):
+            rel = Path(dirpath).relative_to(source)
+            target = dest / rel
+            for d in dirnames:
+                (target / d).mkdir(exist_ok=True)
+            for name in filenames:
+                written += self.link(Path(dirpath) / name, target / name)
+        return written
+
+    def blob_inodes_in(self, path: Path) -> set[tuple[int, int]]:
+        """Inodes of the blobs linked from under *path*."""
+        files = _files_under(path)
+        found = set()
+        for f in files:
+            try:
+                st = os.stat(f, follow_symlinks=False)
+            except OSError:
+                continue
+            if _is_blob_inode(st) and (st.st_dev, st.st_ino) in self._inodes():
+                found.add((st.st_dev, st.st_ino))
+        return found
+
+    def release(self, inodes: set[tuple[int, int]]) -> int:
+        """Delete blobs among *inodes* that are no longer linked; return count."""
+        inodes_map = self._inodes()
+        removed = 0
+        for key in inodes:
+            entry = inodes_map.get(key)
+            if entry is None:
+                continue
+            digest = entry[0]
+            for executable in (False, True):
+                blob = self._blob_path(digest, executable)
+                try:
+                    st = os.stat(blob)
+                except OSError:
+                    continue
+                if (st.st_dev, st.st_ino) == key and st.st_nlink == 1:
+                    blob.unlink()
+                    del inodes_map[key]
+                    removed += 1
+        return removed
+
+    def collect_garbage(self) -> int:
+        """Delete every blob no registry item links to any more; return count.
+
+        :meth:`release` only revisits the blobs of items being removed, so
+        a blob that was still shared at that time (e.g. with an older
+        registry generation) is left behind once its last other link goes.
+        """
+        inodes_map = _inode_maps.get(str(self.root))
+        removed = 0
+        try:
+            fans = list(os.scandir(self.root))
+        except OSError:
+            return 0
+        for fan in fans:
+            if not fan.is_dir(follow_symlinks=False) or len(fan.name) != 2:
+                continue
+            try:
+                entries = list(os.scandir(fan.path))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                    if st.st_nlink != 1:
+                        continue
+                    os.unlink(entry.path)
+                except OSError:
+                    continue
+                if inodes_map is not None:
+                    inodes_map.pop((st.st_dev, st.st_ino), None)
+                removed += 1
+        return removed
+
+    def adopt(self, path: Path) -> tuple[int, int]:
+        """Replace the files under *path* with blob links.
+
+        Returns (files linked, bytes no longer stored twice).
+        """
+        files = _files_under(path)
+        linked = saved = 0
+        for f in files:
+            try:
+                st = os.stat(f, follow_symlinks=False)
+            except OSError:
+                continue
+            if not stat.S_ISREG(st.st_mode) or self.digest_of(f, st):
+                continue
+            blob, written = self.put(f)
+            tmp = f.with_name(f".{f.name}.{os.getpid()}.tmp")
+            try:
+                os.link(blob, tmp)
+                os.replace(tmp, f)
+            except OSError:
+                tmp.unlink(missing_ok=True)
+                continue
+            linked += 1
+            if not written:
+                saved += st.st_size
+        return linked, saved
@@ -7,9 +7,9 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Callable
 
-from . import config
+from . import config, generations
 from .downloader import classify, get_head_commit, scan_directory, shallow_clone
-from .registry import Registry
+from .registry import Registry, package_namespace, qualified_name
 from .types import ComponentType
 
 
@@ -105,6 +105,28 @@ def _iter_valid_package_items(
     return valid
 
 
+def _registry_name(item, package_name: str, old_items: dict[tuple[str, str], str]) -> str:
+    """Registry name for an upstream item of *package_name*.
+
+    Keeps the name this package recorded: plain, namespaced, or the
+    ``<namespace>-<name>`` prefix rename older versions used on clashes.
+    A new item whose name another package owns moves into this package's
+    namespace.
+    """
+    item_type = item.component_type.value
+    namespace = package_namespace(package_name)
+    namespaced = qualified_name(namespace, item.name)
+    for recorded in (namespaced, item.name, f"{namespace}-{item.name}"):
+        if (item_type, recorded) in old_items:
+            return recorded
+    index = config.get_package_index()
+    if index.owner(item_type, item.name) and not index.owned_by(
+        item_type, item.name, package_name
+    ):
+        return namespaced
+    return item.name
+
+
 def update_packages(
     package: str | None = None,
     *,
@@ -133,63 +155,171 @@ def update_packages(
     else:
         to_update = packages
 
+    # With registry generations enabled, update a fresh copy so
+    # `hawk rollback` can switch back to the current one.
+    previous_generation = generations.active_generation(registry.path)
+    new_generation = None
+    if previous_generation is not None and not check:
+        new_generation = generations.snapshot(registry.path)
+
     any_changes = False
+    changed_items: set[tuple[ComponentType, str]] = set()
     up_to_date: list[str] = []
     failed_packages: list[str] = []
 
-    for pkg_name, pkg_data in sorted(to_update.items()):
-        source_type = _package_source_type(pkg_data)
-        old_items = {
-            (item_type, item_name): item_hash
-            for item_type, item_name, item_hash in _iter_valid_package_items(
-                pkg_data.get("items", []),
-                log=logf,
-                package_name=pkg_name,
-            )
-        }
-        registry_path = config.get_registry_path()
-
-        if source_type == "manual":
-            logf(f"{pkg_name}: local-only package, cannot update")
-            continue
-
-        if source_type == "git":
-            url = pkg_data.get("url", "")
-            logf(f"\n{pkg_name}:")
-            logf(f"  Cloning {url}...")
+    try:
+        for pkg_name, pkg_data in sorted(to_update.items()):
+            source_type = _package_source_type(pkg_data)
+            old_items = {
+                (item_type, item_name): item_hash
+                for item_type, item_name, item_hash in _iter_valid_package_items(
+                    pkg_data.get("items", []),
+                    log=logf,
+                    package_name=pkg_name,
+                )
+            }
+            registry_path = config.get_registry_path()
 
-            clone_dir: Path | None = None
-            try:
-                clone_dir = shallow_clone(url)
-            except Exception as e:  # pragma: no cover - defensive parity with existing behavior
-                logf(f"  Error cloning: {e}")
-                failed_packages.append(pkg_name)
+            if source_type == "manual":
+                logf(f"{pkg_name}: local-only package, cannot update")
                 continue
 
-            try:
-                new_commit = get_head_commit(clone_dir)
-                old_commit = pkg_data.get("commit", "")
+            if source_type == "git":
+                url = pkg_data.get("url", "")
+                logf(f"\n{pkg_name}:")
+                logf(f"  Cloning {url}...")
 
-                if new_commit == old_commit and not force:
-                    up_to_date.append(pkg_name)
-                    logf(f"  Up to date ({new_commit[:7]})")
+                clone_dir: Path | None = None
+                try:
+                    clone_dir = shallow_clone(url)
+                except Exception as e:  # pragma: no cover - defensive parity with existing behavior
+                    logf(f"  Error cloning: {e}")
+                    failed_packages.append(pkg_name)
                     continue
 
-                if check:
-                    logf(f"  Update available: {old_commit[:7]} -> {new_commit[:7]}")
-                    any_changes = True
-                    continue
+                try:
+                    new_commit = get_head_commit(clone_dir)
+                    old_commit = pkg_data.get("commit", "")
+
+                    if new_commit == old_commit and not force:
+                        up_to_date.append(pkg_name)
+                        logf(f"  Up to date ({new_commit[:7]})")
+                        continue
+
+                    if check:
+                        logf(f"  Update available: {old_commit[:7]} -> {new_commit[:7]}")
+                        any_changes = True
+                        continue
 
-                repo_name = url.rstrip("/").rsplit("/", 1)[-1].removesuffix(".git")
-                content = classify(clone_dir, repo_name=repo_name)
+                    repo_name = url.rstrip("/").rsplit("/", 1)[-1].removesuffix(".git")
+                    content = classify(clone_dir, repo_name=repo_name)
 
-                new_pkg_items = []
-                added_count = 0
-                updated_count = 0
+                    new_pkg_items = []
+                    added_count = 0
+                    updated_count = 0
 
-                for item in content.items:
-                    item_key = (item.component_type.value, item.name)
+                    for item in content.items:
+                        item.name = _registry_name(item, pkg_name, old_items)
+                        item_key = (item.component_type.value, item.name)
 
+                        try:
+                            if registry.detect_clash(item.component_type, item.name):
+                                registry.replace(item.component_type, item.name, item.source_path)
+                            else:
+                                registry.add(item.component_type, item.name, item.source_path)
+                        except (FileNotFoundError, FileExistsError, OSError) as e:
+                            logf(f"  ! {item.name}: {e}")
+                            continue
+
+                        item_path = registry_path / item.component_type.registry_dir / item.name
+                        new_hash = config.hash_registry_item(item_path)
+
+                        new_pkg_items.append({
+                            "type": item.component_type.value,
+                            "name": item.name,
+                            "hash": new_hash,
+                        })
+
+                        old_hash = old_items.get(item_key, "")
+                        if not old_hash:
+                            logf(f"  + {item.name} (added)")
+                            added_count += 1
+                            changed_items.add((item.component_type, item.name))
+                        elif old_hash != new_hash:
+                            logf(f"  ~ {item.name} (updated)")
+                            updated_count += 1
+                            changed_items.add((item.component_type, item.name))
+                        else:
+                            logf(f"  = {item.name} (unchanged)")
+
+                    new_keys = {(i["type"], i["name"]) for i in new_pkg_items}
+                    for (t, n), _ in old_items.items():
+                        if (t, n) in new_keys:
+                            continue
+                        if prune:
+                            try:
+                                ct = ComponentType(t)
+                            except ValueError:
+                                logf(
+                                    f"  ! malformed package item type '{t}' for {n}; "
+                                    "skipping prune"
+                                )
+                                continue
+                            if registry.remove(ct, n):
+                                any_changes = True
+                                changed_items.add((ct, n))
+                            logf(f"  - {n} (pruned)")
+                        else:
+                            logf(f"  ? {n} (removed upstream, kept locally)")
+
+                    config.record_package(
+                        pkg_name, url, new_commit, new_pkg_items, path=str(pkg_data.get("path", ""))
+                    )
+
+                    parts = []
+                    if updated_count:
+                        parts.append(f"{updated_count} updated")
+                    if added_count:
+                        parts.append(f"{added_count} new")
+                    if parts:
+                        logf(f"  {', '.join(parts)}")
+                        any_changes = True
+                finally:
+                    if clone_dir is not None:
+                        shutil.rmtree(clone_dir, ignore_errors=True)
+                continue
+
+            local_path = Path(str(pkg_data.get("path", ""))).expanduser()
+            logf(f"\n{pkg_name}:")
+
+            if not local_path.exists():
+                logf(f"  local source path not found: {local_path}")
+                logf("  Path moved? Re-import: hawk scan /new/path --all --replace")
+                logf(f"  Removed intentionally? hawk remove-package {pkg_name}")
+                logf(f"  Temporarily unavailable? Reconnect and run: hawk update {pkg_name}")
+                failed_packages.append(pkg_name)
+                continue
+
+            content = scan_directory(local_path.resolve())
+            if not content.items:
+                logf(f"  no components found at {local_path.resolve()}")
+                logf("  Fix: verify path, increase scan depth if needed, or re-import")
+                logf("  Example: hawk scan /correct/path --depth 8 --all --replace")
+                failed_packages.append(pkg_name)
+                continue
+
+            new_pkg_items = []
+            added_count = 0
+            updated_count = 0
+            unchanged_count = 0
+
+            for item in content.items:
+                item.name = _registry_name(item, pkg_name, old_items)
+                item_key = (item.component_type.value, item.name)
+
+                if check:
+                    new_hash = config.hash_registry_item(item.source_path)
+                else:
                     try:
                         if registry.detect_clash(item.component_type, item.name):
                             registry.replace(item.component_type, item.name, item.source_path)
@@ -202,172 +332,105 @@ def update_packages(
                     item_path = registry_path / item.component_type.registry_dir / item.name
                     new_hash = config.hash_registry_item(item_path)
 
-                    new_pkg_items.append({
-                        "type": item.component_type.value,
-                        "name": item.name,
-                        "hash": new_hash,
-                    })
-
-                    old_hash = old_items.get(item_key, "")
-                    if not old_hash:
-                        logf(f"  + {item.name} (added)")
-                        added_count += 1
-                    elif old_hash != new_hash:
-                        logf(f"  ~ {item.name} (updated)")
-                        updated_count += 1
-                    else:
-                        logf(f"  = {item.name} (unchanged)")
-
-                new_keys = {(i["type"], i["name"]) for i in new_pkg_items}
-                for (t, n), _ in old_items.items():
-                    if (t, n) in new_keys:
+                new_pkg_items.append({
+                    "type": item.component_type.value,
+                    "name": item.name,
+                    "hash": new_hash,
+                })
+
+                old_hash = old_items.get(item_key, "")
+                if not old_hash:
+                    added_count += 1
+                    if not check:
+                        changed_items.add((item.component_type, item.name))
+                elif old_hash != new_hash:
+                    updated_count += 1
+                    if not check:
+                        changed_items.add((item.component_type, item.name))
+                else:
+                    unchanged_count += 1
+
+            new_keys = {(i["type"], i["name"]) for i in new_pkg_items}
+            removed_count = 0
+            for (t, n), _ in old_items.items():
+                if (t, n) in new_keys:
+                    continue
+                removed_count += 1
+                if check:
+                    continue
+                if prune:
+                    try:
+                        ct = ComponentType(t)
+                    except ValueError:
+                        logf(f"  ! malformed package item type '{t}' for {n}; skipping prune")
                         continue
-                    if prune:
-                        try:
-                            ct = ComponentType(t)
-                        except ValueError:
-                            logf(f"  ! malformed package item type '{t}' for {n}; skipping prune")
-                            continue
-                        if registry.remove(ct, n):
-                            any_changes = True
-                        logf(f"  - {n} (pruned)")
-                    else:
-                        logf(f"  ? {n} (removed upstream, kept locally)")
-
-                config.record_package(
-                    pkg_name, url, new_commit, new_pkg_items, path=str(pkg_data.get("path", ""))
-                )
+                    if registry.remove(ct, n):
+                        any_changes = True
+                        changed_items.add((ct, n))
+                    logf(f"  - {n} (pruned)")
+                else:
+                    logf(f"  ? {n} (removed upstream, kept locally)")
 
-                parts = []
-                if updated_count:
-                    parts.append(f"{updated_count} updated")
-                if added_count:
-                    parts.append(f"{added_count} new")
-                if parts:
-                    logf(f"  {', '.join(parts)}")
+            if check:
+                if added_count or updated_count or removed_count:
+                    parts = []
+                    if updated_count:
+                        parts.append(f"{updated_count} updated")
+                    if added_count:
+                        parts.append(f"{added_count} new")
+                    if removed_count:
+                        parts.append(f"{removed_count} removed upstream")
+                    logf(f"  Would update: {', '.join(parts)}")
                     any_changes = True
-            finally:
-                if clone_dir is not None:
-                    shutil.rmtree(clone_dir, ignore_errors=True)
-            continue
-
-        local_path = Path(str(pkg_data.get("path", ""))).expanduser()
-        logf(f"\n{pkg_name}:")
-
-        if not local_path.exists():
-            logf(f"  local source path not found: {local_path}")
-            logf("  Path moved? Re-import: hawk scan /new/path --all --replace")
-            logf(f"  Removed intentionally? hawk remove-package {pkg_name}")
-            logf(f"  Temporarily unavailable? Reconnect and run: hawk update {pkg_name}")
-            failed_packages.append(pkg_name)
-            continue
-
-        content = scan_directory(local_path.resolve())
-        if not content.items:
-            logf(f"  no components found at {local_path.resolve()}")
-            logf("  Fix: verify path, increase scan depth if needed, or re-import")
-            logf("  Example: hawk scan /correct/path --depth 8 --all --replace")
-            failed_packages.append(pkg_name)
-            continue
-
-        new_pkg_items = []
-        added_count = 0
-        updated_count = 0
-        unchanged_count = 0
-
-        for item in content.items:
-            item_key = (item.component_type.value, item.name)
+                else:
+                    up_to_date.append(pkg_name)
+                    logf("  Up to date (local)")
+                continue
 
-            if check:
-                new_hash = config.hash_registry_item(item.source_path)
-            else:
-                try:
-                    if registry.detect_clash(item.component_type, item.name):
-                        registry.replace(item.component_type, item.name, item.source_path)
-                    else:
-                        registry.add(item.component_type, item.name, item.source_path)
-                except (FileNotFoundError, FileExistsError, OSError) as e:
-                    logf(f"  ! {item.name}: {e}")
-                    continue
+            config.record_package(
+                pkg_name, "", "", new_pkg_items, path=str(local_path.resolve())
+            )
 
-                item_path = registry_path / item.component_type.registry_dir / item.name
-                new_hash = config.hash_registry_item(item_path)
-
-            new_pkg_items.append({
-                "type": item.component_type.value,
-                "name": item.name,
-                "hash": new_hash,
-            })
-
-            old_hash = old_items.get(item_key, "")
-            if not old_hash:
-                added_count += 1
-            elif old_hash != new_hash:
-                updated_count += 1
-            else:
-                unchanged_count += 1
-
-        new_keys = {(i["type"], i["name"]) for i in new_pkg_items}
-        removed_count = 0
-        for (t, n), _ in old_items.items():
-            if (t, n) in new_keys:
-                continue
-            removed_count += 1
-            if check:
-                continue
-            if prune:
-                try:
-                    ct = ComponentType(t)
-                except ValueError:
-                    logf(f"  ! malformed package item type '{t}' for {n}; skipping prune")
-                    continue
-                if registry.remove(ct, n):
-                    any_changes = True
-                logf(f"  - {n} (pruned)")
-            else:
-                logf(f"  ? {n} (removed upstream, kept locally)")
-
-        if check:
-            if added_count or updated_count or removed_count:
-                parts = []
-                if updated_count:
-                    parts.append(f"{updated_count} updated")
-                if added_count:
-                    parts.append(f"{added_count} new")
-                if removed_count:
-                    parts.append(f"{removed_count} removed upstream")
-                logf(f"  Would update: {', '.join(parts)}")
+            parts = []
+            if updated_count:
+                parts.append(f"{updated_count} updated")
+            if added_count:
+                parts.append(f"{added_count} new")
+            if parts:
+                logf(f"  {', '.join(parts)}")
                 any_changes = True
-            else:
+            elif unchanged_count and not removed_count:
                 up_to_date.append(pkg_name)
                 logf("  Up to date (local)")
-            continue
-
-        config.record_package(
-            pkg_name, "", "", new_pkg_items, path=str(local_path.resolve())
-        )
+    except BaseException:
+        # Don't leave a half-updated generation active.
+        if new_generation is not None:
+            generations.discard(
+                registry.path, new_generation, previous_generation, restore_packages=True
+            )
+        raise
 
-        parts = []
-        if updated_count:
-            parts.append(f"{updated_count} updated")
-        if added_count:
-            parts.append(f"{added_count} new")
-        if parts:
-            logf(f"  {', '.join(parts)}")
-            any_changes = True
-        elif unchanged_count and not removed_count:
-            up_to_date.append(pkg_name)
-            logf("  Up to date (local)")
+    if new_generation is not None:
+        if any_changes:
+            logf(
+                f"\nRegistry generation {new_generation} "
+                f"(hawk rollback restores {previous_generation})"
+            )
+        else:
+            generations.discard(registry.path, new_generation, previous_generation)
 
     if up_to_date:
         logf(f"\nAll packages up to date: {', '.join(up_to_date)}")
 
     if any_changes and not check and sync_on_change:
-        from .sync import sync_all
+        from .sync import find_targets_for_items, sync_targets
 
-        logf("\nSyncing...")
-        sync_all(force=True)
-        logf("Done.")
+        # Only re-sync scope/tool targets whose resolved set uses a changed item.
+        targets = find_targets_for_items(changed_items)
+        if targets:
+            logf(f"\nSyncing {len(targets)} affected target(s)...")
+            sync_targets(targets)
+            logf("Done.")
 
     report.any_changes = any_changes
     report.up_to_date = up_to_date
@@ -478,7 +541,7 @@ def remove_ungrouped_items(
 ) -> UngroupedRemoveReport:
     """Remove all package-menu ungrouped items from registry and enabled config lists."""
     logf = log or _noop
-    packages = config.load_packages()
+    package_index = config.get_package_index()
     registry = Registry(config.get_registry_path())
 
     managed_types = [
@@ -490,21 +553,6 @@ def remove_ungrouped_items(
     ]
     field_by_type = {ct: ct.registry_dir for ct in managed_types}
 
-    owned_by_field: dict[str, set[str]] = {field: set() for field in field_by_type.values()}
-    for _pkg_name, pkg_data in packages.items():
-        for item in pkg_data.get("items", []):
-            item_type = item.get("type")
-            item_name = item.get("name")
-            if not isinstance(item_type, str) or not isinstance(item_name, str):
-                continue
-            try:
-                ct = ComponentType(item_type)
-            except ValueError:
-                continue
-            field = field_by_type.get(ct)
-            if field:
-                owned_by_field[field].add(item_name)
-
     contents = registry.list()
     removed_by_type: dict[str, int] = {ct.value: 0 for ct in managed_types}
     item_names_by_field: dict[str, set[str]] = {}
@@ -512,9 +560,8 @@ def remove_ungrouped_items(
 
     for ct in managed_types:
         field = field_by_type[ct]
-        owned_names = owned_by_field.get(field, set())
         for name in contents.get(ct, []):
-            if name in owned_names:
+            if package_index.owner(ct.value, name):
                 continue
             if registry.remove(ct, name):
                 removed_total += 1
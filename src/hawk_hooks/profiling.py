@@ -0,0 +1,137 @@
+"""Lightweight sync instrumentation with Chrome trace export.
+
+Code wraps interesting phases in ``span("name", key=value)``. Spans are
+free when no profiler is active; inside ``profile()`` each one is timed
+and recorded, so ``hawk sync --profile`` can print a per-phase summary
+and write a Chrome trace-event file (open it in ``chrome://tracing`` or
+Perfetto).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+_active_profiler: contextvars.ContextVar["Profiler | None"] = contextvars.ContextVar(
+    "hawk_active_profiler", default=None
+)
+
+
+@dataclass
+class Span:
+    """One timed phase."""
+
+    name: str
+    start_ns: int
+    duration_ns: int
+    thread_id: int
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class SpanStats:
+    """Aggregate timings for all spans sharing a name."""
+
+    name: str
+    count: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count else 0.0
+
+
+@dataclass
+class Profiler:
+    """Collects spans recorded while it is active."""
+
+    spans: list[Span] = field(default_factory=list)
+    origin_ns: int = field(default_factory=time.perf_counter_ns)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, name: str, start_ns: int, duration_ns: int, args: dict[str, Any]) -> None:
+        """Record a finished span."""
+        with self._lock:
+            self.spans.append(Span(name, start_ns, duration_ns, threading.get_ident(), args))
+
+    def summary(self) -> list[SpanStats]:
+        """Per-name stats, slowest total first."""
+        stats: dict[str, SpanStats] = {}
+        for s in self.spans:
+            entry = stats.setdefault(s.name, SpanStats(s.name))
+            entry.count += 1
+            entry.total_ns += s.duration_ns
+            entry.max_ns = max(entry.max_ns, s.duration_ns)
+        return sorted(stats.values(), key=lambda e: e.total_ns, reverse=True)
+
+    def format_summary(self) -> str:
+        """Render the summary as a fixed-width table (times in ms)."""
+        rows = self.summary()
+        if not rows:
+            return "No spans recorded."
+        width = max(len("phase"), *(len(r.name) for r in rows))
+        lines = [
+            f"{'phase':<{width}}  {'calls':>7}  {'total ms':>10}  {'mean ms':>9}  {'max ms':>9}"
+        ]
+        for r in rows:
+            lines.append(
+                f"{r.name:<{width}}  {r.count:>7}  {r.total_ns / 1e6:>10.2f}  "
+                f"{r.mean_ns / 1e6:>9.3f}  {r.max_ns / 1e6:>9.3f}"
+            )
+        return "\n".join(lines)
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Build a Chrome trace-event document (complete ``X`` events)."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": s.name,
+                "cat": "hawk",
+                "ph": "X",
+                "ts": (s.start_ns - self.origin_ns) / 1000,
+                "dur": s.duration_ns / 1000,
+                "pid": pid,
+                "tid": s.thread_id,
+                "args": {k: str(v) for k, v in s.args.items()},
+            }
+            for s in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Path) -> None:
+        """Write the Chrome trace-event JSON to *path*."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_chrome_trace()) + "\n")
+
+
+@contextlib.contextmanager
+def profile() -> Iterator[Profiler]:
+    """Record spans from this block into a new :class:`Profiler`."""
+    profiler = Profiler()
+    token = _active_profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _active_profiler.reset(token)
+
+
+@contextlib.contextmanager
+def span(name: str, **args: Any) -> Iterator[None]:
+    """Time the enclosed block as *name* when a profiler is active."""
+    profiler = _active_profiler.get()
+    if profiler is None:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        profiler.add(name, start, time.perf_counter_ns() - start, args)
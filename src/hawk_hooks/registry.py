@@ -1,16 +1,96 @@
 """Component registry for hawk-hooks v2.
 
 Manages the registry directory (~/.config/hawk-hooks/registry/) containing
-skills, hooks, commands, agents, MCP configs, and prompts.
+skills, hooks, commands, agents, MCP configs, and prompts. Registries with
+an object store (see ``object_store.py``, enabled by ``hawk dedupe``) keep
+item files as hardlinks to shared content-addressed blobs.
+
+Items from a package that clash with an existing name are stored in the
+package's namespace, flat, as ``<namespace>--<name>``::
+
+    registry/agents/
+      code-reviewer.md                  # ungrouped
+      superpowers--code-reviewer.md     # superpowers/code-reviewer.md
+
+A ``<namespace>--`` prefix only counts when it names an installed package;
+other names containing ``--`` are plain items.
+
+Config and CLI may refer to items by registry name, by ``namespace/name``,
+or by bare name (the ungrouped item, else the only namespaced one). MCP
+references may omit the file extension. :class:`NameIndex` maps all of
+these to registry names with dict lookups.
 """
 
 from __future__ import annotations
 
+import filecmp
+import os
 import shutil
+import stat
+import time
 from pathlib import Path
+from typing import Collection
+
+from .object_store import ObjectStore, detach, objects_dir_for
+from .types import RESOLVED_FIELDS, ComponentType, ResolvedSet
+from . import config, registry_index, search_index
+
+NAMESPACE_SEP = "--"
+
+_MCP_SUFFIXES = (".yaml", ".yml", ".json")
+
+# Name indexes of type dirs modified this recently are not cached: another
+# process could change a dir within the same mtime tick.
+_RACY_WINDOW_NS = 2_000_000_000
+
+# {registry path: (type dir stamps, known namespaces, index)}
+_name_indexes: dict[str, tuple[tuple, frozenset[str], "NameIndex"]] = {}
+
+
+def package_namespace(package_name: str) -> str:
+    """Namespace of a package's items: last segment, "obra/superpowers" -> "superpowers"."""
+    return package_name.split("/")[-1]
+
+
+def known_namespaces() -> frozenset[str]:
+    """Namespaces of the packages in packages.yaml."""
+    return frozenset(package_namespace(p) for p in config.get_package_index().items)
+
+
+def qualified_name(namespace: str, name: str) -> str:
+    """Registry name of *name* in *namespace*: 'superpowers--code-reviewer.md'."""
+    return f"{namespace}{NAMESPACE_SEP}{name}"
 
-from .types import ComponentType
-from . import config
+
+def split_name(name: str, namespaces: Collection[str]) -> tuple[str | None, str]:
+    """Split a registry name into (namespace or None, name).
+
+    Only a prefix that is one of *namespaces* counts, so a plain item that
+    merely contains the separator (``pre--commit.sh``) stays unsplit.
+    """
+    pos = name.find(NAMESPACE_SEP)
+    while pos != -1:
+        namespace, base = name[:pos], name[pos + len(NAMESPACE_SEP):]
+        if namespace and base and namespace in namespaces:
+            return namespace, base
+        pos = name.find(NAMESPACE_SEP, pos + 1)
+    return None, name
+
+
+def _unchanged(src: Path, prev: Path) -> bool:
+    """Whether file *prev* already holds the content (and mode) of *src*."""
+    try:
+        sst = os.stat(src)
+        pst = os.stat(prev, follow_symlinks=False)
+    except OSError:
+        return False
+    if not stat.S_ISREG(pst.st_mode) or sst.st_size != pst.st_size:
+        return False
+    if (sst.st_mode & 0o111) != (pst.st_mode & 0o111):
+        return False
+    if sst.st_mtime_ns == pst.st_mtime_ns:
+        return True
+    return filecmp.cmp(src, prev, shallow=False)
 
 
 def _validate_name(name: str) -> None:
@@ -31,6 +111,88 @@ def _validate_name(name: str) -> None:
         raise ValueError(f"Invalid component name (control chars): {name!r}")
 
 
+class NameIndex:
+    """Maps item references to registry names, built from one listing.
+
+    Exact registry names win, then MCP names without extension, then
+    ``namespace/name``, then bare names that identify a single item.
+    Only *namespaces* (see :func:`known_namespaces`) are recognized.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        listing: dict[str, list[str]],
+        namespaces: Collection[str] = frozenset(),
+    ):
+        self.root = root
+        names: dict[tuple[str, str], str] = {}
+        # (priority, ref key, name); MCP stems prefer .yaml, .yml, .json.
+        aliases: list[tuple[int, tuple[str, str], str]] = []
+        bare: dict[tuple[str, str], list[str]] = {}
+        for type_dir, entries in listing.items():
+            for name in entries:
+                names[(type_dir, name)] = name
+                namespace, base = split_name(name, namespaces)
+                refs = [base]
+                rank = 0
+                if type_dir == "mcp" and name.endswith(_MCP_SUFFIXES):
+                    stem, suffix = name.rsplit(".", 1)
+                    rank = _MCP_SUFFIXES.index(f".{suffix}")
+                    aliases.append((rank, (type_dir, stem), name))
+                    refs.append(base.rsplit(".", 1)[0])
+                if namespace is not None:
+                    for ref in refs:
+                        aliases.append((3 + rank, (type_dir, f"{namespace}/{ref}"), name))
+                        bare.setdefault((type_dir, ref), []).append(name)
+        for _rank, key, name in sorted(aliases, key=lambda a: a[0]):
+            names.setdefault(key, name)
+        for key, candidates in bare.items():
+            if len(candidates) == 1:
+                names.setdefault(key, candidates[0])
+        self._names = names
+
+    def resolve(self, type_dir: str, ref: str) -> str | None:
+        """Registry name for *ref* in *type_dir*, or None if nothing matches."""
+        return self._names.get((type_dir, ref))
+
+    def path(self, type_dir: str, ref: str) -> Path | None:
+        """Path of the item *ref* refers to, or None."""
+        name = self._names.get((type_dir, ref))
+        return None if name is None else self.root / type_dir / name
+
+    def qualify(self, resolved: ResolvedSet) -> ResolvedSet:
+        """Return *resolved* with references replaced by registry names.
+
+        Unknown references are kept as they are, so callers still report
+        them as missing.
+        """
+        lists = {}
+        for field_name in RESOLVED_FIELDS:
+            seen: dict[str, None] = {}
+            for ref in getattr(resolved, field_name):
+                seen.setdefault(self._names.get((field_name, ref), ref))
+            lists[field_name] = list(seen)
+        return ResolvedSet(**lists)
+
+
+def _type_dir_stamps(root: Path) -> tuple:
+    stamps = []
+    for ct in ComponentType:
+        try:
+            st = os.stat(root / ct.registry_dir)
+        except OSError:
+            stamps.append(None)
+            continue
+        stamps.append((st.st_ino, st.st_mtime_ns))
+    return tuple(stamps)
+
+
+def forget_names(registry_path: Path) -> None:
+    """Drop the cached name index of a registry."""
+    _name_indexes.pop(str(registry_path), None)
+
+
 class Registry:
     """Manages the hawk-hooks component registry."""
 
@@ -49,6 +211,32 @@ class Registry:
         """Get the directory for a component type."""
         return self.path / component_type.registry_dir
 
+    def _object_store(self) -> ObjectStore | None:
+        """The registry's object store, or None if it does not use one."""
+        store = ObjectStore(objects_dir_for(self.path))
+        return store if store.exists() else None
+
+    def _copy_in(self, source: Path, dest: Path) -> None:
+        store = self._object_store()
+        if store is not None:
+            store.materialize(source, dest)
+        elif source.is_dir():
+            shutil.copytree(source, dest)
+        else:
+            shutil.copy2(source, dest)
+
+    def _delete(self, path: Path) -> None:
+        """Delete an item (or temp item), dropping blobs only it used."""
+        registry_index.forget(path)
+        store = self._object_store()
+        inodes = store.blob_inodes_in(path) if store is not None else set()
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+        if inodes:
+            store.release(inodes)
+
     def ensure_dirs(self) -> None:
         """Ensure all registry subdirectories exist."""
         for ct in ComponentType:
@@ -81,11 +269,9 @@ class Registry:
         if dest.exists():
             raise FileExistsError(f"Already exists in registry: {component_type}/{name}")
 
-        if source.is_dir():
-            shutil.copytree(source, dest)
-        else:
-            shutil.copy2(source, dest)
-
+        self._copy_in(source, dest)
+        forget_names(self.path)
+        search_index.update(dest)
         return dest
 
     def remove(self, component_type: ComponentType, name: str) -> bool:
@@ -98,17 +284,29 @@ class Registry:
         if not dest.exists():
             return False
 
-        if dest.is_dir():
-            shutil.rmtree(dest)
-        else:
-            dest.unlink()
+        self._delete(dest)
+        forget_names(self.path)
+        search_index.update(dest)
         return True
 
-    def replace(self, component_type: ComponentType, name: str, source: Path) -> Path:
+    def replace(
+        self,
+        component_type: ComponentType,
+        name: str,
+        source: Path,
+        *,
+        delta: bool = True,
+    ) -> Path:
         """Atomically replace a component in the registry.
 
-        Copies new source to a temp location first, then removes old and
-        renames new into place. If the copy fails, the old item is preserved.
+        Builds the new version in a temp location first, then swaps it into
+        place with renames and removes the old one. If the copy fails, the
+        old item is preserved.
+
+        With *delta* (the default), replacing a directory with a directory
+        only copies files that changed; unchanged files are hardlinked from
+        the old version, so updating a large skill costs in proportion to
+        the change.
 
         Returns:
             Path to the component in the registry.
@@ -129,31 +327,101 @@ class Registry:
         tmp_dest = type_dir / f".{name}.hawk_tmp"
         try:
             if tmp_dest.exists():
-                if tmp_dest.is_dir():
-                    shutil.rmtree(tmp_dest)
-                else:
-                    tmp_dest.unlink()
-            if source.is_dir():
-                shutil.copytree(source, tmp_dest)
+                self._delete(tmp_dest)
+            if delta and source.is_dir() and dest.is_dir() and not dest.is_symlink():
+                self._stage_delta(source, dest, tmp_dest)
             else:
-                shutil.copy2(source, tmp_dest)
+                self._copy_in(source, tmp_dest)
         except Exception:
             # Clean up temp on failure, preserve original
             if tmp_dest.exists():
-                if tmp_dest.is_dir():
-                    shutil.rmtree(tmp_dest)
-                else:
-                    tmp_dest.unlink()
+                self._delete(tmp_dest)
             raise
 
-        # Now safe to remove old and rename new
-        if dest.is_dir():
-            shutil.rmtree(dest)
-        else:
-            dest.unlink()
+        # Swap: move old aside, rename new into place, then delete old.
+        old_dest = type_dir / f".{name}.hawk_old"
+        if old_dest.exists():
+            self._delete(old_dest)
+        dest.rename(old_dest)
         tmp_dest.rename(dest)
+        self._delete(old_dest)
+        registry_index.forget(dest)
+        search_index.update(dest)
         return dest
 
+    def _stage_delta(self, source: Path, old: Path, staging: Path) -> tuple[int, int]:
+        """Build *staging* from *source*, reusing unchanged files of *old*.
+
+        A file is unchanged when its size matches and either its mtime
+        matches or its bytes compare equal.
+
+        Returns:
+            (files copied, files linked from *old*).
+        """
+        store = self._object_store()
+        copied = linked = 0
+        staging.mkdir()
+        for dirpath, dirnames, filenames in os.walk(source, followlinks=True):
+            rel = Path(dirpath).relative_to(source)
+            for d in dirnames:
+                (staging / rel / d).mkdir(exist_ok=True)
+            for fname in filenames:
+                src = Path(dirpath) / fname
+                prev = old / rel / fname
+                dst = staging / rel / fname
+                if _unchanged(src, prev):
+                    try:
+                        os.link(prev, dst)
+                        linked += 1
+                        continue
+                    except OSError:
+                        pass
+                if store is not None:
+                    store.link(src, dst)
+                else:
+                    shutil.copy2(src, dst)
+                copied += 1
+        return copied, linked
+
+    def dedupe(self) -> tuple[int, int]:
+        """Move every item's files into the object store, creating it if needed.
+
+        Later adds and replaces then go through the store as well. Blobs
+        no item links to any more are deleted.
+
+        Returns:
+            (files linked, bytes saved by sharing identical files).
+        """
+        store = ObjectStore(objects_dir_for(self.path))
+        store.create()
+        linked = saved = 0
+        for ct, name in self.list_flat():
+            n, b = store.adopt(self._type_dir(ct) / name)
+            linked += n
+            saved += b
+        store.collect_garbage()
+        return linked, saved
+
+    def detach(self, path: Path) -> int:
+        """Give registry files under *path* private, writable copies.
+
+        Call before writing registry files in place: a file hardlinked to a
+        shared blob would otherwise change every item using that blob.
+        Paths outside the registry are left alone.
+
+        Returns:
+            Number of files copied.
+        """
+        path = Path(os.path.abspath(path))
+        roots = {Path(os.path.abspath(self.path)), Path(os.path.realpath(self.path))}
+        if not any(path.is_relative_to(root) for root in roots):
+            return 0
+        inodes = detach(path)
+        store = self._object_store()
+        if inodes and store is not None:
+            store.release(inodes)
+        return len(inodes)
+
     def has(self, component_type: ComponentType, name: str) -> bool:
         """Check if a component exists in the registry."""
         _validate_name(name)
@@ -208,7 +476,27 @@ class Registry:
                 result.append((ct, name))
         return result
 
+    def names(self) -> NameIndex:
+        """The registry's name index, rebuilt when type dirs or packages change."""
+        key = str(self.path)
+        stamps = _type_dir_stamps(self.path)
+        namespaces = known_namespaces()
+        cached = _name_indexes.get(key)
+        if cached is not None and cached[0] == stamps and cached[1] == namespaces:
+            return cached[2]
+        listing = {ct.registry_dir: names for ct, names in self.list().items()}
+        index = NameIndex(self.path, listing, namespaces)
+        newest = max((s[1] for s in stamps if s is not None), default=0)
+        if time.time_ns() - newest > _RACY_WINDOW_NS:
+            _name_indexes[key] = (stamps, namespaces, index)
+        return index
+
+    def resolve(self, component_type: ComponentType, ref: str) -> str | None:
+        """Registry name of the item *ref* refers to, or None."""
+        return self.names().resolve(component_type.registry_dir, ref)
+
     def has_from_name(self, type_dir: str, name: str) -> bool:
-        """Check if a name exists in a registry subdirectory by dir name."""
-        _validate_name(name)
-        return (self.path / type_dir / name).exists()
+        """Check if a reference resolves in a registry subdirectory by dir name."""
+        for part in name.split("/", 1):
+            _validate_name(part)
+        return self.names().resolve(type_dir, name) is not None
@@ -0,0 +1,167 @@
+"""Persistent index of metadata derived from registry items.
+
+Listing and syncing the registry needs facts that live inside item files:
+hook headers (events, deps, env, timeout), descriptions from frontmatter,
+MCP server YAML and content hashes. This module keeps them in
+``<config_dir>/cache/registry-index.json`` keyed by item path, each entry
+tagged with the item's stat stamp (for directories, a digest of every
+file's stat), so a lookup costs a stat instead of a read and parse.
+
+Entries are validated lazily on every lookup; ``Registry`` also drops them
+when an item is replaced or removed. Values must be JSON-serializable.
+Changes are written back once per process (at exit, or via ``flush()``).
+"""
+
+from __future__ import annotations
+
+import atexit
+import copy
+import dataclasses
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from . import config
+from .hook_meta import HookMeta, parse_hook_meta
+
+_INDEX_VERSION = 1
+
+# Items modified this recently are not indexed: a rewrite within the same
+# mtime tick could otherwise keep an identical stamp.
+_RACY_WINDOW_NS = 2_000_000_000
+
+_lock = threading.Lock()
+# (index path, {item path: {"stamp": ..., kind: value}}) for the config dir.
+_state: tuple[str, dict[str, dict[str, Any]]] | None = None
+_dirty = False
+
+
+def get_index_path() -> Path:
+    """Get the registry metadata index path."""
+    return config.get_config_dir() / "cache" / "registry-index.json"
+
+
+def item_stamp(path: Path) -> tuple[str, int] | None:
+    """Return (stamp, newest mtime_ns) for a file or directory item."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not path.is_dir():
+        return f"{st.st_mtime_ns}:{st.st_size}:{st.st_ino}", st.st_mtime_ns
+    h = hashlib.blake2b(digest_size=16)
+    newest = st.st_mtime_ns
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        for name in sorted(filenames):
+            full = os.path.join(dirpath, name)
+            try:
+                fst = os.stat(full)
+            except OSError:
+                continue
+            newest = max(newest, fst.st_mtime_ns)
+            rel = os.path.relpath(full, path)
+            h.update(f"{rel}\0{fst.st_mtime_ns}:{fst.st_size}:{fst.st_ino}\n".encode())
+    return "d:" + h.hexdigest(), newest
+
+
+def _entries() -> dict[str, dict[str, Any]]:
+    """Entries for the current config dir (caller holds ``_lock``)."""
+    global _state
+    index_path = get_index_path()
+    if _state is not None and _state[0] == str(index_path):
+        return _state[1]
+    _flush_locked()
+    entries: dict[str, dict[str, Any]] = {}
+    try:
+        raw = json.loads(index_path.read_bytes())
+        if raw.get("version") == _INDEX_VERSION and isinstance(raw.get("entries"), dict):
+            entries = raw["entries"]
+    except (OSError, ValueError, AttributeError):
+        entries = {}
+    _state = (str(index_path), entries)
+    return entries
+
+
+def lookup(path: Path, kind: str, compute: Callable[[], Any]) -> Any:
+    """Return the *kind* metadata of the item at *path*, computing it on a miss.
+
+    Returns a private copy the caller may mutate.
+    """
+    global _dirty
+    key = str(path)
+    stamped = item_stamp(path)
+    if stamped is None:
+        return compute()
+    stamp, newest = stamped
+    with _lock:
+        entry = _entries().get(key)
+        if entry is not None and entry.get("stamp") == stamp and kind in entry:
+            return copy.deepcopy(entry[kind])
+
+    value = compute()
+    if time.time_ns() - newest <= _RACY_WINDOW_NS:
+        return value
+    with _lock:
+        entries = _entries()
+        entry = entries.get(key)
+        if entry is None or entry.get("stamp") != stamp:
+            entry = entries[key] = {"stamp": stamp}
+        entry[kind] = copy.deepcopy(value)
+        _dirty = True
+    return value
+
+
+def forget(path: Path) -> None:
+    """Drop the entries for *path* and anything below it."""
+    global _dirty
+    key = str(path)
+    prefix = key + os.sep
+    with _lock:
+        entries = _entries()
+        stale = [k for k in entries if k == key or k.startswith(prefix)]
+        for k in stale:
+            del entries[k]
+        if stale:
+            _dirty = True
+
+
+def hook_meta(path: Path) -> HookMeta:
+    """Indexed :func:`parse_hook_meta`."""
+    data = lookup(path, "hook", lambda: dataclasses.asdict(parse_hook_meta(path)))
+    return HookMeta(**data)
+
+
+def content_hash(path: Path) -> str:
+    """Indexed :func:`config.hash_registry_item`."""
+    return lookup(path, "hash", lambda: config.hash_registry_item(path))
+
+
+def _flush_locked() -> None:
+    global _dirty
+    if not _dirty or _state is None:
+        return
+    _dirty = False
+    payload = {"version": _INDEX_VERSION, "entries": _state[1]}
+    config.write_cache_json(Path(_state[0]), payload)
+
+
+def flush() -> None:
+    """Write pending index changes to disk."""
+    with _lock:
+        _flush_locked()
+
+
+def clear_cache() -> None:
+    """Flush, then forget the in-memory copy of the index."""
+    global _state
+    with _lock:
+        _flush_locked()
+        _state = None
+
+
+atexit.register(flush)
@@ -7,7 +7,12 @@ Supports both single dir_config (backward compat) and dir_chain (hierarchical).
 
 from __future__ import annotations
 
-from typing import Any
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import fields
+from typing import Any, Callable
 
 from .types import ComponentType, ResolvedSet, Tool
 
@@ -107,10 +112,52 @@ def resolve(
     Returns:
         ResolvedSet with the final lists.
     """
-    # Start from global
-    global_section = global_config.get("global", {})
+    steps: list[tuple[Any, Callable[[ResolvedSet], None]]] = []
+    if dir_chain is not None:
+        # Hierarchical resolution: iterate layers outermost → innermost
+        for layer_config, layer_profile in dir_chain:
+            if layer_profile:
+                steps.append(_profile_step(layer_profile))
+            steps.append(_dir_step(layer_config, tool))
+    else:
+        # Backward compat: single profile + dir_config
+        if profile:
+            steps.append(_profile_step(profile))
+        if dir_config:
+            steps.append(_dir_step(dir_config, tool))
+
+    return _resolve_layers(global_config.get("global", {}), steps)
+
 
-    result = ResolvedSet(
+def apply_layer(
+    resolved: ResolvedSet,
+    dir_config: dict[str, Any],
+    profile: dict[str, Any] | None = None,
+    tool: Tool | None = None,
+) -> ResolvedSet:
+    """Return *resolved* with one ``(dir_config, profile)`` chain layer applied.
+
+    Equivalent to extending a ``dir_chain`` by one layer; *resolved* is
+    left untouched. Used to resolve directory trees incrementally.
+    """
+    result = _copy_set(resolved)
+    if profile:
+        _apply_profile(result, profile)
+    _apply_dir_config(result, dir_config, tool)
+    return result
+
+
+def layer_tool_overrides(dir_config: dict[str, Any]) -> set[str]:
+    """Names of tools with per-tool overrides in a dir config layer."""
+    tools_section = dir_config.get("tools")
+    if not isinstance(tools_section, dict):
+        return set()
+    return {str(name) for name in tools_section}
+
+
+def _base_set(global_section: dict[str, Any]) -> ResolvedSet:
+    """Resolved set for the global layer alone."""
+    return ResolvedSet(
         skills=_as_list(global_section.get("skills", [])),
         hooks=_as_list(global_section.get("hooks", [])),
         agents=_as_list(global_section.get("agents", [])),
@@ -122,20 +169,92 @@ def resolve(
         ),
     )
 
-    if dir_chain is not None:
-        # Hierarchical resolution: iterate layers outermost → innermost
-        for layer_config, layer_profile in dir_chain:
-            if layer_profile:
-                _apply_profile(result, layer_profile)
-            _apply_dir_config(result, layer_config, tool)
-    else:
-        # Backward compat: single profile + dir_config
-        if profile:
-            _apply_profile(result, profile)
-        if dir_config:
-            _apply_dir_config(result, dir_config, tool)
 
-    return result
+def _profile_step(profile: dict[str, Any]) -> tuple[Any, Callable[[ResolvedSet], None]]:
+    return ("profile", profile), lambda result: _apply_profile(result, profile)
+
+
+def _dir_step(
+    dir_config: dict[str, Any], tool: Tool | None
+) -> tuple[Any, Callable[[ResolvedSet], None]]:
+    # Only key on the tool when this layer has overrides for it, so layers
+    # without per-tool sections are shared by every tool.
+    tool_key = None
+    if tool is not None and str(tool) in layer_tool_overrides(dir_config):
+        tool_key = str(tool)
+    return ("dir", dir_config, tool_key), lambda result: _apply_dir_config(result, dir_config, tool)
+
+
+# ── Prefix memo ──
+#
+# Maps a digest of (global section, layer 1, ..., layer k) to the resolved
+# set after layer k. Resolving a chain re-uses the longest memoized prefix,
+# so sibling projects share their parents' merges and a changed leaf only
+# re-applies its own layer. Keys are content hashes, so edits to any layer
+# naturally miss.
+
+_MEMO_MAX = 4096
+_memo: OrderedDict[str, ResolvedSet] = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def _digest(prev: str, layer: Any) -> str | None:
+    try:
+        payload = json.dumps(layer, sort_keys=True, separators=(",", ":"), default=str)
+    except (TypeError, ValueError):
+        # e.g. mixed-type YAML keys; resolve this chain without the memo.
+        return None
+    return hashlib.blake2b(f"{prev}\0{payload}".encode(), digest_size=16).hexdigest()
+
+
+def _copy_set(resolved: ResolvedSet) -> ResolvedSet:
+    return ResolvedSet(**{f.name: list(getattr(resolved, f.name)) for f in fields(ResolvedSet)})
+
+
+def _memo_get(key: str) -> ResolvedSet | None:
+    with _memo_lock:
+        resolved = _memo.get(key)
+        if resolved is not None:
+            _memo.move_to_end(key)
+        return resolved
+
+
+def _memo_put(key: str, resolved: ResolvedSet) -> None:
+    with _memo_lock:
+        _memo[key] = resolved
+        if len(_memo) > _MEMO_MAX:
+            _memo.popitem(last=False)
+
+
+def _resolve_layers(
+    global_section: dict[str, Any],
+    steps: list[tuple[Any, Callable[[ResolvedSet], None]]],
+) -> ResolvedSet:
+    key = _digest("", ("global", global_section))
+    result = _memo_get(key) if key is not None else None
+    if result is None:
+        result = _base_set(global_section)
+        if key is not None:
+            _memo_put(key, result)
+
+    for layer, apply in steps:
+        next_key = _digest(key, layer) if key is not None else None
+        cached = _memo_get(next_key) if next_key is not None else None
+        if cached is None:
+            cached = _copy_set(result)
+            apply(cached)
+            if next_key is not None:
+                _memo_put(next_key, cached)
+        result, key = cached, next_key
+
+    # Memo entries are shared; hand the caller its own lists.
+    return _copy_set(result)
+
+
+def clear_cache() -> None:
+    """Drop memoized resolution results."""
+    with _memo_lock:
+        _memo.clear()
 
 
 def _merge_legacy_sections(legacy: Any, current: Any) -> dict[str, list[str]]:
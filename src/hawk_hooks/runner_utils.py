@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-import os
 import shutil
 import stat
-import tempfile
 from pathlib import Path
 
+from .fileio import write_text_if_changed
+
 
 def _get_interpreter_path(interpreter: str) -> str:
     """Get an absolute interpreter path.
@@ -36,26 +36,8 @@ def _get_interpreter_path(interpreter: str) -> str:
 
 
 def _atomic_write_executable(path: Path, content: str) -> None:
-    """Write content atomically and set executable owner-only permissions."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-
-    original_umask = os.umask(0o077)
-    fd = None
-    tmp_path = None
-    try:
-        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
-        os.write(fd, content.encode("utf-8"))
-        os.fchmod(fd, stat.S_IRWXU)
-        os.close(fd)
-        fd = None
-        os.rename(tmp_path, path)
-        tmp_path = None
-    except (OSError, IOError):
-        if fd is not None:
-            os.close(fd)
-        if tmp_path is not None and os.path.exists(tmp_path):
-            os.unlink(tmp_path)
-        raise
-    finally:
-        os.umask(original_umask)
+    """Write content atomically and set executable owner-only permissions.
 
+    Skips the write when the runner already has identical content and mode.
+    """
+    write_text_if_changed(path, content, mode=stat.S_IRWXU)
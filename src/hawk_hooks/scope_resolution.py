@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 from . import config
+from .resolver import apply_layer, layer_tool_overrides, resolve
+from .types import ResolvedSet, Tool
 
 
 def resolve_profile_name_for_dir(
@@ -45,7 +48,7 @@ def build_config_layers_with_profiles(
         cfg = config.load_global_config()
 
     layers: list[tuple[Path, dict[str, Any], dict[str, Any] | None]] = []
-    for chain_dir, chain_config in config.get_config_chain(project_dir):
+    for chain_dir, chain_config in config.get_config_chain(project_dir, cfg=cfg):
         profile_name = resolve_profile_name_for_dir(chain_config, chain_dir, cfg)
         profile = config.load_profile(profile_name) if profile_name else None
         layers.append((chain_dir, chain_config, profile))
@@ -80,3 +83,134 @@ def build_resolver_dir_chain(
 
     layers = build_config_layers_with_profiles(project_dir, cfg=cfg)
     return [(dir_config, profile) for _d, dir_config, profile in layers]
+
+
+@dataclass(eq=False)
+class _ChainNode:
+    """Resolution state after one directory layer of a chain."""
+
+    path: Path | None
+    parent: "_ChainNode | None"
+    dir_config: dict[str, Any]
+    profile: dict[str, Any] | None
+    resolved: ResolvedSet
+    override_tools: frozenset[str]
+
+
+class _TreeResolver:
+    """Resolve directories incrementally over the registered-directory tree.
+
+    Each registered directory's layer is loaded and merged once; every
+    descendant starts from its nearest registered ancestor's result.
+    Per-tool results are only computed for chains that actually carry
+    overrides for that tool; all other tools share the tool-agnostic set.
+    """
+
+    def __init__(self, cfg: dict[str, Any]):
+        self.cfg = cfg
+        self.dirs = config._dir_key_index(cfg.get("directories", {}))
+        self.root = _ChainNode(None, None, {}, None, resolve(cfg), frozenset())
+        self._nodes: dict[Path, _ChainNode] = {}
+        self._profiles: dict[str, dict[str, Any] | None] = {}
+        self._tool_results: dict[tuple[_ChainNode, str], ResolvedSet] = {}
+
+    def _profile(self, dir_config: dict[str, Any], directory: Path) -> dict[str, Any] | None:
+        name = resolve_profile_name_for_dir(dir_config, directory, self.cfg)
+        if not name:
+            return None
+        if name not in self._profiles:
+            self._profiles[name] = config.load_profile(name)
+        return self._profiles[name]
+
+    def _extend(
+        self, parent: _ChainNode, directory: Path, dir_config: dict[str, Any]
+    ) -> _ChainNode:
+        profile = self._profile(dir_config, directory)
+        return _ChainNode(
+            path=directory,
+            parent=parent,
+            dir_config=dir_config,
+            profile=profile,
+            resolved=apply_layer(parent.resolved, dir_config, profile),
+            override_tools=parent.override_tools | layer_tool_overrides(dir_config),
+        )
+
+    def _node(self, directory: Path) -> _ChainNode:
+        """Node for the registered chain ending at or above *directory*."""
+        pending: list[Path] = []
+        node = self.root
+        for ancestor in (directory, *directory.parents):
+            cached = self._nodes.get(ancestor)
+            if cached is not None:
+                node = cached
+                break
+            pending.append(ancestor)
+
+        for path in reversed(pending):
+            if str(path) in self.dirs:
+                dir_config = config.load_dir_config(path)
+                if dir_config is not None:
+                    node = self._extend(node, path, dir_config)
+            self._nodes[path] = node
+        return node
+
+    def scope_node(self, project_dir: Path) -> _ChainNode:
+        """Node for *project_dir*, mirroring ``build_config_layers_with_profiles``."""
+        resolved_dir = project_dir.resolve()
+        node = self._node(resolved_dir)
+        if node.path == resolved_dir:
+            return node
+        # Unregistered leaf with its own local config.
+        dir_config = config.load_dir_config(resolved_dir)
+        if dir_config is None:
+            return node
+        return self._extend(node, resolved_dir, dir_config)
+
+    def for_tool(self, node: _ChainNode, tool: Tool) -> ResolvedSet:
+        """Resolved set of *node* with per-tool overrides for *tool* applied."""
+        if str(tool) not in node.override_tools or node.parent is None:
+            return node.resolved
+        key = (node, str(tool))
+        cached = self._tool_results.get(key)
+        if cached is None:
+            cached = apply_layer(
+                self.for_tool(node.parent, tool), node.dir_config, node.profile, tool
+            )
+            self._tool_results[key] = cached
+        return cached
+
+
+def resolve_many(
+    cfg: dict[str, Any],
+    scopes: Iterable[Path | None],
+    tools: Iterable[Tool],
+) -> dict[tuple[str, Tool], ResolvedSet]:
+    """Resolve every scope × tool pair in one pass over the directory tree.
+
+    Gives the same result as calling ``resolve`` with each scope's
+    ``build_resolver_dir_chain`` per tool, but shares parents' merges with
+    their children and only re-resolves per tool where overrides exist.
+
+    Args:
+        cfg: Loaded global config.
+        scopes: Project directories; ``None`` stands for the global scope.
+        tools: Tools to resolve for.
+
+    Returns:
+        Mapping of ``(scope_key, tool)`` to its resolved set, where
+        ``scope_key`` is ``"global"`` or the resolved directory path.
+        Sets may be shared between entries; treat them as read-only.
+    """
+    tree = _TreeResolver(cfg)
+    tool_list = list(tools)
+    results: dict[tuple[str, Tool], ResolvedSet] = {}
+    for scope in scopes:
+        if scope is None:
+            for tool in tool_list:
+                results[("global", tool)] = tree.root.resolved
+            continue
+        node = tree.scope_node(scope)
+        scope_key = str(scope.resolve())
+        for tool in tool_list:
+            results[(scope_key, tool)] = tree.for_tool(node, tool)
+    return results
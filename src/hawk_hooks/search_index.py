@@ -0,0 +1,466 @@
+"""Full-text search over registry contents.
+
+An inverted index of item names, frontmatter descriptions and body text,
+kept in ``<config_dir>/cache/search-index.json`` and ranked with BM25.
+Each indexed item carries the stat stamp from :mod:`registry_index`, so
+:func:`refresh` only re-reads items that changed since they were indexed;
+it runs once per process before the first query. ``Registry`` keeps an
+already loaded index current as items are added, replaced or removed, so
+later queries in the same process (e.g. the TUI filter, on every
+keystroke) are pure in-memory lookups.
+"""
+
+from __future__ import annotations
+
+import atexit
+import bisect
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from . import config
+from .registry_index import item_stamp
+from .types import ComponentType
+
+_INDEX_VERSION = 1
+
+# Items modified this recently are re-read on the next refresh.
+_RACY_WINDOW_NS = 2_000_000_000
+
+# BM25 parameters (the usual defaults).
+_K1 = 1.2
+_B = 0.75
+
+# Extra weight of name and description terms over body terms.
+_NAME_WEIGHT = 3
+_DESCRIPTION_WEIGHT = 2
+
+# Bytes read per file and per item; frontmatter and the first sections
+# are what identify an item.
+_MAX_FILE_BYTES = 64 * 1024
+_MAX_ITEM_BYTES = 256 * 1024
+
+# Read first in directory items: they describe the item.
+_LEAD_FILES = ("SKILL.md", "README.md")
+
+# Prefix expansion limit for the last query term.
+_MAX_PREFIX_TERMS = 64
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_DESCRIPTION_RE = re.compile(r"^description:\s*[\"']?(.+?)[\"']?\s*$", re.MULTILINE)
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from how in is it of on or that the this to "
+    "use when with you your".split()
+)
+
+_TYPES_BY_DIR = {ct.registry_dir: ct for ct in ComponentType}
+
+
+@dataclass
+class SearchHit:
+    """A ranked search result."""
+
+    component_type: ComponentType
+    name: str
+    score: float
+
+
+@dataclass
+class _Index:
+    """Inverted index with integer document ids.
+
+    Removing a document only tombstones it (``docs[id] = None``); its
+    postings are skipped at query time and dropped by :meth:`compact`.
+    Postings are stored as ``"id,tf,id,tf"`` strings and decoded on first
+    use, so loading the index does not parse terms no query touches.
+    """
+
+    registry: str
+    # id -> [key ("skills/name"), stamp, length], or None once removed
+    docs: list[list[Any] | None] = field(default_factory=list)
+    # term -> [id, tf, id, tf, ...], or the same still encoded as a string
+    postings: dict[str, list[int] | str] = field(default_factory=dict)
+    ids: dict[str, int] = field(default_factory=dict)
+    total_len: int = 0
+    _vocab: list[str] | None = None
+
+    def posting(self, term: str) -> list[int] | None:
+        posting = self.postings.get(term)
+        if isinstance(posting, str):
+            posting = self.postings[term] = [int(x) for x in posting.split(",")]
+        return posting
+
+    def encoded_postings(self) -> dict[str, str]:
+        return {
+            term: p if isinstance(p, str) else ",".join(map(str, p))
+            for term, p in self.postings.items()
+        }
+
+    def stamp(self, key: str) -> str | None:
+        doc_id = self.ids.get(key)
+        return None if doc_id is None else self.docs[doc_id][1]
+
+    def remove(self, key: str) -> None:
+        doc_id = self.ids.pop(key, None)
+        if doc_id is None:
+            return
+        self.total_len -= self.docs[doc_id][2]
+        self.docs[doc_id] = None
+
+    def put(self, key: str, stamp: str, counts: Counter[str]) -> None:
+        self.remove(key)
+        doc_id = len(self.docs)
+        length = sum(counts.values())
+        self.docs.append([key, stamp, length])
+        self.ids[key] = doc_id
+        self.total_len += length
+        for term, tf in counts.items():
+            posting = self.posting(term)
+            if posting is None:
+                posting = self.postings[term] = []
+                self._vocab = None
+            posting += (doc_id, tf)
+
+    def compact(self) -> None:
+        """Drop removed documents and renumber the rest."""
+        if len(self.docs) == len(self.ids):
+            return
+        remap: dict[int, int] = {}
+        docs: list[list[Any] | None] = []
+        for old_id, doc in enumerate(self.docs):
+            if doc is not None:
+                remap[old_id] = len(docs)
+                docs.append(doc)
+        postings: dict[str, list[int] | str] = {}
+        for term in self.postings:
+            posting = self.posting(term)
+            kept = []
+            for i in range(0, len(posting), 2):
+                new_id = remap.get(posting[i])
+                if new_id is not None:
+                    kept += (new_id, posting[i + 1])
+            if kept:
+                postings[term] = kept
+        self.docs = docs
+        self.postings = postings
+        self.ids = {doc[0]: i for i, doc in enumerate(docs)}
+        self._vocab = None
+
+    def vocab(self) -> list[str]:
+        if self._vocab is None:
+            self._vocab = sorted(self.postings)
+        return self._vocab
+
+
+_lock = threading.Lock()
+# (index path, index) for the config dir.
+_state: tuple[str, _Index] | None = None
+_dirty = False
+# (index path, registry path) pairs refreshed by this process.
+_refreshed: set[tuple[str, str]] = set()
+
+
+def get_index_path() -> Path:
+    """Get the search index path."""
+    return config.get_config_dir() / "cache" / "search-index.json"
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens of *text*, minus stopwords, with plurals folded."""
+    tokens = []
+    for tok in _TOKEN_RE.findall(text.lower()):
+        if len(tok) < 2 or tok in _STOPWORDS:
+            continue
+        if len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss"):
+            tok = tok[:-1]
+        tokens.append(tok)
+    return tokens
+
+
+def _read_text(path: Path, budget: int) -> str:
+    try:
+        with open(path, "rb") as f:
+            data = f.read(min(budget, _MAX_FILE_BYTES))
+    except OSError:
+        return ""
+    if b"\0" in data[:1024]:
+        return ""
+    return data.decode("utf-8", errors="ignore")
+
+
+def _item_text(path: Path) -> str:
+    """Text of a file item, or of the text files in a directory item."""
+    if not path.is_dir():
+        return _read_text(path, _MAX_ITEM_BYTES)
+    parts: list[str] = []
+    budget = _MAX_ITEM_BYTES
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in sorted(filenames, key=lambda n: (n not in _LEAD_FILES, n)):
+            if budget <= 0:
+                return "\n".join(parts)
+            if name.startswith("."):
+                continue
+            text = _read_text(Path(dirpath) / name, budget)
+            budget -= len(text)
+            parts.append(text)
+    return "\n".join(parts)
+
+
+def _item_terms(path: Path, name: str) -> Counter[str]:
+    text = _item_text(path)
+    stem = Path(name).stem if not path.is_dir() else name
+    counts = Counter(tokenize(text))
+    for tok in tokenize(stem):
+        counts[tok] += _NAME_WEIGHT
+    match = _DESCRIPTION_RE.search(text[:4096]) if text.startswith("---") else None
+    if match:
+        for tok in tokenize(match.group(1)):
+            counts[tok] += _DESCRIPTION_WEIGHT - 1
+    return counts
+
+
+def _load(index_path: Path, registry_path: Path) -> _Index:
+    index = _Index(registry=str(registry_path))
+    try:
+        raw = json.loads(index_path.read_bytes())
+    except (OSError, ValueError):
+        return index
+    if (
+        not isinstance(raw, dict)
+        or raw.get("version") != _INDEX_VERSION
+        or raw.get("registry") != str(registry_path)
+    ):
+        return index
+    docs = raw.get("docs", [])
+    postings = raw.get("postings", {})
+    try:
+        ids = {doc[0]: i for i, doc in enumerate(docs) if doc is not None}
+        total_len = sum(doc[2] for doc in docs if doc is not None)
+    except (TypeError, KeyError, IndexError):
+        return index
+    if not isinstance(postings, dict):
+        return index
+    index.docs, index.postings, index.ids, index.total_len = docs, postings, ids, total_len
+    return index
+
+
+def _get_index(registry_path: Path) -> _Index:
+    """Index for *registry_path* in the current config dir (caller holds ``_lock``)."""
+    global _state, _dirty
+    index_path = get_index_path()
+    if _state is not None and _state[0] == str(index_path):
+        if _state[1].registry == str(registry_path):
+            return _state[1]
+        _flush_locked()
+        index = _Index(registry=str(registry_path))
+        _dirty = True
+    else:
+        _flush_locked()
+        index = _load(index_path, registry_path)
+    _state = (str(index_path), index)
+    return index
+
+
+def _index_item(index: _Index, key: str, path: Path) -> bool:
+    """(Re)index one item if its stamp changed; drop it if it is gone."""
+    stamped = item_stamp(path)
+    if stamped is None:
+        if key in index.ids:
+            index.remove(key)
+            return True
+        return False
+    stamp, newest = stamped
+    if index.stamp(key) == stamp:
+        return False
+    # Items modified within the racy window get an empty stamp so the
+    # next refresh reads them again.
+    if time.time_ns() - newest <= _RACY_WINDOW_NS:
+        stamp = ""
+    index.put(key, stamp, _item_terms(path, key.split("/", 1)[1]))
+    return True
+
+
+def refresh(registry_path: Path | None = None) -> int:
+    """Bring the index up to date with the registry.
+
+    Returns:
+        The number of items (re)indexed or dropped.
+    """
+    global _dirty
+    from .registry import Registry
+
+    registry = Registry(registry_path)
+    path = registry.path
+    live = {
+        f"{ct.registry_dir}/{name}": path / ct.registry_dir / name
+        for ct, names in registry.list().items()
+        for name in names
+    }
+    changed = 0
+    with _lock:
+        index = _get_index(path)
+        for key in [k for k in index.ids if k not in live]:
+            index.remove(key)
+            changed += 1
+        for key, item_path in live.items():
+            changed += _index_item(index, key, item_path)
+        if changed:
+            _dirty = True
+        _refreshed.add((str(get_index_path()), str(path)))
+    return changed
+
+
+def update(item_path: Path) -> None:
+    """Reindex (or drop) one registry item if this process has the index loaded."""
+    global _dirty
+    registry_path = item_path.parent.parent
+    key = f"{item_path.parent.name}/{item_path.name}"
+    with _lock:
+        if _state is None or _state[0] != str(get_index_path()):
+            return
+        index = _state[1]
+        if index.registry != str(registry_path):
+            return
+        if _index_item(index, key, item_path):
+            _dirty = True
+
+
+def _query_terms(index: _Index, query: str, prefix: bool) -> list[list[str]]:
+    """Index terms per query term; with *prefix*, the last one is a prefix.
+
+    The last term is only expanded if it survives :func:`tokenize`
+    (a stopword or single letter is dropped, not expanded).
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+    raw = _TOKEN_RE.findall(query.lower())
+    typed = tokenize(raw[-1]) if prefix else []
+    if typed:
+        tokens = tokens[:-1]
+    groups = [[t] for t in dict.fromkeys(tokens)]
+    if typed:
+        last = raw[-1]
+        vocab = index.vocab()
+        lo = bisect.bisect_left(vocab, last)
+        expanded = []
+        for term in vocab[lo:]:
+            if not term.startswith(last) or len(expanded) >= _MAX_PREFIX_TERMS:
+                break
+            expanded.append(term)
+        groups.append(sorted(set(typed) | set(expanded)))
+    return groups
+
+
+def search(
+    query: str,
+    *,
+    registry_path: Path | None = None,
+    component_type: ComponentType | None = None,
+    limit: int | None = 20,
+    match_all: bool = False,
+    prefix: bool = False,
+) -> list[SearchHit]:
+    """Search the registry, best match first.
+
+    Args:
+        query: Free text.
+        registry_path: Registry to search (default: the configured one).
+        component_type: Only return items of this type.
+        limit: Maximum number of hits (None for all).
+        match_all: Only return items matching every query term.
+        prefix: Treat the last query term as a prefix (search-as-you-type).
+    """
+    from .registry import Registry
+
+    path = Registry(registry_path).path
+    if (str(get_index_path()), str(path)) not in _refreshed:
+        refresh(path)
+    type_dir = component_type.registry_dir + "/" if component_type else ""
+
+    with _lock:
+        index = _get_index(path)
+        docs = index.docs
+        n_docs = len(index.ids)
+        if not n_docs:
+            return []
+        avg_len = index.total_len / n_docs or 1.0
+        scores: dict[int, float] = {}
+        matched: Counter[int] = Counter()
+        groups = _query_terms(index, query, prefix)
+        for terms in groups:
+            seen: set[int] = set()
+            for term in terms:
+                posting = index.posting(term)
+                if not posting:
+                    continue
+                df = len(posting) // 2
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                for i in range(0, len(posting), 2):
+                    doc_id = posting[i]
+                    doc = docs[doc_id]
+                    if doc is None or (type_dir and not doc[0].startswith(type_dir)):
+                        continue
+                    tf = posting[i + 1]
+                    norm = tf + _K1 * (1 - _B + _B * doc[2] / avg_len)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (_K1 + 1) / norm
+                    seen.add(doc_id)
+            matched.update(seen)
+        if match_all:
+            scores = {d: s for d, s in scores.items() if matched[d] == len(groups)}
+        ranked = sorted(
+            ((docs[d][0], score) for d, score in scores.items()), key=lambda kv: (-kv[1], kv[0])
+        )
+
+    if limit is not None:
+        ranked = ranked[:limit]
+    hits = []
+    for key, score in ranked:
+        type_name, name = key.split("/", 1)
+        ct = _TYPES_BY_DIR.get(type_name)
+        if ct is not None:
+            hits.append(SearchHit(ct, name, round(score, 4)))
+    return hits
+
+
+def _flush_locked() -> None:
+    global _dirty
+    if not _dirty or _state is None:
+        return
+    _dirty = False
+    index = _state[1]
+    index.compact()
+    payload = {
+        "version": _INDEX_VERSION,
+        "registry": index.registry,
+        "docs": index.docs,
+        "postings": index.encoded_postings(),
+    }
+    config.write_cache_json(Path(_state[0]), payload)
+
+
+def flush() -> None:
+    """Write pending index changes to disk."""
+    with _lock:
+        _flush_locked()
+
+
+def clear_cache() -> None:
+    """Flush, then forget the in-memory index."""
+    global _state
+    with _lock:
+        _flush_locked()
+        _state = None
+        _refreshed.clear()
+
+
+atexit.register(flush)
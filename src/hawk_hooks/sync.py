@@ -2,43 +2,45 @@
 
 from __future__ import annotations
 
-import hashlib
-import os
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Callable, Iterable
 
-from . import config
+from . import config, fileio
 from .adapters import get_adapter
+from .fileio import FileOp, batched_fsync, journal
+from .locks import target_lock, target_lock_path
+from .profiling import span
 from .registry import Registry
 from .resolver import resolve
-from .scope_resolution import build_resolver_dir_chain
-from .types import ResolvedSet, SyncResult, Tool
+from .scope_resolution import resolve_many
+from .sync_state import SyncStateEntry, SyncStateStore, prune_unregistered
+from .types import ITEM_TABLE, RESOLVED_FIELDS, ComponentType, ResolvedSet, SyncResult, Tool
 
-
-def _get_cache_dir() -> Path:
-    """Get the resolved-set cache directory."""
-    return config.get_config_dir() / "cache" / "resolved"
-
-
-def _cache_key(scope: str, tool: Tool) -> str:
-    """Build a cache filename for a scope+tool combination."""
-    scope_hash = hashlib.sha256(scope.encode("utf-8")).hexdigest()
-    return f"{scope_hash}_{tool.value}"
+# Upper bound on threads used to sweep directory scopes in clean/purge.
+_SWEEP_WORKERS = 8
 
 
 def _read_cached_hash(scope: str, tool: Tool) -> str | None:
-    """Read the cached hash for a scope+tool, or None if missing."""
-    cache_file = _get_cache_dir() / _cache_key(scope, tool)
-    try:
-        return cache_file.read_text().strip()
-    except (FileNotFoundError, OSError):
-        return None
+    """Read the last applied cache identity for a scope+tool, or None."""
+    return SyncStateStore().get_identity(scope, str(tool))
 
 
-def _write_cached_hash(scope: str, tool: Tool, hash_val: str) -> None:
-    """Write a resolved-set hash to the cache."""
-    cache_dir = _get_cache_dir()
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    (cache_dir / _cache_key(scope, tool)).write_text(hash_val)
+def _write_cached_hash(
+    scope: str,
+    tool: Tool,
+    hash_val: str | None,
+    *,
+    duration: float = 0.0,
+    error_count: int = 0,
+) -> None:
+    """Record a sync for a scope+tool (``hash_val=None`` keeps the old identity)."""
+    SyncStateStore().record(
+        scope, str(tool), hash_val, duration=duration, error_count=error_count
+    )
 
 
 def _cache_identity(resolved_hash: str, adapter) -> str:
@@ -72,34 +74,216 @@ def count_unsynced_targets(
             continue
         selected_tools.append(tool)
 
+    scopes: list[Path | None] = []
+    if include_global:
+        scopes.append(None)
+    if project_dir is not None:
+        scopes.append(project_dir)
+    resolved_sets = resolve_many(cfg, scopes, selected_tools)
+
     unsynced = 0
-    total = 0
+    known = SyncStateStore().identities()
+    hash_memo: dict[int, str] = {}
+    adapters = {tool: get_adapter(tool) for tool in selected_tools}
+    for (scope_key, tool), resolved in resolved_sets.items():
+        # Tools without overrides share one resolved set; hash it once.
+        if id(resolved) not in hash_memo:
+            hash_memo[id(resolved)] = resolved.hash_key(registry_path=registry.path)
+        expected = _cache_identity(hash_memo[id(resolved)], adapters[tool])
+        if known.get((scope_key, str(tool))) != expected:
+            unsynced += 1
+
+    return unsynced, len(resolved_sets)
+
+
+@dataclass
+class SyncPlan:
+    """Exact filesystem ops a sync of one scope/tool target would perform."""
+
+    scope: str
+    tool: str
+    result: SyncResult
+    ops: list[FileOp] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize for ``hawk sync --plan`` output."""
+        return {
+            "scope": self.scope,
+            "tool": self.tool,
+            "linked": list(self.result.linked),
+            "unlinked": list(self.result.unlinked),
+            "skipped": list(self.result.skipped),
+            "errors": list(self.result.errors),
+            "ops": [op.to_dict() for op in self.ops],
+        }
+
+
+def _plan_target(
+    scope: str,
+    adapter,
+    resolved: ResolvedSet,
+    target_dir: Path,
+    registry_path: Path,
+) -> SyncPlan:
+    """Run an adapter sync against a simulated filesystem and capture its ops."""
+    resolved = Registry(registry_path).names().qualify(resolved)
+    with span("plan_target", scope=scope, tool=adapter.tool), journal(simulate=True) as recorder:
+        result = adapter.sync(resolved, target_dir, registry_path)
+    return SyncPlan(scope=scope, tool=str(adapter.tool), result=result, ops=list(recorder.ops))
 
-    if include_global:
-        resolved_global = resolve(cfg)
-        global_hash = resolved_global.hash_key(registry_path=registry.path)
-        for tool in selected_tools:
-            adapter = get_adapter(tool)
-            expected = _cache_identity(global_hash, adapter)
-            total += 1
-            if _read_cached_hash("global", tool) != expected:
-                unsynced += 1
 
-    if project_dir is not None:
-        dir_chain = build_resolver_dir_chain(project_dir, cfg=cfg)
+def _holders_log(scope: str, tool: Tool) -> Path:
+    """File listing the rollback holders of an in-progress apply of a target."""
+    return target_lock_path(scope, str(tool)).with_suffix(".holders")
 
-        resolved_project = resolve(cfg, dir_chain=dir_chain) if dir_chain else resolve(cfg)
-        project_hash = resolved_project.hash_key(registry_path=registry.path)
-        scope_key = str(project_dir.resolve())
 
-        for tool in selected_tools:
-            adapter = get_adapter(tool)
-            expected = _cache_identity(project_hash, adapter)
-            total += 1
-            if _read_cached_hash(scope_key, tool) != expected:
-                unsynced += 1
+def _apply_target(
+    adapter,
+    resolved: ResolvedSet,
+    target_dir: Path,
+    registry_path: Path,
+    holders_log: Path | None = None,
+) -> SyncResult:
+    """Run an adapter sync under a journal.
+
+    If the sync raises (including on interrupt), every file, symlink and
+    directory it touched is restored before the exception propagates.
+    Per-item failures an adapter reports in ``result.errors`` do not roll
+    back: the other items' changes are kept, and the caller does not
+    record the target's identity, so the next sync retries it.
+
+    With *holders_log* (the caller holds the target lock), rollback
+    holders a killed earlier apply left in the tool dirs are removed first.
+    """
+    resolved = Registry(registry_path).names().qualify(resolved)
+    if holders_log is not None:
+        fileio.remove_stale_holders(holders_log)
+    with journal(holders_log=holders_log):
+        return adapter.sync(resolved, target_dir, registry_path)
+
+
+def _collect_targets(
+    project_dir: Path | None,
+    tools: list[Tool] | None,
+    force: bool,
+) -> tuple[Path, list[tuple[str, Any, ResolvedSet, str | None]]]:
+    """Resolve every tool target of one scope.
+
+    Returns:
+        (registry path, [(scope, adapter, resolved, identity)]) where
+        ``identity`` is None when the cached identity is current and the
+        target can be skipped.
+    """
+    scope = str(project_dir.resolve()) if project_dir is not None else "global"
+    with span("config_load"):
+        cfg = config.load_global_config()
+    enabled_tools = tools or config.get_enabled_tools(cfg)
+    registry = Registry(config.get_registry_path(cfg))
+    with span("resolve", scope=scope):
+        resolved_sets = resolve_many(cfg, [project_dir], enabled_tools)
+
+    targets: list[tuple[str, Any, ResolvedSet, str | None]] = []
+    for tool in enabled_tools:
+        adapter = get_adapter(tool)
+        resolved = resolved_sets[(scope, tool)]
+
+        # Check cache — skip if resolved set hasn't changed
+        with span("hash_key", scope=scope, tool=tool):
+            current_hash = resolved.hash_key(registry_path=registry.path)
+        identity = _cache_identity(current_hash, adapter)
+        if not force and _read_cached_hash(scope, tool) == identity:
+            identity = None
+        targets.append((scope, adapter, resolved, identity))
+    return registry.path, targets
+
 
-    return unsynced, total
+def _target_dir(adapter, project_dir: Path | None) -> Path:
+    if project_dir is None:
+        return adapter.get_global_dir()
+    return adapter.get_project_dir(project_dir)
+
+
+def plan_directory(
+    project_dir: Path | None,
+    tools: list[Tool] | None = None,
+    force: bool = False,
+) -> list[SyncPlan]:
+    """Compute the exact ops syncing a directory (or global, if None) would run.
+
+    Nothing is written: adapters run against an in-memory overlay of the
+    filesystem. Targets whose cache is current get an empty plan.
+    """
+    registry_path, targets = _collect_targets(project_dir, tools, force)
+    plans: list[SyncPlan] = []
+    for scope, adapter, resolved, identity in targets:
+        tool = str(adapter.tool)
+        if identity is None:
+            plans.append(SyncPlan(scope=scope, tool=tool, result=SyncResult(tool=tool)))
+            continue
+        target_dir = _target_dir(adapter, project_dir)
+        plans.append(_plan_target(scope, adapter, resolved, target_dir, registry_path))
+    return plans
+
+
+def plan_global(tools: list[Tool] | None = None, force: bool = False) -> list[SyncPlan]:
+    """Compute the exact ops a global sync would run."""
+    return plan_directory(None, tools=tools, force=force)
+
+
+def plan_all(
+    tools: list[Tool] | None = None,
+    force: bool = False,
+) -> dict[str, list[SyncPlan]]:
+    """Compute plans for global + all registered directories."""
+    plans: dict[str, list[SyncPlan]] = {"global": plan_global(tools=tools, force=force)}
+    for dir_path_str in config.get_registered_directories():
+        dir_path = Path(dir_path_str)
+        if dir_path.exists():
+            plans[dir_path_str] = plan_directory(dir_path, tools=tools, force=force)
+    return plans
+
+
+def _sync_scope(
+    project_dir: Path | None,
+    tools: list[Tool] | None,
+    dry_run: bool,
+    force: bool,
+) -> list[SyncResult]:
+    if dry_run:
+        return [plan.result for plan in plan_directory(project_dir, tools=tools, force=force)]
+
+    registry_path, targets = _collect_targets(project_dir, tools, force)
+    results: list[SyncResult] = []
+    for scope, adapter, resolved, identity in targets:
+        tool = adapter.tool
+        if identity is None:
+            results.append(SyncResult(tool=str(tool)))
+            continue
+
+        target_dir = _target_dir(adapter, project_dir)
+        with target_lock(scope, str(tool)):
+            # A concurrent sync may have applied this state while we waited.
+            if not force and _read_cached_hash(scope, tool) == identity:
+                results.append(SyncResult(tool=str(tool)))
+                continue
+
+            started = time.perf_counter()
+            with span("sync_target", scope=scope, tool=tool):
+                result = _apply_target(
+                    adapter, resolved, target_dir, registry_path, _holders_log(scope, tool)
+                )
+            results.append(result)
+
+            # Record sync; identity only advances after a successful sync
+            _write_cached_hash(
+                scope,
+                tool,
+                None if result.errors else identity,
+                duration=time.perf_counter() - started,
+                error_count=len(result.errors),
+            )
+
+    return results
 
 
 def sync_directory(
@@ -116,127 +300,275 @@ def sync_directory(
     Args:
         project_dir: The project directory to sync.
         tools: Optional filter to specific tools.
-        dry_run: If True, compute what would change but don't apply.
+        dry_run: If True, simulate the sync and report exactly what it
+            would change without applying anything.
         force: If True, bypass hash cache and sync unconditionally.
 
     Returns:
         List of SyncResult, one per tool.
     """
-    cfg = config.load_global_config()
+    return _sync_scope(project_dir, tools, dry_run, force)
 
-    # Build dir_chain from shared config+profile resolution helper.
-    dir_chain = build_resolver_dir_chain(project_dir, cfg=cfg)
 
-    # Determine which tools to sync
-    enabled_tools = tools or config.get_enabled_tools(cfg)
-    registry = Registry(config.get_registry_path(cfg))
-    results: list[SyncResult] = []
+def sync_global(
+    tools: list[Tool] | None = None,
+    dry_run: bool = False,
+    force: bool = False,
+) -> list[SyncResult]:
+    """Sync global config to all enabled tools.
 
-    scope_key = str(project_dir.resolve())
+    Args:
+        tools: Optional filter to specific tools.
+        dry_run: If True, simulate the sync and report exactly what it
+            would change without applying anything.
+        force: If True, bypass hash cache and sync unconditionally.
 
-    for tool in enabled_tools:
-        adapter = get_adapter(tool)
+    Returns:
+        List of SyncResult, one per tool.
+    """
+    return _sync_scope(None, tools, dry_run, force)
 
-        # Resolve using dir_chain for hierarchical layering
-        resolved = resolve(cfg, dir_chain=dir_chain, tool=tool)
 
-        if dry_run:
-            result = SyncResult(tool=str(tool))
-            result.linked = _compute_would_link(resolved, registry, adapter, project_dir)
-            results.append(result)
-            continue
+def sync_all(
+    tools: list[Tool] | None = None,
+    dry_run: bool = False,
+    force: bool = False,
+) -> dict[str, list[SyncResult]]:
+    """Sync global + all registered directories.
 
-        # Check cache — skip if resolved set hasn't changed
-        current_hash = resolved.hash_key(registry_path=registry.path)
-        identity = _cache_identity(current_hash, adapter)
-        if not force and _read_cached_hash(scope_key, tool) == identity:
-            results.append(SyncResult(tool=str(tool)))
-            continue
+    Returns:
+        Dict mapping "global" or directory path to list of SyncResults.
+    """
+    all_results: dict[str, list[SyncResult]] = {}
 
-        # Determine target directory
-        target_dir = adapter.get_project_dir(project_dir)
+    # Flush directories of changed tool config files once, at the end of the run.
+    with batched_fsync():
+        # Sync global
+        all_results["global"] = sync_global(tools=tools, dry_run=dry_run, force=force)
+
+        # Sync each registered directory
+        directories = [
+            dir_path_str
+            for dir_path_str in config.get_registered_directories()
+            if Path(dir_path_str).exists()
+        ]
+        if dry_run:
+            for dir_path_str in directories:
+                all_results[dir_path_str] = sync_directory(
+                    Path(dir_path_str), tools=tools, dry_run=True
+                )
+        else:
+            all_results.update(_sync_directories_grouped(directories, tools=tools, force=force))
 
-        result = adapter.sync(resolved, target_dir, registry.path)
-        results.append(result)
+    if not dry_run:
+        prune_unregistered()
 
-        # Update cache after successful sync
-        if not result.errors:
-            _write_cached_hash(scope_key, tool, identity)
+    return all_results
 
-    return results
 
+def _resolved_names_key(resolved: ResolvedSet) -> tuple[int, ...]:
+    """Order-insensitive key of the item names in a resolved set."""
+    return resolved.masks()
 
-def sync_global(
+
+def _sync_directories_grouped(
+    directories: list[str],
     tools: list[Tool] | None = None,
-    dry_run: bool = False,
     force: bool = False,
-) -> list[SyncResult]:
-    """Sync global config to all enabled tools.
+) -> dict[str, list[SyncResult]]:
+    """Sync many directories, planning once per distinct configuration.
 
-    Args:
-        tools: Optional filter to specific tools.
-        dry_run: If True, compute what would change but don't apply.
-        force: If True, bypass hash cache and sync unconditionally.
+    Projects that inherit the same chain usually resolve to identical sets.
+    Targets are grouped by cache identity (resolved hash + adapter
+    capability fingerprint) per tool; each group shares one adapter whose
+    plan cache holds the validated link plan, runner contents and MCP
+    payloads, so only the per-directory apply step repeats.
 
     Returns:
-        List of SyncResult, one per tool.
+        Dict mapping directory path to list of SyncResults (one per tool).
     """
-    cfg = config.load_global_config()
+    with span("config_load"):
+        cfg = config.load_global_config()
     enabled_tools = tools or config.get_enabled_tools(cfg)
     registry = Registry(config.get_registry_path(cfg))
-    results: list[SyncResult] = []
+    store = SyncStateStore()
+    known = store.identities()
+    hash_memo: dict[tuple[int, ...], str] = {}
+    probes = {tool: get_adapter(tool) for tool in enabled_tools}
 
-    for tool in enabled_tools:
+    with span("resolve", scopes=len(directories)):
+        resolved_sets = resolve_many(cfg, [Path(d) for d in directories], enabled_tools)
+
+    results: dict[str, list[SyncResult | None]] = {}
+    groups: dict[tuple[str, Tool], list[tuple[str, int, ResolvedSet]]] = {}
+    for dir_path_str in directories:
+        project_dir = Path(dir_path_str)
+        scope_key = str(project_dir.resolve())
+        slots: list[SyncResult | None] = [None] * len(enabled_tools)
+        results[dir_path_str] = slots
+
+        for index, tool in enumerate(enabled_tools):
+            resolved = resolved_sets[(scope_key, tool)]
+            names_key = _resolved_names_key(resolved)
+            if names_key not in hash_memo:
+                with span("hash_key", scope=scope_key, tool=tool):
+                    hash_memo[names_key] = resolved.hash_key(registry_path=registry.path)
+            identity = _cache_identity(hash_memo[names_key], probes[tool])
+            if not force and known.get((scope_key, str(tool))) == identity:
+                slots[index] = SyncResult(tool=str(tool))
+                continue
+            groups.setdefault((identity, tool), []).append((dir_path_str, index, resolved))
+
+    for (identity, tool), members in groups.items():
         adapter = get_adapter(tool)
-        resolved = resolve(cfg)
+        with adapter.plan_cache():
+            for dir_path_str, index, resolved in members:
+                project_dir = Path(dir_path_str)
+                scope_key = str(project_dir.resolve())
+                target_dir = adapter.get_project_dir(project_dir)
+                with target_lock(scope_key, str(tool)):
+                    # A concurrent sync may have applied this state while we waited.
+                    if not force and store.get_identity(scope_key, str(tool)) == identity:
+                        results[dir_path_str][index] = SyncResult(tool=str(tool))
+                        continue
+
+                    started = time.perf_counter()
+                    with span("sync_target", scope=scope_key, tool=tool):
+                        result = _apply_target(
+                            adapter,
+                            resolved,
+                            target_dir,
+                            registry.path,
+                            _holders_log(scope_key, tool),
+                        )
+                    results[dir_path_str][index] = result
+                    # Identity only advances after a successful sync
+                    store.record(
+                        scope_key,
+                        str(tool),
+                        None if result.errors else identity,
+                        duration=time.perf_counter() - started,
+                        error_count=len(result.errors),
+                    )
+
+    return {path: [r for r in slots if r is not None] for path, slots in results.items()}
+
+
+def _fields_for_type(component_type: ComponentType) -> list[str]:
+    """ResolvedSet fields that can reference items of *component_type*."""
+    if component_type == ComponentType.COMMAND:
+        # Legacy commands are resolved into prompts.
+        return ["commands", "prompts"]
+    return [component_type.registry_dir]
+
+
+def _resolve_all_targets(
+    tools: list[Tool] | None = None,
+) -> dict[tuple[str, Tool], ResolvedSet]:
+    """Resolve every ``(scope, tool)`` target.
 
-        if dry_run:
-            result = SyncResult(tool=str(tool))
-            result.linked = _compute_would_link(resolved, registry, adapter, None)
-            results.append(result)
-            continue
+    Scope is ``"global"`` or a registered directory key as stored in
+    config. Sets may be shared between targets; treat them as read-only.
+    """
+    cfg = config.load_global_config()
+    enabled_tools = tools or config.get_enabled_tools(cfg)
+    directories = [d for d in cfg.get("directories", {}) if Path(d).exists()]
+    resolved_sets = resolve_many(cfg, [None, *(Path(d) for d in directories)], enabled_tools)
 
-        # Check cache — skip if resolved set hasn't changed
-        current_hash = resolved.hash_key(registry_path=registry.path)
-        identity = _cache_identity(current_hash, adapter)
-        if not force and _read_cached_hash("global", tool) == identity:
-            results.append(SyncResult(tool=str(tool)))
-            continue
+    targets: dict[tuple[str, Tool], ResolvedSet] = {}
+    for tool in enabled_tools:
+        targets[("global", tool)] = resolved_sets[("global", tool)]
+    for dir_path_str in directories:
+        scope_key = str(Path(dir_path_str).resolve())
+        for tool in enabled_tools:
+            targets[(dir_path_str, tool)] = resolved_sets[(scope_key, tool)]
+    return targets
 
-        target_dir = adapter.get_global_dir()
-        result = adapter.sync(resolved, target_dir, registry.path)
-        results.append(result)
 
-        # Update cache after successful sync
-        if not result.errors:
-            _write_cached_hash("global", tool, identity)
+def build_item_target_index(
+    tools: list[Tool] | None = None,
+) -> dict[tuple[str, str], set[tuple[str, Tool]]]:
+    """Build a reverse index from resolved items to the targets using them.
 
-    return results
+    Keys are ``(field, name)`` pairs where *field* is a ResolvedSet field
+    (e.g. ``"skills"``). Values are ``(scope, tool)`` targets whose resolved
+    set contains the item; scope is ``"global"`` or a registered directory.
+    """
+    index: dict[tuple[str, str], set[tuple[str, Tool]]] = {}
+    for target, resolved in _resolve_all_targets(tools).items():
+        for field_name in RESOLVED_FIELDS:
+            for name in getattr(resolved, field_name):
+                index.setdefault((field_name, name), set()).add(target)
+    return index
 
 
-def sync_all(
+def find_targets_for_items(
+    items: Iterable[tuple[ComponentType, str]],
     tools: list[Tool] | None = None,
+) -> list[tuple[str, Tool]]:
+    """Return ``(scope, tool)`` targets whose resolved set contains any item.
+
+    Each target is tested with one AND per field against an interned
+    bitmask of the queried items.
+
+    Targets are ordered global first, then by directory, then by tool.
+    """
+    query = [0] * len(RESOLVED_FIELDS)
+    for component_type, name in items:
+        for field_name in _fields_for_type(component_type):
+            query[RESOLVED_FIELDS.index(field_name)] |= 1 << ITEM_TABLE.bit(field_name, name)
+    if not any(query):
+        return []
+
+    mask_memo: dict[int, tuple[int, ...]] = {}
+    targets: list[tuple[str, Tool]] = []
+    for target, resolved in _resolve_all_targets(tools).items():
+        masks = mask_memo.get(id(resolved))
+        if masks is None:
+            masks = mask_memo[id(resolved)] = resolved.masks()
+        if any(m & q for m, q in zip(masks, query)):
+            targets.append(target)
+
+    tool_order = {tool: i for i, tool in enumerate(Tool.all())}
+    return sorted(
+        targets,
+        key=lambda t: (t[0] != "global", t[0], tool_order.get(t[1], len(tool_order))),
+    )
+
+
+def sync_targets(
+    targets: Iterable[tuple[str, Tool]],
     dry_run: bool = False,
-    force: bool = False,
 ) -> dict[str, list[SyncResult]]:
-    """Sync global + all registered directories.
+    """Sync only the given ``(scope, tool)`` targets.
+
+    Each target's cache entry is invalidated first, so the target is
+    re-applied without forcing a re-sync of unrelated scopes or tools.
 
     Returns:
         Dict mapping "global" or directory path to list of SyncResults.
     """
-    all_results: dict[str, list[SyncResult]] = {}
-
-    # Sync global
-    all_results["global"] = sync_global(tools=tools, dry_run=dry_run, force=force)
+    tools_by_scope: dict[str, list[Tool]] = {}
+    for scope, tool in targets:
+        scope_tools = tools_by_scope.setdefault(scope, [])
+        if tool not in scope_tools:
+            scope_tools.append(tool)
+
+    if not dry_run:
+        SyncStateStore().invalidate(
+            (scope, str(tool))
+            for scope, scope_tools in tools_by_scope.items()
+            for tool in scope_tools
+        )
 
-    # Sync each registered directory
-    directories = config.get_registered_directories()
-    for dir_path_str in directories:
-        dir_path = Path(dir_path_str)
+    all_results: dict[str, list[SyncResult]] = {}
+    for scope, scope_tools in tools_by_scope.items():
+        if scope == "global":
+            all_results[scope] = sync_global(tools=scope_tools, dry_run=dry_run)
+            continue
+        dir_path = Path(scope)
         if dir_path.exists():
-            all_results[dir_path_str] = sync_directory(
-                dir_path, tools=tools, dry_run=dry_run, force=force
-            )
+            all_results[scope] = sync_directory(dir_path, tools=scope_tools, dry_run=dry_run)
 
     return all_results
 
@@ -268,14 +600,12 @@ def clean_directory(
             results.append(result)
             continue
 
-        result = adapter.sync(empty, target_dir, registry.path)
+        with target_lock(scope_key, str(tool)):
+            result = _apply_target(adapter, empty, target_dir, registry.path)
+            # Clear cache for this scope+tool
+            SyncStateStore().invalidate([(scope_key, str(tool))])
         results.append(result)
 
-        # Clear cache for this scope+tool
-        cache_file = _get_cache_dir() / _cache_key(scope_key, tool)
-        if cache_file.exists():
-            cache_file.unlink()
-
     return results
 
 
@@ -300,14 +630,12 @@ def clean_global(
             results.append(result)
             continue
 
-        result = adapter.sync(empty, target_dir, registry.path)
+        with target_lock("global", str(tool)):
+            result = _apply_target(adapter, empty, target_dir, registry.path)
+            # Clear cache
+            SyncStateStore().invalidate([("global", str(tool))])
         results.append(result)
 
-        # Clear cache
-        cache_file = _get_cache_dir() / _cache_key("global", tool)
-        if cache_file.exists():
-            cache_file.unlink()
-
     return results
 
 
@@ -319,15 +647,9 @@ def clean_all(
     all_results: dict[str, list[SyncResult]] = {}
 
     all_results["global"] = clean_global(tools=tools, dry_run=dry_run)
-
-    directories = config.get_registered_directories()
-    for dir_path_str in directories:
-        dir_path = Path(dir_path_str)
-        if dir_path.exists():
-            all_results[dir_path_str] = clean_directory(
-                dir_path, tools=tools, dry_run=dry_run
-            )
-
+    all_results.update(
+        _sweep_directories(lambda d: clean_directory(d, tools=tools, dry_run=dry_run))
+    )
     return all_results
 
 
@@ -367,16 +689,38 @@ def purge_all(
         "global": purge_global(tools=tools, dry_run=dry_run)
     }
 
-    for dir_path_str in config.get_registered_directories():
-        dir_path = Path(dir_path_str)
-        if dir_path.exists():
-            results[dir_path_str] = purge_directory(
-                dir_path, tools=tools, dry_run=dry_run
-            )
-
+    results.update(
+        _sweep_directories(lambda d: purge_directory(d, tools=tools, dry_run=dry_run))
+    )
     return results
 
 
+def _sweep_directories(
+    fn: Callable[[Path], list[SyncResult]],
+) -> dict[str, list[SyncResult]]:
+    """Run *fn* for every existing registered directory, in parallel.
+
+    Scopes touch disjoint tool dirs and each takes its own target locks,
+    so they are independent; results keep registration order. Workers
+    must not change process-wide state: fileio reads the umask once at
+    import and the sync-state store serializes its shared connection.
+    """
+    directories = [
+        dir_path_str
+        for dir_path_str in config.get_registered_directories()
+        if Path(dir_path_str).exists()
+    ]
+    if len(directories) <= 1:
+        return {d: fn(Path(d)) for d in directories}
+
+    with ThreadPoolExecutor(max_workers=min(_SWEEP_WORKERS, len(directories))) as pool:
+        # Copy the caller's context so profiler spans land in the same trace.
+        futures = [
+            pool.submit(contextvars.copy_context().run, fn, Path(d)) for d in directories
+        ]
+        return {d: future.result() for d, future in zip(directories, futures)}
+
+
 def uninstall_all(
     tools: list[Tool] | None = None,
     dry_run: bool = False,
@@ -398,41 +742,42 @@ def uninstall_all(
     if dry_run:
         return purge_results
 
-    cfg = config.load_global_config()
-    registered_dirs = list(config.get_registered_directories().keys())
+    # One locked write for all global config changes; keep the old config
+    # around as config.yaml.bak since this is destructive.
+    with config.transaction(backup=True) as tx:
+        cfg = tx.cfg
+        registered_dirs = list(config.get_registered_directories().keys())
 
-    # Remove per-project hawk config files for registered directories.
-    if remove_project_configs:
-        for dir_path_str in registered_dirs:
-            cfg_path = config.get_dir_config_path(Path(dir_path_str))
-            try:
-                if cfg_path.exists():
-                    cfg_path.unlink()
-                if cfg_path.parent.exists() and not any(cfg_path.parent.iterdir()):
-                    cfg_path.parent.rmdir()
-            except OSError:
-                # Best effort: keep going even if one project can't be cleaned.
-                pass
-
-    # Clear global component selections + directory registrations.
-    global_section = cfg.get("global", {})
-    for field in ["skills", "hooks", "prompts", "commands", "agents", "mcp"]:
-        global_section[field] = []
-    cfg["global"] = global_section
-    cfg["directories"] = {}
+        # Remove per-project hawk config files for registered directories.
+        if remove_project_configs:
+            for dir_path_str in registered_dirs:
+                cfg_path = config.get_dir_config_path(Path(dir_path_str))
+                try:
+                    if cfg_path.exists():
+                        cfg_path.unlink()
+                    if cfg_path.parent.exists() and not any(cfg_path.parent.iterdir()):
+                        cfg_path.parent.rmdir()
+                except OSError:
+                    # Best effort: keep going even if one project can't be cleaned.
+                    pass
 
-    # Reset Codex multi-agent consent state as part of hawk-managed teardown.
-    tools_cfg = cfg.setdefault("tools", {})
-    codex_cfg = tools_cfg.setdefault("codex", {})
-    codex_cfg["multi_agent_consent"] = "ask"
-    codex_cfg["allow_multi_agent"] = False
-    tools_cfg["codex"] = codex_cfg
-    cfg["tools"] = tools_cfg
+        # Clear global component selections + directory registrations.
+        global_section = cfg.get("global", {})
+        for field in ["skills", "hooks", "prompts", "commands", "agents", "mcp"]:
+            global_section[field] = []
+        cfg["global"] = global_section
+        cfg["directories"] = {}
 
-    config.save_global_config(cfg)
+        # Reset Codex multi-agent consent state as part of hawk-managed teardown.
+        tools_cfg = cfg.setdefault("tools", {})
+        codex_cfg = tools_cfg.setdefault("codex", {})
+        codex_cfg["multi_agent_consent"] = "ask"
+        codex_cfg["allow_multi_agent"] = False
+        tools_cfg["codex"] = codex_cfg
+        cfg["tools"] = tools_cfg
 
-    # Clear package index.
-    config.save_packages({})
+        # Clear package index.
+        config.save_packages({})
 
     # Remove all registry items.
     registry = Registry(config.get_registry_path(cfg))
@@ -444,22 +789,17 @@ def uninstall_all(
                 pass
 
     # Clear sync cache.
-    cache_dir = _get_cache_dir()
-    if cache_dir.exists():
-        for entry in cache_dir.iterdir():
-            try:
-                if entry.is_file() or entry.is_symlink():
-                    entry.unlink()
-            except OSError:
-                pass
+    store = SyncStateStore()
+    store.clear()
 
     # Seed global cache to represent the empty post-uninstall state.
     # This prevents a false "unsynced" signal immediately after uninstall.
     enabled_tools = tools or config.get_enabled_tools(cfg)
     empty_hash = resolve(cfg).hash_key(registry_path=registry.path)
-    for tool in enabled_tools:
-        adapter = get_adapter(tool)
-        _write_cached_hash("global", tool, _cache_identity(empty_hash, adapter))
+    store.record_many(
+        SyncStateEntry("global", str(tool), _cache_identity(empty_hash, get_adapter(tool)))
+        for tool in enabled_tools
+    )
 
     return purge_results
 
@@ -476,19 +816,10 @@ def _compute_would_unlink(
         ("agent", adapter.get_agents_dir),
         ("prompt", adapter.get_prompts_dir),
     ]:
-        comp_dir = get_dir_fn(target_dir)
-        source_dir = registry_path / (comp_type + "s")
-        if not comp_dir.exists():
-            continue
-        for entry in comp_dir.iterdir():
-            if entry.is_symlink():
-                try:
-                    target = entry.resolve()
-                    resolved_source = source_dir.resolve()
-                    if target == resolved_source or target.is_relative_to(resolved_source):
-                        would_unlink.append(f"{comp_type}:{entry.name}")
-                except (OSError, ValueError):
-                    pass
+        roots = fileio.link_roots(registry_path / (comp_type + "s"))
+        would_unlink.extend(
+            f"{comp_type}:{name}" for name in fileio.links_into(get_dir_fn(target_dir), roots)
+        )
     return would_unlink
 
 
@@ -524,7 +855,7 @@ def _prune_scope(
     cfg = config.load_global_config()
     enabled_tools = tools or config.get_enabled_tools(cfg)
     registry = Registry(config.get_registry_path(cfg))
-    hawk_roots = [config.get_config_dir().resolve(), registry.path.resolve()]
+    hawk_roots = fileio.link_roots(config.get_config_dir(), registry.path)
 
     results: list[SyncResult] = []
     for tool in enabled_tools:
@@ -544,7 +875,7 @@ def _prune_scope(
 def _prune_tool_symlinks(
     adapter,
     target_dir: Path,
-    hawk_roots: list[Path],
+    hawk_roots: tuple[str, ...],
     *,
     dry_run: bool,
 ) -> list[str]:
@@ -557,19 +888,11 @@ def _prune_tool_symlinks(
     ]
 
     for prefix, get_dir_fn, unlink_fn in specs:
-        comp_dir = get_dir_fn(target_dir)
-        if not comp_dir.exists():
-            continue
-        for entry in comp_dir.iterdir():
-            if not entry.is_symlink():
-                continue
-            if not _is_hawk_link(entry, hawk_roots):
-                continue
-
-            removed.append(f"{prefix}:{entry.name}")
+        for name in fileio.links_into(get_dir_fn(target_dir), hawk_roots):
+            removed.append(f"{prefix}:{name}")
             if not dry_run:
                 try:
-                    unlink_fn(entry.name, target_dir)
+                    unlink_fn(name, target_dir)
                 except Exception:
                     # Best-effort prune; cleanup errors are surfaced by normal clean.
                     pass
@@ -577,52 +900,6 @@ def _prune_tool_symlinks(
     return removed
 
 
-def _is_hawk_link(link_path: Path, hawk_roots: list[Path]) -> bool:
-    """Return True if symlink target points into hawk config/registry roots."""
-    try:
-        raw_target = Path(os.readlink(link_path))
-    except OSError:
-        return False
-
-    if not raw_target.is_absolute():
-        target = (link_path.parent / raw_target).resolve(strict=False)
-    else:
-        target = raw_target.resolve(strict=False)
-
-    for root in hawk_roots:
-        try:
-            if target == root or target.is_relative_to(root):
-                return True
-        except (OSError, ValueError):
-            continue
-    return False
-
-
-def _compute_would_link(
-    resolved: ResolvedSet,
-    registry: Registry,
-    adapter,
-    project_dir: Path | None,
-) -> list[str]:
-    """Compute what would be linked in a dry run."""
-    would_link: list[str] = []
-    for skill in resolved.skills:
-        if registry.has_from_name("skills", skill):
-            would_link.append(f"skill:{skill}")
-    for agent in resolved.agents:
-        if registry.has_from_name("agents", agent):
-            would_link.append(f"agent:{agent}")
-    for prompt in resolved.prompts:
-        if registry.has_from_name("prompts", prompt):
-            would_link.append(f"prompt:{prompt}")
-    for hook in resolved.hooks:
-        would_link.append(f"hook:{hook}")
-    for mcp in resolved.mcp:
-        if registry.has_from_name("mcp", mcp) or registry.has_from_name("mcp", f"{mcp}.yaml"):
-            would_link.append(f"mcp:{mcp}")
-    return would_link
-
-
 def format_sync_results(
     results: dict[str, list[SyncResult]],
     *,
@@ -0,0 +1,250 @@
+"""Persistent sync state for scope/tool targets.
+
+Replaces the old one-file-per-target hash cache under ``cache/resolved/``
+with a single SQLite database (``cache/sync-state.db``). Each row records
+the cache identity last applied to a ``(scope, tool)`` target plus when it
+was synced, how long it took and how many errors it reported.
+
+The process keeps one open connection (schema created and legacy cache
+dropped once) and reuses it for every read and write, re-opening only
+when the database path or file changes.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from . import config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (
+    scope TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    identity TEXT,
+    last_sync REAL NOT NULL DEFAULT 0,
+    duration REAL NOT NULL DEFAULT 0,
+    error_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, tool)
+) WITHOUT ROWID;
+"""
+
+_UPSERT = """
+INSERT INTO sync_state (scope, tool, identity, last_sync, duration, error_count)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (scope, tool) DO UPDATE SET
+    identity = COALESCE(excluded.identity, sync_state.identity),
+    last_sync = excluded.last_sync,
+    duration = excluded.duration,
+    error_count = excluded.error_count
+"""
+
+
+@dataclass
+class SyncStateEntry:
+    """Sync state for one ``(scope, tool)`` target."""
+
+    scope: str
+    tool: str
+    identity: str | None = None
+    last_sync: float = 0.0
+    duration: float = 0.0
+    error_count: int = 0
+
+
+def get_state_path() -> Path:
+    """Get the sync-state database path."""
+    return config.get_config_dir() / "cache" / "sync-state.db"
+
+
+def _legacy_cache_dir() -> Path:
+    return config.get_config_dir() / "cache" / "resolved"
+
+
+# (path, (st_dev, st_ino), connection) of the open database, or None.
+_state: tuple[str, tuple[int, int], sqlite3.Connection] | None = None
+_lock = threading.RLock()
+
+
+def _file_id(path: Path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+def _connection(path: Path, *, drop_legacy: bool) -> sqlite3.Connection:
+    """Return the shared connection for *path*, opening it if needed.
+
+    Must be called with ``_lock`` held.
+    """
+    global _state
+    key = str(path)
+    file_id = _file_id(path)
+    if _state is not None and _state[0] == key and _state[1] == file_id:
+        return _state[2]
+    close()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    if file_id is None and drop_legacy:
+        # Old per-file hashes are keyed by sha256(scope) and can't be
+        # migrated; drop them so stale entries don't linger on disk.
+        shutil.rmtree(_legacy_cache_dir(), ignore_errors=True)
+    _state = (key, _file_id(path) or (0, 0), conn)
+    return conn
+
+
+def close() -> None:
+    """Close the shared connection (it is reopened on next use)."""
+    global _state
+    with _lock:
+        if _state is not None:
+            _state[2].close()
+            _state = None
+
+
+atexit.register(close)
+
+
+class SyncStateStore:
+    """SQLite-backed store of per-target sync state."""
+
+    def __init__(self, path: Path | None = None):
+        """Initialize with an optional database path override."""
+        self._path = path
+
+    @property
+    def path(self) -> Path:
+        """Get the database path."""
+        if self._path is not None:
+            return self._path
+        return get_state_path()
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Use the shared connection, serialized across threads."""
+        with _lock:
+            yield _connection(self.path, drop_legacy=self._path is None)
+
+    # ── Reads ──
+
+    def get(self, scope: str, tool: str) -> SyncStateEntry | None:
+        """Return the entry for one target, or None if never synced."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT scope, tool, identity, last_sync, duration, error_count "
+                "FROM sync_state WHERE scope = ? AND tool = ?",
+                (scope, str(tool)),
+            ).fetchone()
+        return SyncStateEntry(*row) if row else None
+
+    def get_identity(self, scope: str, tool: str) -> str | None:
+        """Return the identity last applied to a target, or None."""
+        entry = self.get(scope, tool)
+        return entry.identity if entry else None
+
+    def entries(self) -> list[SyncStateEntry]:
+        """Return all entries ordered by scope then tool."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT scope, tool, identity, last_sync, duration, error_count "
+                "FROM sync_state ORDER BY scope, tool"
+            ).fetchall()
+        return [SyncStateEntry(*row) for row in rows]
+
+    def identities(self) -> dict[tuple[str, str], str | None]:
+        """Return ``{(scope, tool): identity}`` for every known target."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT scope, tool, identity FROM sync_state").fetchall()
+        return {(scope, tool): identity for scope, tool, identity in rows}
+
+    def stale(self, expected: dict[tuple[str, str], str]) -> list[tuple[str, str]]:
+        """Return targets whose stored identity differs from *expected*.
+
+        Args:
+            expected: Mapping of ``(scope, tool)`` to the desired identity.
+        """
+        known = self.identities()
+        return [target for target, identity in expected.items() if known.get(target) != identity]
+
+    # ── Writes ──
+
+    def record(
+        self,
+        scope: str,
+        tool: str,
+        identity: str | None,
+        *,
+        duration: float = 0.0,
+        error_count: int = 0,
+    ) -> None:
+        """Record a sync attempt for one target.
+
+        Pass ``identity=None`` (e.g. for a failed sync) to keep the
+        previously applied identity while still updating timing/errors.
+        """
+        self.record_many(
+            [SyncStateEntry(scope, str(tool), identity, time.time(), duration, error_count)]
+        )
+
+    def record_many(self, entries: Iterable[SyncStateEntry]) -> None:
+        """Record several targets in one atomic transaction."""
+        now = time.time()
+        rows = [
+            (e.scope, str(e.tool), e.identity, e.last_sync or now, e.duration, e.error_count)
+            for e in entries
+        ]
+        if not rows:
+            return
+        with self._connect() as conn, conn:
+            conn.executemany(_UPSERT, rows)
+
+    def invalidate(self, targets: Iterable[tuple[str, str]]) -> None:
+        """Forget the applied identity for targets so they re-sync."""
+        rows = [(scope, str(tool)) for scope, tool in targets]
+        if not rows:
+            return
+        with self._connect() as conn, conn:
+            conn.executemany("DELETE FROM sync_state WHERE scope = ? AND tool = ?", rows)
+
+    def prune_scopes(self, keep: Iterable[str]) -> int:
+        """Delete entries for scopes not in *keep* (``"global"`` is always kept).
+
+        Returns the number of rows removed.
+        """
+        keep_set = set(keep) | {"global"}
+        with self._connect() as conn, conn:
+            scopes = [row[0] for row in conn.execute("SELECT DISTINCT scope FROM sync_state")]
+            drop = [(scope,) for scope in scopes if scope not in keep_set]
+            if not drop:
+                return 0
+            before = conn.total_changes
+            conn.executemany("DELETE FROM sync_state WHERE scope = ?", drop)
+            return conn.total_changes - before
+
+    def clear(self) -> None:
+        """Delete all entries."""
+        with self._connect() as conn, conn:
+            conn.execute("DELETE FROM sync_state")
+
+
+def prune_unregistered(cfg: dict | None = None) -> int:
+    """Drop sync state for directories that are no longer registered."""
+    if cfg is None:
+        cfg = config.load_global_config()
+    if not get_state_path().exists():
+        return 0
+    return SyncStateStore().prune_scopes(cfg.get("directories", {}).keys())
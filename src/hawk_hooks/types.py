@@ -6,8 +6,10 @@ the codebase. These are designed to replace magic strings with type-safe constan
 
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass, field
 from enum import Enum, auto
+from typing import Iterable
 
 
 # ── v2 enums ──────────────────────────────────────────────────────────────
@@ -52,6 +54,58 @@ class ComponentType(str, Enum):
         return self.value + "s"
 
 
+RESOLVED_FIELDS = ("skills", "hooks", "commands", "agents", "mcp", "prompts")
+
+
+class ItemTable:
+    """Interns item names per resolved-set field as bit positions.
+
+    A set of names becomes a Python int with one bit per interned name, so
+    set equality, union, difference and "does this target use X" checks are
+    single integer operations regardless of registry size. Bit positions
+    are process-local; never persist masks.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, dict[str, int]] = {f: {} for f in RESOLVED_FIELDS}
+        self._names: dict[str, list[str]] = {f: [] for f in RESOLVED_FIELDS}
+        self._lock = threading.Lock()
+
+    def bit(self, field_name: str, name: str) -> int:
+        """Return the bit position of *name* in *field_name*, interning it."""
+        ids = self._ids[field_name]
+        index = ids.get(name)
+        if index is None:
+            with self._lock:
+                index = ids.get(name)
+                if index is None:
+                    names = self._names[field_name]
+                    index = len(names)
+                    names.append(name)
+                    ids[name] = index
+        return index
+
+    def mask(self, field_name: str, names: Iterable[str]) -> int:
+        """Bitmask of *names* within *field_name*."""
+        result = 0
+        for name in names:
+            result |= 1 << self.bit(field_name, name)
+        return result
+
+    def names(self, field_name: str, mask: int) -> list[str]:
+        """Names set in *mask*, in interning order."""
+        table = self._names[field_name]
+        result: list[str] = []
+        while mask:
+            low = mask & -mask
+            result.append(table[low.bit_length() - 1])
+            mask ^= low
+        return result
+
+
+ITEM_TABLE = ItemTable()
+
+
 @dataclass
 class ResolvedSet:
     """Resolved set of components for a directory + tool combination."""
@@ -75,6 +129,21 @@ class ResolvedSet:
         }
         return mapping.get(component_type, [])
 
+    def masks(self, table: ItemTable | None = None) -> tuple[int, ...]:
+        """Interned bitmask per field, in ``RESOLVED_FIELDS`` order.
+
+        Order-insensitive and cheap to hash or compare, unlike the lists,
+        whose order stays authoritative (e.g. for hook chaining).
+        """
+        table = table or ITEM_TABLE
+        return tuple(table.mask(f, getattr(self, f)) for f in RESOLVED_FIELDS)
+
+    @classmethod
+    def from_masks(cls, masks: tuple[int, ...], table: ItemTable | None = None) -> "ResolvedSet":
+        """Build a set from ``masks()`` output (lists in interning order)."""
+        table = table or ITEM_TABLE
+        return cls(**{f: table.names(f, m) for f, m in zip(RESOLVED_FIELDS, masks)})
+
     def hash_key(self, registry_path: "Path | None" = None) -> str:
         """Deterministic hash for cache comparison.
 
@@ -95,6 +164,10 @@ class ResolvedSet:
         # Include file metadata when registry is available
         if registry_path is not None:
             from pathlib import Path as _Path
+
+            from .registry import Registry
+
+            index = Registry(_Path(registry_path)).names()
             field_dirs = [
                 ("skills", self.skills), ("hooks", self.hooks),
                 ("commands", self.commands), ("agents", self.agents),
@@ -102,7 +175,10 @@ class ResolvedSet:
             ]
             for dir_name, names in field_dirs:
                 for name in sorted(names):
-                    p = _Path(registry_path) / dir_name / name
+                    p = index.path(dir_name, name)
+                    if p is None:
+                        parts.append(f"{name}:missing")
+                        continue
                     try:
                         st = p.stat()
                         parts.append(f"{name}:{st.st_mtime_ns}:{st.st_size}")
@@ -34,6 +34,50 @@ class TestMixinsStandalone:
         data = json.loads(cfg_path.read_text())
         assert data["mcpServers"]["github"]["__hawk_managed"] is True
 
+    def test_merge_mcp_json_preserves_other_members_byte_for_byte(self, tmp_path) -> None:
+        cfg_path = tmp_path / ".claude.json"
+        projects = '{"/a": {"history": [1,2,  3], "x": "\\u00e9"}}'
+        original = (
+            '{\n  "numStartups": 7,\n'
+            '  "mcpServers": {"old": {"command": "o", "__hawk_managed": true},'
+            ' "manual": {"command": "m"}},\n'
+            f'  "projects": {projects}\n}}\n'
+        )
+        cfg_path.write_text(original)
+
+        MCPMixin._merge_mcp_json(cfg_path, {"github": {"command": "gh"}})
+
+        text = cfg_path.read_text()
+        assert text.startswith('{\n  "numStartups": 7,\n  "mcpServers": {\n')
+        assert text.endswith(f'  "projects": {projects}\n}}\n')
+        data = json.loads(text)
+        assert set(data["mcpServers"]) == {"manual", "github"}
+
+    def test_merge_mcp_json_inserts_missing_section(self, tmp_path) -> None:
+        cfg_path = tmp_path / ".claude.json"
+        cfg_path.write_text('{\n  "projects": {"/a": [1, 2]}\n}\n')
+
+        MCPMixin._merge_mcp_json(cfg_path, {"github": {"command": "gh"}})
+
+        text = cfg_path.read_text()
+        assert text.startswith('{\n  "projects": {"/a": [1, 2]},\n  "mcpServers": {')
+        assert json.loads(text)["mcpServers"]["github"]["command"] == "gh"
+
+        empty_path = tmp_path / "empty.json"
+        empty_path.write_text("{}")
+        MCPMixin._merge_mcp_json(empty_path, {})
+        assert json.loads(empty_path.read_text()) == {"mcpServers": {}}
+
+    def test_merge_mcp_json_skips_write_when_unchanged(self, tmp_path) -> None:
+        cfg_path = tmp_path / ".claude.json"
+        MCPMixin._merge_mcp_json(cfg_path, {"github": {"command": "gh"}})
+        cfg_path.write_text(cfg_path.read_text().replace("\n", "\r\n"))
+        before = cfg_path.read_bytes()
+
+        MCPMixin._merge_mcp_json(cfg_path, {"github": {"command": "gh"}})
+
+        assert cfg_path.read_bytes() == before
+
 
 class TestToolAdapterInheritance:
     def test_claude_adapter_has_mixin_methods(self) -> None:
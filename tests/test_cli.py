@@ -33,6 +33,15 @@ class TestArgParsing:
         args = self.parser.parse_args(["sync", "--dry-run"])
         assert args.dry_run is True
 
+    def test_sync_plan(self):
+        args = self.parser.parse_args(["sync", "--plan"])
+        assert args.plan is True
+
+    def test_sync_profile(self):
+        assert self.parser.parse_args(["sync"]).profile is None
+        assert self.parser.parse_args(["sync", "--profile"]).profile == ""
+        assert self.parser.parse_args(["sync", "--profile", "t.json"]).profile == "t.json"
+
     def test_sync_with_tool(self):
         args = self.parser.parse_args(["sync", "--tool", "claude"])
         assert args.tool == "claude"
@@ -183,6 +192,23 @@ class TestArgParsing:
         args = self.parser.parse_args(["prune", "--global"])
         assert args.globals_only is True
 
+    def test_search(self):
+        args = self.parser.parse_args(["search", "sql", "migrations", "--type", "skill"])
+        assert args.command == "search"
+        assert args.query == ["sql", "migrations"]
+        assert args.type == "skill"
+        assert args.limit == 20
+
+    def test_dedupe(self):
+        args = self.parser.parse_args(["dedupe"])
+        assert args.command == "dedupe"
+
+    def test_rollback(self):
+        args = self.parser.parse_args(["rollback", "--to", "2"])
+        assert args.command == "rollback"
+        assert args.to == 2
+        assert args.enable is False
+
     def test_config(self):
         args = self.parser.parse_args(["config"])
         assert args.command == "config"
@@ -452,6 +478,31 @@ class TestCmdNew:
         # File should be unchanged
         assert (registry_dir / "hooks" / "guard.py").read_text() == "existing"
 
+    def test_new_force_does_not_write_through_shared_blob(self, tmp_path, monkeypatch):
+        import argparse
+        import stat
+
+        from hawk_hooks import config
+        from hawk_hooks.cli import cmd_new
+        from hawk_hooks.registry import Registry
+
+        registry_dir = tmp_path / "registry"
+        hooks = registry_dir / "hooks"
+        hooks.mkdir(parents=True)
+        (hooks / "guard.sh").write_text("same")
+        (hooks / "other.sh").write_text("same")
+        Registry(registry_dir).dedupe()
+        monkeypatch.setattr(config, "get_registry_path", lambda cfg=None: registry_dir)
+
+        args = argparse.Namespace(
+            type="hook", name="guard", event="stop", lang=".sh", force=True,
+        )
+        cmd_new(args)
+
+        assert "hawk-hook: events=stop" in (hooks / "guard.sh").read_text()
+        assert (hooks / "other.sh").read_text() == "same"
+        assert not stat.S_IMODE((hooks / "other.sh").stat().st_mode) & 0o222
+
 
 class TestCmdMigratePrompts:
     def test_check_mode_outputs_summary(self, monkeypatch, capsys):
@@ -652,7 +703,7 @@ class TestCmdScanPackageRecording:
             if item["type"] == "mcp"
         }
         # Clashing items are auto-renamed with package prefix
-        assert item_names == {"test-pkg-figma.json", "test-pkg-linear.json", "goose.json"}
+        assert item_names == {"test-pkg--figma.json", "test-pkg--linear.json", "goose.json"}
 
     def test_scan_all_clashes_still_records_package(self, tmp_path, monkeypatch):
         """Scan can re-associate an existing package even with zero additions."""
@@ -697,7 +748,7 @@ class TestCmdScanPackageRecording:
             if item["type"] == "mcp"
         }
         # Clashing items are auto-renamed with package prefix
-        assert item_names == {"test-pkg-figma.json", "test-pkg-linear.json"}
+        assert item_names == {"test-pkg--figma.json", "test-pkg--linear.json"}
 
     def test_scan_partial_selection_preserves_existing_package_items(self, tmp_path, monkeypatch):
         """Partial re-scan should merge package ownership instead of replacing existing items."""
@@ -760,7 +811,7 @@ class TestCmdScanPackageRecording:
             if item["type"] == "prompt"
         }
         # Clashing old.md is auto-renamed with package prefix
-        assert item_names == {"old.md", "test-pkg-old.md", "new.md"}
+        assert item_names == {"old.md", "test-pkg--old.md", "new.md"}
 
     def test_scan_checks_conflicts_for_clashing_selected_package(self, tmp_path, monkeypatch):
         """Source-type conflict check covers selected package clashes too."""
@@ -876,7 +927,7 @@ class TestCmdScanPackageRecording:
         }
         assert old_names == {"figma.json"}
         # Clashing figma.json is auto-renamed with package prefix
-        assert new_names == {"goose.json", "new-pkg-figma.json"}
+        assert new_names == {"goose.json", "new-pkg--figma.json"}
 
     def test_scan_skips_unowned_clash_when_content_differs(self, tmp_path, monkeypatch):
         """Unowned clashing items are only claimed when contents match."""
@@ -921,7 +972,7 @@ class TestCmdScanPackageRecording:
             if item["type"] == "mcp"
         }
         # Clashing figma.json is auto-renamed with package prefix
-        assert new_names == {"goose.json", "new-pkg-figma.json"}
+        assert new_names == {"goose.json", "new-pkg--figma.json"}
 
     def test_scan_rejects_source_type_conflict(self, tmp_path, monkeypatch, capsys):
         """hawk scan refuses package source-type replacement (git -> local)."""
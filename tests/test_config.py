@@ -1,5 +1,7 @@
 """Tests for v2 YAML config management."""
 
+import os
+
 import pytest
 import yaml
 
@@ -23,6 +25,21 @@ class TestGlobalConfig:
         assert "claude" in cfg["tools"]
         assert cfg["global"]["skills"] == []
 
+    def test_cached_load_returns_private_copies(self, v2_env):
+        cfg = config.load_global_config()
+        cfg["global"]["skills"] = ["tdd"]
+        config.save_global_config(cfg)
+        path = config.get_global_config_path()
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+
+        first = config.load_global_config()
+        first["global"]["skills"].append("leaked")
+        assert config.load_global_config()["global"]["skills"] == ["tdd"]
+
+        first["global"]["skills"] = ["saved"]
+        config.save_global_config(first)
+        assert config.load_global_config()["global"]["skills"] == ["saved"]
+
     def test_save_and_load(self, v2_env):
         cfg = config.load_global_config()
         cfg["debug"] = True
@@ -56,6 +73,114 @@ class TestGlobalConfig:
         assert cfg["debug"] is False
 
 
+class TestConfigSnapshot:
+    @pytest.fixture
+    def parses(self, monkeypatch):
+        calls = []
+        real_load = yaml.load
+        monkeypatch.setattr(
+            yaml, "load", lambda f, **kwargs: calls.append(1) or real_load(f, **kwargs)
+        )
+        return calls
+
+    def _saved_and_aged(self):
+        cfg = config.load_global_config()
+        cfg["global"]["skills"] = ["tdd"]
+        config.save_global_config(cfg)
+        path = config.get_global_config_path()
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+        return path
+
+    def test_fresh_process_skips_yaml(self, v2_env, parses):
+        self._saved_and_aged()
+        config.load_global_config()
+        config.clear_cache()
+        assert config.get_snapshot_path().exists()
+
+        assert config.load_global_config()["global"]["skills"] == ["tdd"]
+        assert len(parses) == 1
+
+    def test_stale_stamp_is_reparsed(self, v2_env, parses):
+        path = self._saved_and_aged()
+        config.load_global_config()
+        config.clear_cache()
+
+        path.write_text(path.read_text().replace("- tdd", "- lint"))
+        os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+        assert config.load_global_config()["global"]["skills"] == ["lint"]
+        assert len(parses) == 2
+
+    def test_save_drops_entry(self, v2_env):
+        self._saved_and_aged()
+        config.load_global_config()
+        config.clear_cache()
+        key = str(config.get_global_config_path())
+        assert key in config._snapshot_entries()
+
+        config.save_global_config(config.load_global_config())
+        config.clear_cache()
+        assert key not in config._snapshot_entries()
+
+    def test_corrupt_snapshot_is_ignored(self, v2_env, parses):
+        self._saved_and_aged()
+        config.get_snapshot_path().parent.mkdir(exist_ok=True)
+        config.get_snapshot_path().write_text("{not json")
+        config.clear_cache()
+        assert config.load_global_config()["global"]["skills"] == ["tdd"]
+        assert len(parses) == 1
+
+
+class TestTransaction:
+    def test_batches_saves_into_one_write(self, v2_env, monkeypatch):
+        writes = []
+        real_dump = config._dump_yaml
+        monkeypatch.setattr(
+            config,
+            "_dump_yaml",
+            lambda data, path, **kw: writes.append(path) or real_dump(data, path, **kw),
+        )
+        with config.transaction():
+            for name in ("a", "b", "c"):
+                cfg = config.load_global_config()
+                cfg["global"]["skills"].append(name)
+                config.save_global_config(cfg)
+            assert writes == []
+        assert writes == [config.get_global_config_path()]
+        assert config.load_global_config()["global"]["skills"] == ["a", "b", "c"]
+
+    def test_exception_discards_changes(self, v2_env):
+        config.register_directory(v2_env / "kept")
+        with pytest.raises(RuntimeError):
+            with config.transaction() as tx:
+                tx.cfg["directories"] = {}
+                raise RuntimeError("boom")
+        assert str((v2_env / "kept").resolve()) in config.get_registered_directories()
+
+    def test_unchanged_does_not_write(self, v2_env):
+        with config.transaction():
+            config.load_global_config()
+        assert not config.get_global_config_path().exists()
+
+    def test_nested_joins_outer_and_backup(self, v2_env):
+        config.register_directory(v2_env / "old")
+        with config.transaction() as outer:
+            config.register_directory(v2_env / "new")
+            with config.transaction(backup=True) as inner:
+                assert inner is outer
+        backup = config.get_global_config_path().with_name("config.yaml.bak")
+        assert str((v2_env / "old").resolve()) in backup.read_text()
+        assert str((v2_env / "new").resolve()) not in backup.read_text()
+        assert str((v2_env / "new").resolve()) in config.get_registered_directories()
+
+    def test_writes_are_atomic_renames(self, v2_env):
+        config.save_global_config(config.load_global_config())
+        path = config.get_global_config_path()
+        inode = path.stat().st_ino
+        config.register_directory(v2_env / "proj")
+        assert path.stat().st_ino != inode
+        assert not list(v2_env.glob(".config.yaml.*.tmp"))
+
+
 class TestProfiles:
     def test_save_and_load(self, v2_env):
         data = {
@@ -104,6 +229,28 @@ class TestDirConfig:
     def test_load_missing_returns_none(self, tmp_path):
         assert config.load_dir_config(tmp_path / "nonexistent") is None
 
+    def test_stat_cache_returns_copies_and_sees_changes(self, v2_env, tmp_path, monkeypatch):
+        project = tmp_path / "my-project"
+        config.save_dir_config(project, {"skills": {"enabled": ["tdd"]}})
+        path = config.get_dir_config_path(project)
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+
+        parses = []
+        real_load = yaml.load
+        monkeypatch.setattr(
+            yaml, "load", lambda f, **kwargs: parses.append(1) or real_load(f, **kwargs)
+        )
+
+        first = config.load_dir_config(project)
+        first["skills"]["enabled"].append("mutated")
+        assert config.load_dir_config(project) == {"skills": {"enabled": ["tdd"]}}
+        assert len(parses) == 1
+
+        path.write_text("skills:\n  enabled: [lint]\n")
+        os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+        assert config.load_dir_config(project) == {"skills": {"enabled": ["lint"]}}
+        assert len(parses) == 2
+
 
 class TestDirectoryIndex:
     def test_register_and_list(self, v2_env, tmp_path):
@@ -205,6 +352,28 @@ class TestConfigChain:
         assert len(chain) == 1
         assert chain[0][0] == project_a.resolve()
 
+    def test_sibling_with_shared_name_prefix_excluded(self, v2_env, tmp_path):
+        project = tmp_path / "app"
+        sibling = tmp_path / "app-legacy"
+        for path in (project, sibling):
+            path.mkdir()
+            config.save_dir_config(path, {"skills": {"enabled": [path.name]}})
+            config.register_directory(path)
+
+        chain = config.get_config_chain(sibling, cfg=config.load_global_config())
+        assert [d for d, _ in chain] == [sibling.resolve()]
+
+    def test_non_normalized_index_keys_match(self, v2_env, tmp_path):
+        project = tmp_path / "project"
+        project.mkdir()
+        config.save_dir_config(project, {"skills": {"enabled": ["tdd"]}})
+        cfg = config.load_global_config()
+        cfg.setdefault("directories", {})[str(project.resolve()) + "/"] = {}
+        config.save_global_config(cfg)
+
+        chain = config.get_config_chain(project / "src")
+        assert [d for d, _ in chain] == [project.resolve()]
+
     def test_subdir_without_own_config(self, v2_env, tmp_path):
         """Subdir that isn't registered but is inside a registered parent."""
         root = tmp_path / "monorepo"
@@ -414,6 +583,52 @@ class TestPackages:
         assert len(loaded["pkg"]["items"]) == 1
 
 
+class TestPackageIndex:
+    @staticmethod
+    def _item(t, n):
+        return {"type": t, "name": n, "hash": "h"}
+
+    def test_record_and_remove_update_owners(self, v2_env):
+        config.record_package("a", "u", "c", [self._item("skill", "tdd")])
+        config.record_package("b", "u", "c", [self._item("skill", "tdd"), self._item("hook", "x")])
+        assert config.get_package_for_item("skill", "tdd") == "a"
+        assert config.get_package_for_item("hook", "x") == "b"
+
+        config.remove_package("a")
+        assert config.get_package_for_item("skill", "tdd") == "b"
+        config.record_package("b", "u", "c", [])
+        assert config.get_package_for_item("hook", "x") is None
+
+    def test_rerecord_keeps_package_order(self, v2_env):
+        config.record_package("a", "u", "c", [])
+        config.record_package("b", "u", "c", [self._item("skill", "tdd")])
+        config.record_package("a", "u", "c", [self._item("skill", "tdd")])
+        # Matches a linear scan of packages.yaml, where "a" comes first.
+        assert config.get_package_for_item("skill", "tdd") == "a"
+        assert config.get_package_index().owners[("skill", "tdd")] == ["a", "b"]
+
+    def test_duplicate_owner_rules(self, v2_env):
+        config.record_package("a", "u", "c", [self._item("skill", "tdd")])
+        config.record_package("b", "u", "c", [self._item("skill", "tdd")])
+        index = config.get_package_index()
+        assert index.owner("skill", "tdd") == "a"
+        assert index.last_owner("skill", "tdd") == "b"
+        assert index.owned_by("skill", "tdd", "b")
+        assert not index.owned_by("skill", "tdd", "c")
+
+    def test_persisted_index_avoids_loading_packages(self, v2_env, monkeypatch):
+        config.record_package("a", "u", "c", [self._item("skill", "tdd")])
+        config.clear_cache()
+        monkeypatch.setattr(config, "load_packages", lambda: pytest.fail("rebuilt index"))
+        assert config.get_package_for_item("skill", "tdd") == "a"
+        assert config.list_package_items("a") == [("skill", "tdd")]
+
+    def test_external_edit_rebuilds(self, v2_env):
+        config.record_package("a", "u", "c", [self._item("skill", "tdd")])
+        config.save_packages({"z": {"items": [self._item("skill", "tdd")]}})
+        assert config.get_package_for_item("skill", "tdd") == "z"
+
+
 class TestPackageNameFromUrl:
     def test_simple_url(self):
         assert config.package_name_from_url("https://github.com/user/my-repo") == "user/my-repo"
@@ -120,7 +120,7 @@ def test_download_clashes_without_replace_renames_item(monkeypatch, tmp_path):
     assert len(result.clashes) > 0
     assert any("hello" in c for c in result.clashes)
     # But the item was renamed and added
-    assert any("clash-test-hello.md" in a for a in result.added)
+    assert any("clash-test--hello.md" in a for a in result.added)
 
 
 def test_download_select_fn_cancel_returns_empty(monkeypatch, tmp_path):
@@ -178,3 +178,26 @@ def test_get_interactive_select_fn():
 
     fn = get_interactive_select_fn()
     assert callable(fn)
+
+
+def test_build_pkg_items_keeps_items_shared_with_another_package(monkeypatch, tmp_path):
+    """Re-downloading a package keeps items another package also lists."""
+    from hawk_hooks.download_service import _build_pkg_items
+    from hawk_hooks.downloader import ClassifiedItem
+    from hawk_hooks.registry import Registry
+    from hawk_hooks.types import ComponentType
+
+    _, registry_dir = _patch_config_paths(monkeypatch, tmp_path)
+    registry = Registry(registry_dir)
+    registry.ensure_dirs()
+    source = tmp_path / "tdd.md"
+    source.write_text("# TDD\n")
+    registry.add(ComponentType.SKILL, "tdd.md", source)
+    shared = [{"type": "skill", "name": "tdd.md", "hash": "h"}]
+    config.record_package("first", "u", "c", shared)
+    config.record_package("second", "u", "c", shared)
+
+    item = ClassifiedItem(component_type=ComponentType.SKILL, name="tdd.md", source_path=source)
+
+    assert [i["name"] for i in _build_pkg_items([item], registry, "second")] == ["tdd.md"]
+    assert _build_pkg_items([item], registry, "third") == []
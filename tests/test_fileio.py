@@ -0,0 +1,259 @@
+"""Tests for atomic write-if-changed helpers."""
+
+import os
+import stat
+
+from hawk_hooks import fileio
+from hawk_hooks.fileio import batched_fsync, write_text_if_changed
+
+
+def test_writes_new_file(tmp_path):
+    path = tmp_path / "sub" / "settings.json"
+    assert write_text_if_changed(path, "{}\n") is True
+    assert path.read_text() == "{}\n"
+
+
+def test_skips_identical_content(tmp_path):
+    path = tmp_path / "settings.json"
+    path.write_text("{}\n")
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+
+    assert write_text_if_changed(path, "{}\n") is False
+    assert path.stat().st_mtime_ns == 1_000_000_000
+
+
+def test_replaces_changed_content_and_keeps_mode(tmp_path):
+    path = tmp_path / "settings.json"
+    path.write_text("old")
+    path.chmod(0o640)
+
+    assert write_text_if_changed(path, "new") is True
+    assert path.read_text() == "new"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+    assert [p.name for p in tmp_path.iterdir()] == ["settings.json"]
+
+
+def test_mode_mismatch_forces_write(tmp_path):
+    path = tmp_path / "runner.sh"
+    path.write_text("#!/bin/sh\n")
+    path.chmod(0o644)
+
+    assert write_text_if_changed(path, "#!/bin/sh\n", mode=0o700) is True
+    assert stat.S_IMODE(path.stat().st_mode) == 0o700
+    assert write_text_if_changed(path, "#!/bin/sh\n", mode=0o700) is False
+
+
+def test_symlinked_config_is_written_through(tmp_path):
+    real = tmp_path / "dotfiles" / "settings.json"
+    real.parent.mkdir()
+    real.write_text("old")
+    link = tmp_path / "settings.json"
+    link.symlink_to(real)
+
+    write_text_if_changed(link, "new")
+
+    assert link.is_symlink()
+    assert real.read_text() == "new"
+
+
+def test_batched_fsync_flushes_written_directories_once(tmp_path, monkeypatch):
+    synced: list[str] = []
+    real_fsync_path = fileio._fsync_path
+    monkeypatch.setattr(
+        fileio,
+        "_fsync_path",
+        lambda path, directory=False: (
+            synced.append(path.name) or real_fsync_path(path, directory=directory)
+        ),
+    )
+
+    a = tmp_path / "a.json"
+    b = tmp_path / "b.json"
+    b.write_text("same")
+    with batched_fsync():
+        write_text_if_changed(a, "1")
+        write_text_if_changed(a, "2")
+        write_text_if_changed(b, "same")
+        assert synced == []
+
+    assert synced == [tmp_path.name]
+
+
+def test_temp_file_is_fsynced_before_rename(tmp_path, monkeypatch):
+    path = tmp_path / "settings.json"
+    events: list[str] = []
+    real_fsync, real_replace = os.fsync, os.replace
+    monkeypatch.setattr(os, "fsync", lambda fd: events.append("fsync") or real_fsync(fd))
+    monkeypatch.setattr(
+        os, "replace", lambda src, dst: events.append("replace") or real_replace(src, dst)
+    )
+
+    write_text_if_changed(path, "{}")
+
+    assert events == ["fsync", "replace"]
+    assert path.read_text() == "{}"
+
+
+def test_new_file_mode_uses_process_umask(tmp_path):
+    mask = os.umask(0)
+    os.umask(mask)
+    path = tmp_path / "new.json"
+    write_text_if_changed(path, "{}")
+    assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~mask
+
+
+def test_simulated_journal_records_ops_without_touching_disk(tmp_path):
+    config_path = tmp_path / "settings.json"
+    config_path.write_text("old\n")
+    link = tmp_path / "skills" / "tdd"
+    source = tmp_path / "registry" / "tdd"
+    source.mkdir(parents=True)
+
+    with fileio.journal(simulate=True) as recorder:
+        assert write_text_if_changed(config_path, "new\n") is True
+        assert fileio.read_text(config_path) == "new\n"
+        # A second identical write is a no-op against the overlay.
+        assert write_text_if_changed(config_path, "new\n") is False
+        fileio.make_symlink(source, link)
+        assert fileio.is_symlink(link)
+        assert [p.name for p in fileio.list_dir(tmp_path / "skills")] == ["tdd"]
+        assert fileio.remove_file(link) is True
+        assert not fileio.lexists(link)
+
+    assert config_path.read_text() == "old\n"
+    assert not (tmp_path / "skills").exists()
+    assert [op.action for op in recorder.ops] == ["write", "mkdir", "symlink", "remove"]
+    assert recorder.to_list()[0] == {
+        "action": "write",
+        "path": str(config_path),
+        "size": 4,
+        "mode": stat.S_IMODE(config_path.stat().st_mode),
+    }
+
+
+def test_journal_rolls_back_on_error(tmp_path):
+    changed = tmp_path / "settings.json"
+    changed.write_text("keep\n")
+    changed.chmod(0o640)
+    created = tmp_path / "new" / "runner.sh"
+    old_link = tmp_path / "old-link"
+    old_link.symlink_to(tmp_path / "somewhere")
+    tree = tmp_path / "launcher"
+    tree.mkdir()
+    (tree / "SKILL.md").write_text("skill")
+
+    try:
+        with fileio.journal():
+            write_text_if_changed(changed, "broken\n")
+            write_text_if_changed(created, "#!/bin/sh\n")
+            fileio.remove_file(old_link)
+            fileio.remove_tree(tree)
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert changed.read_text() == "keep\n"
+    assert stat.S_IMODE(changed.stat().st_mode) == 0o640
+    assert not created.exists()
+    assert not created.parent.exists()
+    assert os.readlink(old_link) == str(tmp_path / "somewhere")
+    assert (tree / "SKILL.md").read_text() == "skill"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["launcher", "old-link", "settings.json"]
+
+
+def test_journal_parks_overwritten_files_without_reading(tmp_path, monkeypatch):
+    path = tmp_path / "settings.json"
+    path.write_text("keep\n")
+    inode = path.stat().st_ino
+
+    def no_read(self):
+        raise AssertionError(f"read {self}")
+
+    with fileio.journal() as recorder:
+        monkeypatch.setattr(type(path), "read_bytes", no_read)
+        write_text_if_changed(path, "broken, and longer\n")
+        monkeypatch.undo()
+        recorder.rollback()
+
+    assert path.read_text() == "keep\n"
+    assert path.stat().st_ino == inode
+    assert [p.name for p in tmp_path.iterdir()] == ["settings.json"]
+
+
+def test_stale_rollback_holders_are_removed(tmp_path):
+    target = tmp_path / "tool"
+    target.mkdir()
+    path = target / "settings.json"
+    path.write_text("keep\n")
+    log = tmp_path / "locks" / "target.holders"
+
+    with fileio.journal(holders_log=log):
+        write_text_if_changed(path, "new\n")
+        assert log.exists()
+    assert not log.exists()
+
+    # A journal whose process was killed before it committed.
+    killed = fileio.FileJournal(holders_log=log)
+    killed._remember(path)
+    assert len(list(target.iterdir())) == 2
+
+    assert fileio.remove_stale_holders(log) == 1
+    assert [p.name for p in target.iterdir()] == ["settings.json"]
+    assert not log.exists()
+    assert fileio.remove_stale_holders(log) == 0
+
+
+def test_points_into_follows_simulated_ops(tmp_path):
+    registry = tmp_path / "registry"
+    (registry / "tdd").mkdir(parents=True)
+    roots = fileio.link_roots(registry)
+    ours = tmp_path / "ours"
+    ours.symlink_to(registry / "tdd")
+    foreign = tmp_path / "foreign"
+    foreign.write_text("mine")
+
+    assert fileio.points_into(ours, roots)
+    assert not fileio.points_into(foreign, roots)
+    with fileio.journal(simulate=True):
+        fileio.remove_file(foreign)
+        fileio.make_symlink(registry / "tdd", foreign)
+        fileio.remove_file(ours)
+        assert fileio.points_into(foreign, roots)
+        assert not fileio.points_into(ours, roots)
+
+
+def test_journal_commit_discards_parked_trees(tmp_path):
+    tree = tmp_path / "launcher"
+    tree.mkdir()
+    (tree / "SKILL.md").write_text("skill")
+
+    with fileio.journal():
+        assert fileio.remove_tree(tree) is True
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_links_into_matches_readlink_prefixes(tmp_path):
+    registry = tmp_path / "registry" / "skills"
+    (registry / "tdd").mkdir(parents=True)
+    alias = tmp_path / "alias"
+    alias.symlink_to(tmp_path / "registry")
+    comp_dir = tmp_path / "skills"
+    comp_dir.mkdir()
+    (comp_dir / "tdd").symlink_to(registry / "tdd")
+    (comp_dir / "via-alias").symlink_to(alias / "skills" / "tdd")
+    (comp_dir / "relative").symlink_to(os.path.join("..", "registry", "skills", "tdd"))
+    (comp_dir / "dangling").symlink_to(registry / "gone")
+    (comp_dir / "foreign").symlink_to(tmp_path / "registry-other")
+    (comp_dir / "plain").write_text("not a link")
+
+    roots = fileio.link_roots(alias / "skills")
+    links = sorted(fileio.links_into(comp_dir, roots))
+    assert links == ["dangling", "relative", "tdd", "via-alias"]
+    assert fileio.links_into(tmp_path / "missing", roots) == []
+
+    with fileio.journal(simulate=True):
+        fileio.remove_file(comp_dir / "tdd")
+        fileio.make_symlink(registry / "tdd", comp_dir / "new")
+        links = sorted(fileio.links_into(comp_dir, roots))
+        assert links == ["dangling", "new", "relative", "via-alias"]
@@ -0,0 +1,171 @@
+"""Tests for generational registry snapshots."""
+
+import pytest
+
+from hawk_hooks import config, generations
+from hawk_hooks.registry import Registry
+from hawk_hooks.types import ComponentType
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    config_dir = tmp_path / "hawk-hooks"
+    config_dir.mkdir()
+    monkeypatch.setattr(config, "get_config_dir", lambda: config_dir)
+    registry = Registry(config_dir / "registry")
+    registry.ensure_dirs()
+    return tmp_path, registry
+
+
+def _skill(root, text):
+    skill = root / "src-skill"
+    skill.mkdir(exist_ok=True)
+    (skill / "SKILL.md").write_text(text)
+    (skill / "ref.md").write_text("shared")
+    return skill
+
+
+class TestEnable:
+    def test_moves_registry_into_first_generation(self, env):
+        tmp_path, registry = env
+        registry.add(ComponentType.SKILL, "s", _skill(tmp_path, "v1"))
+
+        assert generations.enable(registry.path) == 1
+        assert registry.path.is_symlink()
+        assert generations.active_generation(registry.path) == 1
+        assert (registry.path / "skills" / "s" / "SKILL.md").read_text() == "v1"
+        assert generations.enable(registry.path) == 1
+
+    def test_not_enabled(self, env):
+        _, registry = env
+        assert generations.active_generation(registry.path) is None
+        with pytest.raises(generations.GenerationError):
+            generations.snapshot(registry.path)
+
+
+class TestSnapshotAndRollback:
+    def test_snapshot_keeps_previous_content(self, env):
+        tmp_path, registry = env
+        registry.add(ComponentType.SKILL, "s", _skill(tmp_path, "v1"))
+        generations.enable(registry.path)
+
+        assert generations.snapshot(registry.path) == 2
+        registry.replace(ComponentType.SKILL, "s", _skill(tmp_path, "v2"))
+
+        gen1 = generations.generations_dir(registry.path) / "1"
+        assert (gen1 / "skills" / "s" / "SKILL.md").read_text() == "v1"
+        assert (registry.path / "skills" / "s" / "SKILL.md").read_text() == "v2"
+
+        assert generations.rollback(registry.path) == 1
+        assert (registry.path / "skills" / "s" / "SKILL.md").read_text() == "v1"
+        assert generations.list_generations(registry.path) == [1, 2]
+
+    def test_in_place_edit_does_not_reach_older_generation(self, env):
+        tmp_path, registry = env
+        path = registry.add(ComponentType.SKILL, "s", _skill(tmp_path, "v1"))
+        generations.enable(registry.path)
+        generations.snapshot(registry.path)
+
+        (path / "SKILL.md").write_text("edited in place")
+
+        gen1 = generations.generations_dir(registry.path) / "1"
+        assert (gen1 / "skills" / "s" / "SKILL.md").read_text() == "v1"
+        generations.rollback(registry.path)
+        assert (path / "SKILL.md").read_text() == "v1"
+
+    def test_blob_links_stay_shared(self, env):
+        tmp_path, registry = env
+        registry.dedupe()
+        path = registry.add(ComponentType.SKILL, "s", _skill(tmp_path, "v1"))
+        generations.enable(registry.path)
+        generations.snapshot(registry.path)
+
+        gen1 = generations.generations_dir(registry.path) / "1"
+        assert (gen1 / "skills" / "s" / "SKILL.md").stat().st_ino == (
+            (path / "SKILL.md").stat().st_ino
+        )
+
+    def test_rollback_restores_package_index(self, env):
+        _, registry = env
+        generations.enable(registry.path)
+        config.save_packages({"pkg": {"commit": "old", "items": []}})
+        generations.snapshot(registry.path)
+        config.save_packages({"pkg": {"commit": "new", "items": []}})
+
+        generations.rollback(registry.path)
+        assert config.load_packages()["pkg"]["commit"] == "old"
+
+        generations.rollback(registry.path, to=2)
+        assert config.load_packages()["pkg"]["commit"] == "new"
+
+    def test_rollback_without_older_generation(self, env):
+        _, registry = env
+        generations.enable(registry.path)
+        with pytest.raises(generations.GenerationError):
+            generations.rollback(registry.path)
+        with pytest.raises(generations.GenerationError):
+            generations.rollback(registry.path, to=7)
+
+
+class TestPruneAndDiscard:
+    def test_snapshot_prunes_old_generations(self, env):
+        _, registry = env
+        generations.enable(registry.path)
+        for _ in range(4):
+            generations.snapshot(registry.path, keep=3)
+        assert generations.list_generations(registry.path) == [3, 4, 5]
+        assert generations.active_generation(registry.path) == 5
+
+    def test_prune_never_removes_active(self, env):
+        _, registry = env
+        generations.enable(registry.path)
+        generations.snapshot(registry.path)
+        generations.snapshot(registry.path)
+        generations.rollback(registry.path, to=1)
+
+        assert generations.prune(registry.path, keep=1) == [2]
+        assert generations.list_generations(registry.path) == [1, 3]
+
+    def test_prune_collects_blobs_only_old_generations_used(self, env):
+        tmp_path, registry = env
+        registry.dedupe()
+        generations.enable(registry.path)
+        registry.add(ComponentType.SKILL, "s", _skill(tmp_path, "v1"))
+        generations.snapshot(registry.path)
+        registry.remove(ComponentType.SKILL, "s")
+        objects = registry.path / ".objects"
+        assert [p for p in objects.rglob("*") if p.is_file()]
+
+        assert generations.prune(registry.path, keep=1) == [1]
+        assert not [p for p in objects.rglob("*") if p.is_file()]
+
+    def test_failed_update_discards_generation(self, env, monkeypatch):
+        from hawk_hooks import package_service
+
+        tmp_path, registry = env
+        monkeypatch.setattr(config, "get_registry_path", lambda cfg=None: registry.path)
+        generations.enable(registry.path)
+        config.save_packages(
+            {"pkg": {"url": "", "path": str(tmp_path), "commit": "old", "items": []}}
+        )
+
+        def boom(_path):
+            config.save_packages({"pkg": {"commit": "half", "items": []}})
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(package_service, "scan_directory", boom)
+        with pytest.raises(RuntimeError):
+            package_service.update_packages(sync_on_change=False)
+
+        assert generations.active_generation(registry.path) == 1
+        assert generations.list_generations(registry.path) == [1]
+        assert config.load_packages()["pkg"]["commit"] == "old"
+
+    def test_discard_reactivates_previous(self, env):
+        _, registry = env
+        generations.enable(registry.path)
+        number = generations.snapshot(registry.path)
+
+        generations.discard(registry.path, number, 1)
+        assert generations.active_generation(registry.path) == 1
+        assert generations.list_generations(registry.path) == [1]
@@ -0,0 +1,105 @@
+"""Tests for cross-process config/target locks."""
+
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from hawk_hooks import config, locks
+from hawk_hooks.types import Tool
+
+
+@pytest.fixture
+def lock_env(tmp_path, monkeypatch):
+    config_dir = tmp_path / "hawk-hooks"
+    config_dir.mkdir()
+    monkeypatch.setattr(config, "get_config_dir", lambda: config_dir)
+    return config_dir
+
+
+def _hold_in_subprocess(path, seconds=2.0):
+    code = (
+        "import fcntl, os, sys, time\n"
+        f"fd = os.open({str(path)!r}, os.O_RDWR | os.O_CREAT)\n"
+        "fcntl.flock(fd, fcntl.LOCK_EX)\n"
+        "print('locked', flush=True)\n"
+        f"time.sleep({seconds})\n"
+    )
+    proc = subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE, text=True)
+    assert proc.stdout.readline().strip() == "locked"
+    return proc
+
+
+def test_lock_is_reentrant_within_thread(lock_env):
+    with locks.config_lock():
+        with locks.config_lock(timeout=0):
+            pass
+        assert not locks.is_locked(locks.get_locks_dir() / "config.lock")
+
+
+def test_lock_excludes_other_processes(lock_env):
+    path = locks.target_lock_path("global", "claude")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    proc = _hold_in_subprocess(path)
+    try:
+        assert locks.is_locked(path)
+        with pytest.raises(locks.LockTimeoutError):
+            with locks.target_lock("global", "claude", timeout=0.1):
+                pass
+        # Independent targets are not blocked.
+        with locks.target_lock("global", "gemini", timeout=0.1):
+            pass
+    finally:
+        proc.kill()
+        proc.wait()
+
+    with locks.target_lock("global", "claude", timeout=1):
+        pass
+
+
+def test_waiting_sync_coalesces_with_concurrent_apply(lock_env, tmp_path, monkeypatch):
+    from hawk_hooks.adapters.claude import ClaudeAdapter
+    from hawk_hooks.registry import Registry
+    from hawk_hooks.sync import _read_cached_hash, _write_cached_hash, sync_global
+    from hawk_hooks.sync_state import SyncStateStore
+
+    registry = Registry(lock_env / "registry")
+    registry.ensure_dirs()
+    cfg = config.load_global_config()
+    cfg["registry_path"] = str(registry.path)
+    config.save_global_config(cfg)
+
+    claude_dir = tmp_path / "fake-claude"
+    claude_dir.mkdir()
+    monkeypatch.setattr(ClaudeAdapter, "get_global_dir", lambda self: claude_dir)
+
+    sync_global(tools=[Tool.CLAUDE])
+    identity = _read_cached_hash("global", Tool.CLAUDE)
+    SyncStateStore().invalidate([("global", "claude")])
+
+    calls = {"count": 0}
+    original_sync = ClaudeAdapter.sync
+
+    def _counting_sync(self, resolved, target_dir, registry_path):
+        calls["count"] += 1
+        return original_sync(self, resolved, target_dir, registry_path)
+
+    monkeypatch.setattr(ClaudeAdapter, "sync", _counting_sync)
+
+    holding = threading.Event()
+
+    def _other_writer():
+        with locks.target_lock("global", "claude"):
+            holding.set()
+            time.sleep(0.2)
+            _write_cached_hash("global", Tool.CLAUDE, identity)
+
+    writer = threading.Thread(target=_other_writer)
+    writer.start()
+    holding.wait()
+    sync_global(tools=[Tool.CLAUDE])
+    writer.join()
+
+    assert calls["count"] == 0
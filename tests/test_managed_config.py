@@ -87,3 +87,64 @@ def test_strip_all_handles_crlf_line_endings():
     stripped = TomlBlockDriver.strip_all(text)
     assert "hawk-hooks managed" not in stripped
     assert "[manual]" in stripped
+
+
+def test_apply_batches_ops_into_single_write(tmp_path: Path, monkeypatch):
+    path = tmp_path / "config.toml"
+    path.write_text("[manual]\nx = true\n")
+
+    writes: list[str] = []
+    import hawk_hooks.managed_config as managed_config
+
+    real_write = managed_config.write_text_if_changed
+    monkeypatch.setattr(
+        managed_config,
+        "write_text_if_changed",
+        lambda p, text: writes.append(text) or real_write(p, text),
+    )
+
+    result = TomlBlockDriver.apply(
+        [
+            ManagedConfigOp(
+                file=path, unit_id=f"unit-{i}", action="upsert", payload=f"[t{i}]\nv = {i}"
+            )
+            for i in range(5)
+        ]
+        + [ManagedConfigOp(file=path, unit_id="missing", action="remove")]
+    )
+
+    assert len(writes) == 1
+    assert result.applied == [f"unit-{i}" for i in range(5)]
+    assert [r.status for r in result.ops] == ["applied"] * 5 + ["unchanged"]
+    assert "[manual]" in path.read_text()
+
+
+def test_apply_rejects_invalid_toml_without_writing(tmp_path: Path):
+    path = tmp_path / "config.toml"
+    original = "[features]\nfoo = true\n"
+    path.write_text(original)
+
+    result = TomlBlockDriver.apply(
+        [
+            ManagedConfigOp(file=path, unit_id="ok", action="upsert", payload="[other]\na = 1"),
+            ManagedConfigOp(
+                file=path, unit_id="dup", action="upsert", payload="[features]\nmulti_agent = true"
+            ),
+        ]
+    )
+
+    assert path.read_text() == original
+    assert not result.applied
+    assert [r.status for r in result.ops] == ["error", "error"]
+    assert all("invalid TOML" in e for e in result.errors)
+
+
+def test_upsert_unchanged_block_keeps_file_identical(tmp_path: Path):
+    path = tmp_path / "config.toml"
+    TomlBlockDriver.upsert(path, "unit-a", "a = 1")
+    TomlBlockDriver.upsert(path, "unit-b", "b = 2")
+    before = path.read_text()
+
+    TomlBlockDriver.upsert(path, "unit-a", "a = 1")
+
+    assert path.read_text() == before
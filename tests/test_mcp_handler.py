@@ -110,6 +110,17 @@ class TestList:
         result = run(handle_action({"action": "list", "type": "invalid"}))
         assert "error" in result
 
+    def test_list_with_query(self, hawk_env):
+        skills = hawk_env["registry_dir"] / "skills"
+        (skills / "sql-migrations.md").write_text("Write reversible database migrations.")
+        (skills / "tdd.md").write_text("Red, green, refactor. Mention a database once.")
+        (skills / "other.md").write_text("Unrelated.")
+
+        result = run(handle_action({"action": "list", "query": "database migration"}))
+        items = result["components"]["skills"]
+        assert [item["name"] for item in items] == ["sql-migrations.md", "tdd.md"]
+        assert items[0]["score"] > items[1]["score"]
+
 
 # ── add ──────────────────────────────────────────────────────────────────
 
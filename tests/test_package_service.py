@@ -15,7 +15,7 @@ from hawk_hooks.package_service import (
     update_packages,
 )
 from hawk_hooks.registry import Registry
-from hawk_hooks.types import ComponentType
+from hawk_hooks.types import ComponentType, Tool
 
 
 def _patch_config_paths(monkeypatch, tmp_path: Path) -> tuple[Path, Path]:
@@ -205,19 +205,73 @@ def test_update_packages_prune_only_removal_triggers_sync(monkeypatch, tmp_path)
         lambda _path: "same",
     )
 
-    sync_calls: list[bool] = []
+    cfg = config.load_global_config()
+    cfg["global"]["skills"] = ["old"]
+    cfg["tools"] = {t: {"enabled": t == "claude"} for t in cfg["tools"]}
+    config.save_global_config(cfg)
+
+    sync_calls: list[list] = []
     monkeypatch.setattr(
-        "hawk_hooks.sync.sync_all",
-        lambda force=False: sync_calls.append(force) or {},
+        "hawk_hooks.sync.sync_targets",
+        lambda targets: sync_calls.append(list(targets)) or {},
     )
 
     report = update_packages(prune=True, sync_on_change=True, log=lambda _msg: None)
 
     assert report.any_changes is True
-    assert sync_calls == [True]
+    assert sync_calls == [[("global", Tool.CLAUDE)]]
     assert registry.get_path(ComponentType.SKILL, "old") is None
 
 
+def test_update_packages_skips_sync_when_changed_item_unused(monkeypatch, tmp_path):
+    _patch_config_paths(monkeypatch, tmp_path)
+
+    registry = Registry(config.get_registry_path())
+    registry.ensure_dirs()
+
+    local_source = tmp_path / "local-pkg"
+    local_source.mkdir()
+    src_tdd = tmp_path / "src" / "tdd"
+    src_tdd.mkdir(parents=True)
+    (src_tdd / "SKILL.md").write_text("# TDD v2")
+    registry.add(ComponentType.SKILL, "tdd", src_tdd)
+
+    config.save_packages({
+        "local-pkg": {
+            "url": "",
+            "path": str(local_source),
+            "installed": "2026-02-23",
+            "commit": "",
+            "items": [{"type": "skill", "name": "tdd", "hash": "oldhash"}],
+        }
+    })
+
+    monkeypatch.setattr(
+        "hawk_hooks.package_service.scan_directory",
+        lambda _path: ClassifiedContent(
+            items=[
+                ClassifiedItem(
+                    component_type=ComponentType.SKILL,
+                    name="tdd",
+                    source_path=src_tdd,
+                )
+            ]
+        ),
+    )
+    monkeypatch.setattr("hawk_hooks.config.hash_registry_item", lambda _path: "newhash")
+
+    sync_calls: list[list] = []
+    monkeypatch.setattr(
+        "hawk_hooks.sync.sync_targets",
+        lambda targets: sync_calls.append(list(targets)) or {},
+    )
+
+    report = update_packages(sync_on_change=True, log=lambda _msg: None)
+
+    assert report.any_changes is True
+    assert sync_calls == []
+
+
 def test_update_packages_skips_malformed_package_item(monkeypatch, tmp_path):
     _patch_config_paths(monkeypatch, tmp_path)
 
@@ -256,3 +310,104 @@ def test_update_packages_skips_malformed_package_item(monkeypatch, tmp_path):
 
     assert report.any_changes is True
     assert any("malformed package item" in line for line in lines)
+
+
+def test_update_packages_namespaces_items_owned_by_other_packages(monkeypatch, tmp_path):
+    _patch_config_paths(monkeypatch, tmp_path)
+    monkeypatch.setattr("hawk_hooks.sync.sync_targets", lambda targets: {})
+
+    registry = Registry(config.get_registry_path())
+    registry.ensure_dirs()
+
+    local_source = tmp_path / "local-pkg"
+    local_source.mkdir()
+    theirs = tmp_path / "theirs.md"
+    theirs.write_text("other package")
+    registry.add(ComponentType.AGENT, "reviewer.md", theirs)
+    ours = tmp_path / "src" / "reviewer.md"
+    ours.parent.mkdir()
+    ours.write_text("local package")
+
+    config.save_packages({
+        "other": {
+            "url": "https://example.com/other.git",
+            "installed": "2026-02-24",
+            "commit": "abc",
+            "items": [{"type": "agent", "name": "reviewer.md", "hash": "h"}],
+        },
+        "org/local-pkg": {
+            "url": "",
+            "path": str(local_source),
+            "installed": "2026-02-24",
+            "commit": "",
+            "items": [],
+        },
+    })
+
+    monkeypatch.setattr(
+        "hawk_hooks.package_service.scan_directory",
+        lambda _path: ClassifiedContent(
+            items=[
+                ClassifiedItem(
+                    component_type=ComponentType.AGENT,
+                    name="reviewer.md",
+                    source_path=ours,
+                )
+            ]
+        ),
+    )
+
+    update_packages(package="org/local-pkg", sync_on_change=False, log=lambda _msg: None)
+
+    agents = registry.path / "agents"
+    assert (agents / "reviewer.md").read_text() == "other package"
+    assert (agents / "local-pkg--reviewer.md").read_text() == "local package"
+    items = config.load_packages()["org/local-pkg"]["items"]
+    assert [i["name"] for i in items] == ["local-pkg--reviewer.md"]
+
+
+def test_update_packages_keeps_legacy_prefix_renamed_items(monkeypatch, tmp_path):
+    _patch_config_paths(monkeypatch, tmp_path)
+
+    registry = Registry(config.get_registry_path())
+    registry.ensure_dirs()
+
+    local_source = tmp_path / "local-pkg"
+    local_source.mkdir()
+    ours = tmp_path / "src" / "reviewer.md"
+    ours.parent.mkdir()
+    ours.write_text("v1")
+    registry.add(ComponentType.AGENT, "local-pkg-reviewer.md", ours)
+    ours.write_text("v2")
+
+    config.save_packages({
+        "local-pkg": {
+            "url": "",
+            "path": str(local_source),
+            "installed": "2026-02-24",
+            "commit": "",
+            "items": [{"type": "agent", "name": "local-pkg-reviewer.md", "hash": "h"}],
+        },
+    })
+    monkeypatch.setattr(
+        "hawk_hooks.package_service.scan_directory",
+        lambda _path: ClassifiedContent(
+            items=[
+                ClassifiedItem(
+                    component_type=ComponentType.AGENT,
+                    name="reviewer.md",
+                    source_path=ours,
+                )
+            ]
+        ),
+    )
+
+    lines: list[str] = []
+    update_packages(sync_on_change=False, log=lines.append)
+
+    agents = registry.path / "agents"
+    assert sorted(p.name for p in agents.iterdir()) == ["local-pkg-reviewer.md"]
+    assert (agents / "local-pkg-reviewer.md").read_text() == "v2"
+    assert not any("removed upstream" in line for line in lines)
+    items = config.load_packages()["local-pkg"]["items"]
+    assert [i["name"] for i in items] == ["local-pkg-reviewer.md"]
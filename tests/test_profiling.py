@@ -0,0 +1,70 @@
+"""Tests for sync phase profiling."""
+
+import json
+
+from hawk_hooks import config
+from hawk_hooks.profiling import profile, span
+from hawk_hooks.registry import Registry
+from hawk_hooks.types import ComponentType, Tool
+
+
+def test_span_is_noop_without_profiler():
+    with span("outside"):
+        pass
+    with profile() as profiler:
+        pass
+    assert profiler.spans == []
+
+
+def test_summary_and_chrome_trace(tmp_path):
+    with profile() as profiler:
+        for _ in range(3):
+            with span("resolve", tool="claude"):
+                pass
+        with span("hash_key"):
+            pass
+
+    stats = {s.name: s for s in profiler.summary()}
+    assert stats["resolve"].count == 3
+    assert stats["hash_key"].count == 1
+    assert "resolve" in profiler.format_summary()
+
+    trace_path = tmp_path / "trace.json"
+    profiler.write_chrome_trace(trace_path)
+    doc = json.loads(trace_path.read_text())
+    events = doc["traceEvents"]
+    assert len(events) == 4
+    assert {e["ph"] for e in events} == {"X"}
+    assert events[0]["args"] == {"tool": "claude"}
+
+
+def test_sync_records_phase_spans(tmp_path, monkeypatch):
+    from hawk_hooks.adapters.claude import ClaudeAdapter
+    from hawk_hooks.sync import sync_global
+
+    config_dir = tmp_path / "hawk-hooks"
+    config_dir.mkdir()
+    monkeypatch.setattr(config, "get_config_dir", lambda: config_dir)
+    registry = Registry(config_dir / "registry")
+    registry.ensure_dirs()
+    skill = tmp_path / "src" / "tdd"
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text("# TDD")
+    registry.add(ComponentType.SKILL, "tdd", skill)
+    cfg = config.load_global_config()
+    cfg["registry_path"] = str(registry.path)
+    cfg["global"]["skills"] = ["tdd"]
+    config.save_global_config(cfg)
+
+    claude_dir = tmp_path / "fake-claude"
+    claude_dir.mkdir()
+    monkeypatch.setattr(ClaudeAdapter, "get_global_dir", lambda self: claude_dir)
+
+    with profile() as profiler:
+        sync_global(tools=[Tool.CLAUDE])
+
+    names = {s.name for s in profiler.spans}
+    assert {"config_load", "resolve", "hash_key", "sync_target", "sync_component",
+            "register_hooks", "mcp_write"} <= names
+    components = {s.args["component"] for s in profiler.spans if s.name == "sync_component"}
+    assert components == {"skills", "agents", "prompts"}
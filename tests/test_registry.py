@@ -2,6 +2,7 @@
 
 import pytest
 
+from hawk_hooks.object_store import ObjectStore
 from hawk_hooks.registry import Registry
 from hawk_hooks.types import ComponentType
 
@@ -180,3 +181,185 @@ class TestClashDetection:
 
     def test_no_clash(self, registry):
         assert registry.detect_clash(ComponentType.SKILL, "new-skill.md") is False
+
+
+class TestObjectStore:
+    @pytest.fixture
+    def cas(self, registry):
+        registry.dedupe()
+        return registry
+
+    def _skill(self, tmp_path, name, body="shared"):
+        src = tmp_path / "src" / name
+        (src / "refs").mkdir(parents=True)
+        (src / "SKILL.md").write_text(body)
+        (src / "refs" / "notes.md").write_text("notes")
+        return src
+
+    def test_identical_files_share_one_blob(self, cas, tmp_path):
+        a = cas.add(ComponentType.SKILL, "a", self._skill(tmp_path, "a"))
+        b = cas.add(ComponentType.SKILL, "b", self._skill(tmp_path, "b"))
+        assert (a / "SKILL.md").stat().st_ino == (b / "SKILL.md").stat().st_ino
+        assert (b / "refs" / "notes.md").read_text() == "notes"
+
+    def test_remove_drops_unreferenced_blobs(self, cas, tmp_path):
+        cas.add(ComponentType.SKILL, "a", self._skill(tmp_path, "a"))
+        cas.add(ComponentType.SKILL, "b", self._skill(tmp_path, "b", body="only b"))
+        objects = cas.path / ".objects"
+        assert len([p for p in objects.rglob("*") if p.is_file()]) == 3
+
+        cas.remove(ComponentType.SKILL, "b")
+        assert len([p for p in objects.rglob("*") if p.is_file()]) == 2
+        cas.replace(ComponentType.SKILL, "a", self._skill(tmp_path, "a2", body="new"))
+        assert (cas.path / "skills" / "a" / "SKILL.md").read_text() == "new"
+        assert len([p for p in objects.rglob("*") if p.is_file()]) == 2
+
+    def test_executable_bit_preserved(self, cas, tmp_path):
+        hook = tmp_path / "h.py"
+        hook.write_text("print(1)")
+        hook.chmod(0o755)
+        path = cas.add(ComponentType.HOOK, "h.py", hook)
+        assert path.stat().st_mode & 0o111
+
+    def test_hash_matches_plain_copy(self, registry, tmp_path):
+        from hawk_hooks import config
+
+        src = self._skill(tmp_path, "a")
+        expected = config.hash_registry_item(src)
+        registry.dedupe()
+        path = registry.add(ComponentType.SKILL, "a", src)
+        assert config.hash_registry_item(path) == expected
+
+    def test_detach_gives_private_writable_copy(self, cas, tmp_path):
+        a = cas.add(ComponentType.SKILL, "a", self._skill(tmp_path, "a"))
+        b = cas.add(ComponentType.SKILL, "b", self._skill(tmp_path, "b"))
+
+        assert cas.detach(a) == 2
+        (a / "SKILL.md").write_text("edited")
+        assert (b / "SKILL.md").read_text() == "shared"
+        assert (a / "refs" / "notes.md").read_text() == "notes"
+        assert cas.detach(a) == 0
+        assert cas.detach(tmp_path / "src" / "a") == 0
+
+    def test_detach_releases_orphaned_blobs(self, cas, tmp_path):
+        a = cas.add(ComponentType.SKILL, "a", self._skill(tmp_path, "a", body="only a"))
+        objects = cas.path / ".objects"
+        assert len([p for p in objects.rglob("*") if p.is_file()]) == 2
+
+        cas.detach(a / "SKILL.md")
+        assert len([p for p in objects.rglob("*") if p.is_file()]) == 1
+
+    def test_dedupe_converts_existing_items(self, registry, tmp_path):
+        registry.add(ComponentType.SKILL, "a", self._skill(tmp_path, "a"))
+        registry.add(ComponentType.SKILL, "b", self._skill(tmp_path, "b"))
+        linked, saved = registry.dedupe()
+        assert linked == 4
+        assert saved == len("shared") + len("notes")
+        assert registry.dedupe() == (0, 0)
+
+    def test_dedupe_collects_orphaned_blobs(self, cas, tmp_path):
+        objects = cas.path / ".objects"
+        orphan, _ = ObjectStore(objects).put(self._skill(tmp_path, "a") / "SKILL.md")
+        cas.dedupe()
+        assert not orphan.exists()
+
+
+class TestReplaceDelta:
+    def _tree(self, root, files):
+        for rel, text in files.items():
+            (root / rel).parent.mkdir(parents=True, exist_ok=True)
+            (root / rel).write_text(text)
+        return root
+
+    def test_only_changed_files_are_copied(self, registry, tmp_path):
+        v1 = self._tree(tmp_path / "v1", {"SKILL.md": "one", "refs/a.md": "a", "refs/b.md": "b"})
+        dest = registry.add(ComponentType.SKILL, "big", v1)
+        old_a = (dest / "refs" / "a.md").stat().st_ino
+
+        v2 = self._tree(tmp_path / "v2", {"SKILL.md": "two", "refs/a.md": "a", "new.md": "n"})
+        registry.replace(ComponentType.SKILL, "big", v2)
+
+        assert (dest / "refs" / "a.md").stat().st_ino == old_a
+        assert (dest / "SKILL.md").read_text() == "two"
+        assert (dest / "new.md").read_text() == "n"
+        assert not (dest / "refs" / "b.md").exists()
+        assert not list((tmp_path / "registry" / "skills").glob(".big.*"))
+
+    def test_same_size_edit_is_detected(self, registry, tmp_path):
+        v1 = self._tree(tmp_path / "v1", {"SKILL.md": "aaaa"})
+        dest = registry.add(ComponentType.SKILL, "s", v1)
+        v2 = self._tree(tmp_path / "v2", {"SKILL.md": "bbbb"})
+        registry.replace(ComponentType.SKILL, "s", v2)
+        assert (dest / "SKILL.md").read_text() == "bbbb"
+
+    def test_delta_off_copies_everything(self, registry, tmp_path):
+        v1 = self._tree(tmp_path / "v1", {"SKILL.md": "one"})
+        dest = registry.add(ComponentType.SKILL, "s", v1)
+        old = (dest / "SKILL.md").stat().st_ino
+        registry.replace(ComponentType.SKILL, "s", v1, delta=False)
+        assert (dest / "SKILL.md").stat().st_ino != old
+
+
+class TestNameIndex:
+    @pytest.fixture(autouse=True)
+    def packages(self, tmp_path, monkeypatch):
+        from hawk_hooks import config
+
+        config_dir = tmp_path / "config"
+        config_dir.mkdir()
+        monkeypatch.setattr(config, "get_config_dir", lambda: config_dir)
+        for name in ("obra/superpowers", "a", "b", "pkg"):
+            config.record_package(name, "", "", [])
+
+    def _add(self, registry, tmp_path, ct, name):
+        source = tmp_path / "src" / name
+        source.parent.mkdir(exist_ok=True)
+        source.write_text(name)
+        registry.add(ct, name, source)
+
+    def test_resolves_exact_stem_namespaced_and_bare(self, registry, tmp_path):
+        self._add(registry, tmp_path, ComponentType.AGENT, "reviewer.md")
+        self._add(registry, tmp_path, ComponentType.AGENT, "superpowers--reviewer.md")
+        self._add(registry, tmp_path, ComponentType.AGENT, "superpowers--planner.md")
+        self._add(registry, tmp_path, ComponentType.MCP, "github.json")
+        self._add(registry, tmp_path, ComponentType.MCP, "github.yaml")
+
+        names = registry.names()
+        assert names.resolve("agents", "reviewer.md") == "reviewer.md"
+        assert names.resolve("agents", "superpowers/reviewer.md") == "superpowers--reviewer.md"
+        assert names.resolve("agents", "planner.md") == "superpowers--planner.md"
+        assert names.resolve("mcp", "github") == "github.yaml"
+        assert names.resolve("agents", "other/planner.md") is None
+
+    def test_ambiguous_bare_name_does_not_resolve(self, registry, tmp_path):
+        self._add(registry, tmp_path, ComponentType.SKILL, "a--lint.md")
+        self._add(registry, tmp_path, ComponentType.SKILL, "b--lint.md")
+
+        assert registry.resolve(ComponentType.SKILL, "lint.md") is None
+        assert registry.resolve(ComponentType.SKILL, "b/lint.md") == "b--lint.md"
+        assert registry.has_from_name("skills", "a/lint.md")
+
+    def test_qualify_maps_refs_and_keeps_unknown(self, registry, tmp_path):
+        from hawk_hooks.types import ResolvedSet
+
+        self._add(registry, tmp_path, ComponentType.MCP, "pkg--figma.json")
+        resolved = ResolvedSet(mcp=["pkg/figma", "figma.json", "missing"])
+
+        assert registry.names().qualify(resolved).mcp == ["pkg--figma.json", "missing"]
+
+    def test_index_follows_registry_changes(self, registry, tmp_path):
+        assert registry.resolve(ComponentType.SKILL, "pkg/new.md") is None
+        self._add(registry, tmp_path, ComponentType.SKILL, "pkg--new.md")
+        assert registry.resolve(ComponentType.SKILL, "pkg/new.md") == "pkg--new.md"
+        registry.remove(ComponentType.SKILL, "pkg--new.md")
+        assert registry.resolve(ComponentType.SKILL, "pkg/new.md") is None
+
+    def test_separator_without_known_namespace_is_plain(self, registry, tmp_path):
+        from hawk_hooks import config
+
+        self._add(registry, tmp_path, ComponentType.HOOK, "pre--commit.sh")
+        assert registry.resolve(ComponentType.HOOK, "commit.sh") is None
+        assert registry.resolve(ComponentType.HOOK, "pre/commit.sh") is None
+
+        config.record_package("pre", "", "", [])
+        assert registry.resolve(ComponentType.HOOK, "pre/commit.sh") == "pre--commit.sh"
@@ -0,0 +1,95 @@
+"""Tests for the persistent registry metadata index."""
+
+import os
+
+import pytest
+
+from hawk_hooks import config, registry_index
+from hawk_hooks.registry import Registry
+from hawk_hooks.types import ComponentType
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    config_dir = tmp_path / "hawk-hooks"
+    config_dir.mkdir()
+    monkeypatch.setattr(config, "get_config_dir", lambda: config_dir)
+    registry_index.clear_cache()
+    yield tmp_path
+    registry_index.clear_cache()
+
+
+def _age(path):
+    for p in [path, *path.rglob("*")] if path.is_dir() else [path]:
+        os.utime(p, ns=(1_000_000_000, 1_000_000_000))
+
+
+def _hook(tmp_path, body="# hawk-hook: events=stop\n# hawk-hook: deps=requests\n"):
+    hook = tmp_path / "h.py"
+    hook.write_text(body)
+    _age(hook)
+    return hook
+
+
+class TestLookup:
+    def test_hit_skips_compute_across_processes(self, env):
+        hook = _hook(env)
+        calls = []
+        assert registry_index.lookup(hook, "x", lambda: calls.append(1) or {"v": 1}) == {"v": 1}
+        registry_index.clear_cache()
+        assert registry_index.get_index_path().exists()
+
+        assert registry_index.lookup(hook, "x", lambda: calls.append(1) or {"v": 2}) == {"v": 1}
+        assert len(calls) == 1
+
+    def test_stamp_change_recomputes(self, env):
+        hook = _hook(env)
+        registry_index.lookup(hook, "x", lambda: 1)
+        hook.write_text("changed")
+        _age(hook)
+        os.utime(hook, ns=(2_000_000_000, 2_000_000_000))
+        assert registry_index.lookup(hook, "x", lambda: 2) == 2
+
+    def test_directory_stamp_sees_nested_changes(self, env):
+        skill = env / "skill"
+        (skill / "refs").mkdir(parents=True)
+        (skill / "refs" / "a.md").write_text("a")
+        _age(skill)
+        registry_index.lookup(skill, "x", lambda: 1)
+        (skill / "refs" / "a.md").write_text("bb")
+        _age(skill)
+        assert registry_index.lookup(skill, "x", lambda: 2) == 2
+
+    def test_recently_modified_items_are_not_indexed(self, env):
+        hook = env / "fresh.py"
+        hook.write_text("x")
+        registry_index.lookup(hook, "x", lambda: 1)
+        assert registry_index.lookup(hook, "x", lambda: 2) == 2
+
+    def test_returns_private_copies(self, env):
+        hook = _hook(env)
+        registry_index.lookup(hook, "x", lambda: {"a": [1]})["a"].append(2)
+        assert registry_index.lookup(hook, "x", lambda: None) == {"a": [1]}
+
+
+class TestHelpers:
+    def test_hook_meta_round_trips(self, env):
+        meta = registry_index.hook_meta(_hook(env))
+        assert meta.events == ["stop"]
+        assert meta.deps == "requests"
+        assert registry_index.hook_meta(env / "h.py") == meta
+
+    def test_content_hash_matches_config(self, env):
+        hook = _hook(env)
+        assert registry_index.content_hash(hook) == config.hash_registry_item(hook)
+
+    def test_registry_remove_forgets_entries(self, env):
+        reg = Registry(env / "registry")
+        reg.ensure_dirs()
+        path = reg.add(ComponentType.HOOK, "h.py", _hook(env))
+        _age(path)
+        registry_index.hook_meta(path)
+        assert str(path) in registry_index._entries()
+
+        reg.remove(ComponentType.HOOK, "h.py")
+        assert str(path) not in registry_index._entries()
@@ -295,3 +295,35 @@ class TestResolveFullStack:
         assert "lint" not in result.hooks
         assert result.mcp == ["github", "postgres"]
         assert result.prompts == ["deploy"]
+
+
+class TestResolveMemo:
+    def test_results_are_independent_copies(self):
+        cfg = {"global": {"skills": ["tdd"]}}
+        chain = [({"skills": {"enabled": ["local"]}}, None)]
+        first = resolve(cfg, dir_chain=chain)
+        first.skills.append("mutated")
+        assert resolve(cfg, dir_chain=chain).skills == ["tdd", "local"]
+
+    def test_layer_edits_are_picked_up(self):
+        cfg = {"global": {"skills": ["tdd"]}}
+        layer = {"skills": {"enabled": ["a"]}}
+        assert resolve(cfg, dir_chain=[(layer, None)]).skills == ["tdd", "a"]
+        layer["skills"]["enabled"] = ["b"]
+        assert resolve(cfg, dir_chain=[(layer, None)]).skills == ["tdd", "b"]
+        cfg["global"]["skills"] = []
+        assert resolve(cfg, dir_chain=[(layer, None)]).skills == ["b"]
+
+    def test_tool_overrides_stay_per_tool(self):
+        cfg = {"global": {"skills": ["tdd"]}}
+        chain = [
+            ({"tools": {"codex": {"skills": {"exclude": ["tdd"]}}}}, None),
+            ({"skills": {"enabled": ["leaf"]}}, None),
+        ]
+        assert resolve(cfg, dir_chain=chain, tool=Tool.CODEX).skills == ["leaf"]
+        assert resolve(cfg, dir_chain=chain, tool=Tool.CLAUDE).skills == ["tdd", "leaf"]
+
+    def test_unhashable_layer_falls_back_to_direct_merge(self):
+        cfg = {"global": {"skills": ["tdd"]}}
+        chain = [({1: "odd", "a": "key", "skills": ["local"]}, None)]
+        assert resolve(cfg, dir_chain=chain).skills == ["tdd", "local"]
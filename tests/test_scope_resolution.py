@@ -5,11 +5,14 @@ from __future__ import annotations
 from pathlib import Path
 
 from hawk_hooks import config
+from hawk_hooks.resolver import resolve
 from hawk_hooks.scope_resolution import (
     build_config_layers_with_profiles,
     build_resolver_dir_chain,
+    resolve_many,
     resolve_profile_name_for_dir,
 )
+from hawk_hooks.types import Tool
 
 
 def _patch_config_paths(monkeypatch, tmp_path: Path) -> Path:
@@ -126,3 +129,57 @@ def test_build_resolver_dir_chain_includes_unregistered_leaf_local_config(monkey
     assert len(chain) == 2
     assert chain[0][0]["skills"]["enabled"] == ["tdd"]
     assert chain[1][0]["skills"]["enabled"] == ["react"]
+
+
+def test_resolve_many_matches_per_scope_resolution(monkeypatch, tmp_path):
+    _patch_config_paths(monkeypatch, tmp_path)
+    config.save_profile("web", {"skills": ["react"], "hooks": ["lint"]})
+
+    mono = tmp_path / "mono"
+    app = mono / "apps" / "web"
+    api = mono / "apps" / "api"
+    leaf = api / "scratch"
+    loose = tmp_path / "loose"
+    for path in (app, leaf, loose):
+        path.mkdir(parents=True)
+
+    config.save_dir_config(mono, {"skills": {"enabled": ["mono"]}})
+    config.save_dir_config(
+        app,
+        {
+            "profile": "web",
+            "skills": {"disabled": ["tdd"]},
+            "tools": {"codex": {"skills": {"exclude": ["react"]}}},
+        },
+    )
+    config.save_dir_config(api, {"tools": {"claude": {"hooks": {"extra": ["guard"]}}}})
+    config.save_dir_config(leaf, {"hooks": {"enabled": ["scratch"]}})
+    config.save_dir_config(loose, {"skills": ["loose"]})
+
+    cfg = config.load_global_config()
+    cfg["global"]["skills"] = ["tdd"]
+    for path in (mono, app):
+        cfg["directories"][str(path.resolve())] = {}
+    # Hand-edited keys are not always normalized.
+    cfg["directories"][f"{api.resolve()}/"] = {}
+    config.save_global_config(cfg)
+
+    scopes = [None, mono, app, api, leaf, loose, tmp_path / "elsewhere"]
+    tools = [Tool.CLAUDE, Tool.CODEX, Tool.GEMINI]
+    many = resolve_many(cfg, scopes, tools)
+
+    assert len(many) == len(scopes) * len(tools)
+    for scope in scopes:
+        for tool in tools:
+            if scope is None:
+                expected = resolve(cfg)
+                key = "global"
+            else:
+                expected = resolve(
+                    cfg, dir_chain=build_resolver_dir_chain(scope, cfg=cfg), tool=tool
+                )
+                key = str(scope.resolve())
+            assert many[(key, tool)] == expected, (scope, tool)
+
+    assert many[(str(app.resolve()), Tool.CODEX)].skills == ["mono"]
+    assert many[(str(leaf.resolve()), Tool.CLAUDE)].hooks == ["guard", "scratch"]
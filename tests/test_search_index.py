@@ -0,0 +1,157 @@
+"""Tests for the registry full-text search index."""
+
+import json
+import os
+
+import pytest
+
+from hawk_hooks import config, search_index
+from hawk_hooks.registry import Registry
+from hawk_hooks.types import ComponentType
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    config_dir = tmp_path / "hawk-hooks"
+    config_dir.mkdir()
+    monkeypatch.setattr(config, "get_config_dir", lambda: config_dir)
+    search_index.clear_cache()
+    reg = Registry(config_dir / "registry")
+    reg.ensure_dirs()
+    yield reg
+    search_index.clear_cache()
+
+
+def _age(path):
+    for p in [path, *path.rglob("*")] if path.is_dir() else [path]:
+        os.utime(p, ns=(1_000_000_000, 1_000_000_000))
+
+
+def _write(reg, ct, name, text):
+    path = reg.path / ct.registry_dir / name
+    path.write_text(text)
+    _age(path)
+    return path
+
+
+def _names(hits):
+    return [hit.name for hit in hits]
+
+
+class TestTokenize:
+    def test_folds_case_plurals_and_stopwords(self):
+        assert search_index.tokenize("The SQL Migrations for a DB") == ["sql", "migration", "db"]
+
+    def test_splits_identifiers(self):
+        assert search_index.tokenize("code-reviewer_v2.md") == ["code", "reviewer", "v2", "md"]
+
+
+class TestSearch:
+    def test_ranks_name_and_description_above_body(self, registry):
+        _write(registry, ComponentType.SKILL, "notes.md", "Mentions migrations in passing.")
+        _write(
+            registry, ComponentType.SKILL, "sql-migrations.md",
+            "---\ndescription: Write reversible SQL migrations\n---\nBody.",
+        )
+        _write(registry, ComponentType.AGENT, "writer.md", "Prose.")
+
+        hits = search_index.search("migrations", registry_path=registry.path)
+        assert _names(hits) == ["sql-migrations.md", "notes.md"]
+        assert hits[0].component_type == ComponentType.SKILL
+
+    def test_type_filter_and_limit(self, registry):
+        _write(registry, ComponentType.SKILL, "a.md", "lint")
+        _write(registry, ComponentType.AGENT, "b.md", "lint")
+        _write(registry, ComponentType.AGENT, "c.md", "lint lint")
+
+        hits = search_index.search(
+            "lint", registry_path=registry.path, component_type=ComponentType.AGENT, limit=1
+        )
+        assert _names(hits) == ["c.md"]
+
+    def test_match_all_with_prefix(self, registry):
+        _write(registry, ComponentType.SKILL, "a.md", "postgres migration")
+        _write(registry, ComponentType.SKILL, "b.md", "postgres tuning")
+
+        hits = search_index.search(
+            "postgres migr", registry_path=registry.path, match_all=True, prefix=True
+        )
+        assert _names(hits) == ["a.md"]
+
+    def test_dropped_last_term_is_not_expanded_into_previous(self, registry):
+        _write(registry, ComponentType.SKILL, "lint.md", "code formatting and checks")
+        _write(registry, ComponentType.SKILL, "docker.md", "docker images")
+
+        for query, expected in [
+            ("docker c", ["docker.md"]),
+            ("docker for", ["docker.md"]),
+            ("docker fo", []),
+            ("docker ima", ["docker.md"]),
+        ]:
+            hits = search_index.search(
+                query, registry_path=registry.path, match_all=True, prefix=True
+            )
+            assert _names(hits) == expected, query
+
+    def test_directory_items_are_indexed(self, registry):
+        skill = registry.path / "skills" / "reviewer"
+        (skill / "refs").mkdir(parents=True)
+        (skill / "SKILL.md").write_text("Review pull requests.")
+        (skill / "refs" / "style.md").write_text("Prefer guard clauses.")
+        _age(skill)
+
+        assert _names(search_index.search("guard", registry_path=registry.path)) == ["reviewer"]
+
+
+class TestUpdates:
+    def test_registry_changes_update_loaded_index(self, registry, tmp_path):
+        _write(registry, ComponentType.SKILL, "old.md", "kubernetes")
+        assert _names(search_index.search("kubernetes", registry_path=registry.path)) == [
+            "old.md"
+        ]
+
+        src = tmp_path / "new.md"
+        src.write_text("kubernetes helm")
+        registry.add(ComponentType.SKILL, "new.md", src)
+        registry.remove(ComponentType.SKILL, "old.md")
+
+        assert _names(search_index.search("kubernetes", registry_path=registry.path)) == [
+            "new.md"
+        ]
+
+    def test_refresh_only_rereads_changed_items(self, registry):
+        _write(registry, ComponentType.SKILL, "a.md", "alpha")
+        _write(registry, ComponentType.SKILL, "b.md", "beta")
+        assert search_index.refresh(registry.path) == 2
+        search_index.clear_cache()
+        assert search_index.get_index_path().exists()
+
+        path = _write(registry, ComponentType.SKILL, "b.md", "gamma")
+        os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+        assert search_index.refresh(registry.path) == 1
+        assert _names(search_index.search("gamma", registry_path=registry.path)) == ["b.md"]
+        assert search_index.search("beta", registry_path=registry.path) == []
+
+
+    def test_removed_items_survive_flush_and_reload(self, registry):
+        for i in range(8):
+            _write(registry, ComponentType.SKILL, f"s{i}.md", f"kubernetes item{i}")
+        assert len(search_index.search("kubernetes", registry_path=registry.path)) == 8
+        registry.remove(ComponentType.SKILL, "s3.md")
+        search_index.flush()
+        search_index.clear_cache()
+
+        hits = search_index.search("kubernetes", registry_path=registry.path, limit=None)
+        assert sorted(_names(hits)) == [f"s{i}.md" for i in range(8) if i != 3]
+
+    def test_malformed_cache_is_rebuilt(self, registry):
+        _write(registry, ComponentType.SKILL, "a.md", "alpha")
+        search_index.refresh(registry.path)
+        search_index.clear_cache()
+        path = search_index.get_index_path()
+        payload = json.loads(path.read_text())
+        payload["docs"] = [None, "junk", 3]
+        path.write_text(json.dumps(payload))
+        search_index.clear_cache()
+
+        assert _names(search_index.search("alpha", registry_path=registry.path)) == ["a.md"]
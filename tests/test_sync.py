@@ -1,6 +1,7 @@
 """Tests for v2 sync engine."""
 
 import json
+import os
 
 import pytest
 
@@ -8,16 +9,20 @@ from hawk_hooks import config
 from hawk_hooks.registry import Registry
 from hawk_hooks.types import ComponentType, ResolvedSet, Tool
 from hawk_hooks.sync import (
-    _cache_key,
     _read_cached_hash,
     _write_cached_hash,
     clean_global,
     count_unsynced_targets,
+    find_targets_for_items,
     format_sync_results,
+    plan_global,
+    purge_all,
     purge_global,
     uninstall_all,
+    sync_all,
     sync_directory,
     sync_global,
+    sync_targets,
     SyncResult,
 )
 
@@ -241,24 +246,6 @@ class TestSyncDirectoryWithChain:
 
 
 class TestSyncCache:
-    def test_cache_key_global(self):
-        key = _cache_key("global", Tool.CLAUDE)
-        assert key.endswith("_claude")
-        assert "/" not in key
-        assert "\\" not in key
-
-    def test_cache_key_directory(self):
-        key = _cache_key("/home/user/project", Tool.GEMINI)
-        assert key.endswith("_gemini")
-        assert "/" not in key
-        assert "\\" not in key
-        assert key == _cache_key("/home/user/project", Tool.GEMINI)
-
-    def test_cache_key_distinguishes_old_collision_paths(self):
-        key_a = _cache_key("/a/b", Tool.CLAUDE)
-        key_b = _cache_key("/a_b", Tool.CLAUDE)
-        assert key_a != key_b
-
     def test_read_write_cache(self, v2_env):
         _write_cached_hash("global", Tool.CLAUDE, "abc123")
         assert _read_cached_hash("global", Tool.CLAUDE) == "abc123"
@@ -340,6 +327,190 @@ class TestSyncCache:
         assert sync_calls["count"] == 2
 
 
+class TestTargetedSync:
+    def test_find_targets_only_returns_scopes_using_item(self, v2_env, tmp_path):
+        project = tmp_path / "project"
+        project.mkdir()
+        config.save_dir_config(project, {"skills": {"enabled": ["react"], "disabled": []}})
+        config.register_directory(project)
+
+        other = tmp_path / "other"
+        other.mkdir()
+        config.save_dir_config(other, {"skills": {"enabled": [], "disabled": ["tdd"]}})
+        config.register_directory(other)
+
+        targets = find_targets_for_items([(ComponentType.SKILL, "react")], tools=[Tool.CLAUDE])
+        assert targets == [(str(project.resolve()), Tool.CLAUDE)]
+
+        targets = find_targets_for_items([(ComponentType.SKILL, "tdd")], tools=[Tool.CLAUDE])
+        assert targets == [("global", Tool.CLAUDE), (str(project.resolve()), Tool.CLAUDE)]
+
+    def test_find_targets_maps_commands_to_prompts(self, v2_env):
+        targets = find_targets_for_items(
+            [(ComponentType.COMMAND, "deploy.md")], tools=[Tool.CLAUDE]
+        )
+        assert targets == [("global", Tool.CLAUDE)]
+
+    def test_find_targets_unused_item(self, v2_env):
+        assert find_targets_for_items([(ComponentType.SKILL, "nope")]) == []
+
+    def test_sync_targets_invalidates_only_given_targets(self, v2_env, tmp_path, monkeypatch):
+        claude_dir = tmp_path / "fake-claude"
+        claude_dir.mkdir()
+
+        from hawk_hooks.adapters.claude import ClaudeAdapter
+
+        monkeypatch.setattr(ClaudeAdapter, "get_global_dir", lambda self: claude_dir)
+
+        sync_global(tools=[Tool.CLAUDE])
+        _write_cached_hash("global", Tool.GEMINI, "untouched")
+
+        sync_calls = {"count": 0}
+        original_sync = ClaudeAdapter.sync
+
+        def _counting_sync(self, resolved, target_dir, registry_path):
+            sync_calls["count"] += 1
+            return original_sync(self, resolved, target_dir, registry_path)
+
+        monkeypatch.setattr(ClaudeAdapter, "sync", _counting_sync)
+
+        results = sync_targets([("global", Tool.CLAUDE)])
+        assert list(results) == ["global"]
+        assert [r.tool for r in results["global"]] == ["claude"]
+        assert sync_calls["count"] == 1
+        assert _read_cached_hash("global", Tool.GEMINI) == "untouched"
+
+
+class TestPlanApply:
+    @pytest.fixture
+    def claude_dir(self, v2_env, tmp_path, monkeypatch):
+        from hawk_hooks.adapters.claude import ClaudeAdapter
+
+        claude_dir = tmp_path / "home" / ".claude"
+        claude_dir.mkdir(parents=True)
+        monkeypatch.setattr(ClaudeAdapter, "get_global_dir", lambda self: claude_dir)
+        return claude_dir
+
+    def test_plan_is_exact_and_writes_nothing(self, claude_dir):
+        before = sorted(p.relative_to(claude_dir.parent) for p in claude_dir.parent.rglob("*"))
+
+        (plan,) = plan_global(tools=[Tool.CLAUDE])
+        assert (
+            sorted(p.relative_to(claude_dir.parent) for p in claude_dir.parent.rglob("*")) == before
+        )
+        assert "tdd" in plan.result.linked
+
+        symlinks = {op.path for op in plan.ops if op.action == "symlink"}
+        writes = {op.path for op in plan.ops if op.action == "write"}
+        assert str(claude_dir / "skills" / "tdd") in symlinks
+
+        sync_global(tools=[Tool.CLAUDE])
+        for path in symlinks:
+            assert (claude_dir / path).is_symlink()
+        for path in writes:
+            assert (claude_dir / path).is_file()
+
+        # Once applied, the cache is current and the plan is empty.
+        (plan,) = plan_global(tools=[Tool.CLAUDE])
+        assert plan.ops == []
+        assert plan.to_dict()["ops"] == []
+
+    def test_interrupted_sync_rolls_back(self, claude_dir, monkeypatch):
+        from hawk_hooks.adapters.claude import ClaudeAdapter
+
+        def _interrupt(self, servers, target_dir):
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(ClaudeAdapter, "write_mcp_config", _interrupt)
+
+        with pytest.raises(KeyboardInterrupt):
+            sync_global(tools=[Tool.CLAUDE])
+
+        assert not (claude_dir / "skills").exists()
+        assert not (claude_dir / "commands").exists()
+        assert _read_cached_hash("global", Tool.CLAUDE) is None
+
+
+class TestGroupedSync:
+    @pytest.fixture
+    def projects(self, v2_env, tmp_path, monkeypatch):
+        from hawk_hooks.adapters.claude import ClaudeAdapter
+
+        claude_dir = tmp_path / "fake-claude"
+        claude_dir.mkdir()
+        monkeypatch.setattr(ClaudeAdapter, "get_global_dir", lambda self: claude_dir)
+
+        dirs = []
+        for name, skills in [("a", []), ("b", []), ("c", ["tdd"])]:
+            project = tmp_path / name
+            project.mkdir()
+            disabled = [] if skills else ["tdd"]
+            config.save_dir_config(project, {"skills": {"enabled": skills, "disabled": disabled}})
+            config.register_directory(project)
+            dirs.append(project)
+        return dirs
+
+    def test_identical_projects_share_one_plan(self, projects, monkeypatch):
+        from hawk_hooks.adapters.base import ToolAdapter
+
+        plans = []
+        original = ToolAdapter._plan_component
+
+        def _counting_plan(names, source_dir):
+            plans.append((tuple(names), source_dir.name))
+            return original(names, source_dir)
+
+        monkeypatch.setattr(ToolAdapter, "_plan_component", staticmethod(_counting_plan))
+
+        results = sync_all(tools=[Tool.CLAUDE])
+
+        # global + two distinct project configurations, three components each
+        assert len(plans) == 9
+        a, b, c = projects
+        assert not (a / ".claude" / "skills" / "tdd").exists()
+        assert not (b / ".claude" / "skills" / "tdd").exists()
+        assert (c / ".claude" / "skills" / "tdd").is_symlink()
+        assert (b / ".claude" / "skills").is_dir()
+        for project in projects:
+            assert [r.tool for r in results[str(project)]] == ["claude"]
+
+    def test_grouped_sync_records_state_and_skips_next_run(self, projects, monkeypatch):
+        from hawk_hooks.adapters.claude import ClaudeAdapter
+
+        sync_all(tools=[Tool.CLAUDE])
+        for project in projects:
+            assert _read_cached_hash(str(project.resolve()), Tool.CLAUDE) is not None
+
+        sync_calls = {"count": 0}
+        original_sync = ClaudeAdapter.sync
+
+        def _counting_sync(self, resolved, target_dir, registry_path):
+            sync_calls["count"] += 1
+            return original_sync(self, resolved, target_dir, registry_path)
+
+        monkeypatch.setattr(ClaudeAdapter, "sync", _counting_sync)
+        sync_all(tools=[Tool.CLAUDE])
+        assert sync_calls["count"] == 0
+
+        sync_all(tools=[Tool.CLAUDE], force=True)
+        assert sync_calls["count"] == 4
+
+    def test_plan_cache_scoped_to_block(self):
+        from hawk_hooks.adapters.claude import ClaudeAdapter
+
+        adapter = ClaudeAdapter()
+        calls = []
+
+        def _compute():
+            calls.append(1)
+            return len(calls)
+
+        with adapter.plan_cache():
+            assert adapter._planned("k", _compute) == 1
+            assert adapter._planned("k", _compute) == 1
+        assert adapter._planned("k", _compute) == 2
+
+
 class TestUnsyncedCounts:
     def test_count_unsynced_global_before_and_after_sync(self, v2_env, tmp_path, monkeypatch):
         claude_dir = tmp_path / "fake-claude"
@@ -495,6 +666,50 @@ class TestPrune:
         assert any("old.md" in item for item in results[0].unlinked)
         assert (commands_dir / "old.md").is_symlink()
 
+    def test_purge_all_sweeps_directories_in_registration_order(
+        self, v2_env, tmp_path, monkeypatch
+    ):
+        from hawk_hooks.adapters.claude import ClaudeAdapter
+
+        monkeypatch.setattr(ClaudeAdapter, "get_global_dir", lambda self: tmp_path / "fake-claude")
+
+        projects = []
+        for i in range(4):
+            project = tmp_path / f"proj-{i}"
+            commands_dir = project / ".claude" / "commands"
+            commands_dir.mkdir(parents=True)
+            (commands_dir / "old.md").symlink_to(v2_env["config_dir"] / "prompts" / "old.md")
+            (commands_dir / "mine.md").symlink_to(tmp_path / "elsewhere.md")
+            config.register_directory(project)
+            projects.append(project)
+
+        results = purge_all(tools=[Tool.CLAUDE])
+
+        assert list(results) == ["global"] + [str(p.resolve()) for p in projects]
+        for project in projects:
+            commands_dir = project / ".claude" / "commands"
+            assert not (commands_dir / "old.md").is_symlink()
+            assert (commands_dir / "mine.md").is_symlink()
+
+    def test_sweep_writes_do_not_touch_umask(self, v2_env, tmp_path, monkeypatch):
+        from hawk_hooks import fileio
+        from hawk_hooks.sync import _sweep_directories
+
+        for i in range(4):
+            project = tmp_path / f"proj-{i}"
+            project.mkdir()
+            config.register_directory(project)
+
+        def no_umask(_mask):
+            raise AssertionError("umask changed during a threaded sweep")
+
+        monkeypatch.setattr(os, "umask", no_umask)
+        results = _sweep_directories(
+            lambda d: [fileio.write_text_if_changed(d / ".mcp.json", "{}")]
+        )
+
+        assert list(results.values()) == [[True]] * 4
+
 
 class TestUninstall:
     def test_uninstall_all_cleans_state(self, v2_env, tmp_path, monkeypatch):
@@ -0,0 +1,101 @@
+"""Tests for the SQLite-backed sync state store."""
+
+import pytest
+
+from hawk_hooks import config, sync_state
+from hawk_hooks.sync_state import SyncStateEntry, SyncStateStore, prune_unregistered
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    config_dir = tmp_path / "hawk-hooks"
+    monkeypatch.setattr(config, "get_config_dir", lambda: config_dir)
+    return SyncStateStore()
+
+
+def test_record_and_get(store):
+    assert store.get_identity("global", "claude") is None
+
+    store.record("global", "claude", "abc", duration=0.5, error_count=0)
+
+    entry = store.get("global", "claude")
+    assert entry.identity == "abc"
+    assert entry.duration == 0.5
+    assert entry.error_count == 0
+    assert entry.last_sync > 0
+
+
+def test_failed_sync_keeps_previous_identity(store):
+    store.record("global", "claude", "abc")
+    store.record("global", "claude", None, error_count=3)
+
+    entry = store.get("global", "claude")
+    assert entry.identity == "abc"
+    assert entry.error_count == 3
+
+
+def test_stale_query(store):
+    store.record_many([
+        SyncStateEntry("global", "claude", "a"),
+        SyncStateEntry("/p", "claude", "b"),
+    ])
+
+    stale = store.stale({
+        ("global", "claude"): "a",
+        ("/p", "claude"): "changed",
+        ("/q", "gemini"): "new",
+    })
+
+    assert stale == [("/p", "claude"), ("/q", "gemini")]
+
+
+def test_invalidate_and_clear(store):
+    store.record_many([
+        SyncStateEntry("global", "claude", "a"),
+        SyncStateEntry("global", "gemini", "b"),
+    ])
+
+    store.invalidate([("global", "claude")])
+    assert store.identities() == {("global", "gemini"): "b"}
+
+    store.clear()
+    assert store.entries() == []
+
+
+def test_prune_unregistered_directories(store):
+    config.register_directory(config.get_config_dir())
+    kept = str(config.get_config_dir().resolve())
+    store.record_many([
+        SyncStateEntry("global", "claude", "a"),
+        SyncStateEntry(kept, "claude", "b"),
+        SyncStateEntry("/gone", "claude", "c"),
+        SyncStateEntry("/gone", "gemini", "d"),
+    ])
+
+    assert prune_unregistered() == 2
+    assert {scope for scope, _tool in store.identities()} == {"global", kept}
+
+
+def test_first_open_drops_legacy_per_file_cache(store):
+    legacy = config.get_config_dir() / "cache" / "resolved"
+    legacy.mkdir(parents=True)
+    (legacy / "deadbeef_claude").write_text("old")
+
+    store.record("global", "claude", "abc")
+
+    assert not legacy.exists()
+    assert store.path.name == "sync-state.db"
+
+
+def test_connection_is_reused_until_database_changes(store):
+    store.record("global", "claude", "abc")
+    conn = sync_state._state[2]
+    assert store.get_identity("global", "claude") == "abc"
+    store.record("global", "gemini", "def")
+    assert sync_state._state[2] is conn
+
+    sync_state.close()
+    for path in store.path.parent.glob("sync-state.db*"):
+        path.unlink()
+    assert store.get_identity("global", "claude") is None
+    assert sync_state._state[2] is not conn
@@ -218,3 +218,22 @@ def test_get_item_description_uses_skill_markdown_body_when_no_frontmatter(tmp_p
 
     desc = toggle._get_item_description(skill_dir, "skills")
     assert desc == "Use this skill to generate clean API scaffolding."
+
+
+def test_filter_matches_names_and_indexed_contents(tmp_path: Path, monkeypatch):
+    from hawk_hooks import config, search_index
+
+    config_dir = tmp_path / "hawk-hooks"
+    config_dir.mkdir()
+    monkeypatch.setattr(config, "get_config_dir", lambda: config_dir)
+    search_index.clear_cache()
+    registry_path = config_dir / "registry"
+    (registry_path / "skills").mkdir(parents=True)
+    skill = registry_path / "skills" / "tdd.md"
+    skill.write_text("red green refactor")
+    os.utime(skill, ns=(1_000_000_000, 1_000_000_000))
+    pairs = [("skills", "tdd.md"), ("skills", "docs.md")]
+
+    assert toggle._filter_matches("doc", pairs, registry_path) == {("skills", "docs.md")}
+    assert toggle._filter_matches("refac", pairs, registry_path) == {("skills", "tdd.md")}
+    search_index.clear_cache()
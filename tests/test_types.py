@@ -1,6 +1,6 @@
 """Tests for v2 type definitions."""
 
-from hawk_hooks.types import ComponentType, ResolvedSet, SyncResult, Tool
+from hawk_hooks.types import ComponentType, ItemTable, ResolvedSet, SyncResult, Tool
 
 
 class TestTool:
@@ -82,6 +82,27 @@ class TestResolvedSet:
         assert rs1.hash_key() == rs2.hash_key()
 
 
+class TestItemTable:
+    def test_mask_round_trip_in_interning_order(self):
+        table = ItemTable()
+        mask = table.mask("skills", ["b", "a", "b"])
+        assert table.names("skills", mask) == ["b", "a"]
+        assert table.mask("hooks", ["a"]) == 1  # fields have separate bit spaces
+
+    def test_masks_are_order_insensitive(self):
+        table = ItemTable()
+        first = ResolvedSet(skills=["tdd", "react"], mcp=["github"])
+        second = ResolvedSet(skills=["react", "tdd"], mcp=["github"])
+        assert first.masks(table) == second.masks(table)
+        assert first.masks(table) != ResolvedSet(skills=["tdd"]).masks(table)
+
+    def test_from_masks(self):
+        table = ItemTable()
+        original = ResolvedSet(skills=["tdd"], hooks=["lint.py", "guard.py"])
+        rebuilt = ResolvedSet.from_masks(original.masks(table), table)
+        assert rebuilt == original
+
+
 class TestSyncResult:
     def test_defaults(self):
         sr = SyncResult(tool="claude")